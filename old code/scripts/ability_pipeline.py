@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Streaming library API for the compendium ability pipeline.
+
+The converters are built around ``main()`` functions that walk fixed folders
+and write files. This module exposes the same steps as generators that can be
+chained and consumed one record at a time:
+
+    from ability_pipeline import JsonArraySink, drain, iter_source_records, simplified
+
+    records = iter_source_records("../data_unused/compendium/Abilities.zip")
+    fury = (record for record in records if record.class_name == "Fury")
+    with JsonArraySink("/tmp/fury.json") as sink:
+        drain(simplified(fury), sink)
+
+``iter_source_records`` reads a folder or archive (see archive_io.py) lazily
+in sorted order, ``transformed`` and ``simplified`` map records through
+extract_class_abilities.transform_ability and
+generate_simplified_abilities.convert_ability, and sinks write records as
+they arrive. Only the record being processed is held in memory; the only
+exceptions are archive outputs, which are written in one go when closed, and
+.tar.gz inputs, which are read whole (see archive_io.py).
+
+Usage:
+    python ability_pipeline.py                                      # count compendium records per class
+    python ability_pipeline.py --stage simplify --class Fury --level 5 --out -
+    python ability_pipeline.py --stage transform --out /tmp/converted.zip
+    python ability_pipeline.py --stage simplify --per-class /tmp/simplified
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, TextIO, Union
+
+from archive_io import COMPENDIUM_DIR, PathLike, Sink, open_sink, open_source
+from extract_class_abilities import transform_ability
+from generate_simplified_abilities import convert_ability, extract_level_from_folder
+from json_stream import JsonArrayWriter
+
+
+# Folder holding the level-1 abilities every class can take
+SHARED_CLASS = "Common"
+
+
+class Record(NamedTuple):
+    """One record flowing through the pipeline: its path in the source tree and its data."""
+
+    name: str
+    data: Any
+
+    @property
+    def class_name(self) -> str:
+        return self.name.split("/", 1)[0]
+
+    @property
+    def level(self) -> int:
+        """Level from the folder layout, as generate_simplified_abilities.py reads it."""
+        parts = self.name.split("/")
+        if parts[0] == SHARED_CLASS or len(parts) < 3:
+            return 1
+        return extract_level_from_folder(parts[1])
+
+
+def to_jsonable(data: Any) -> Any:
+    """Plain JSON value of a record; converter results are dataclasses with ``to_dict``."""
+    to_dict = getattr(data, "to_dict", None)
+    return to_dict() if callable(to_dict) else data
+
+
+# -----------------------------------------------------------------------------
+# Sources and stages
+# -----------------------------------------------------------------------------
+
+def iter_source_records(
+    root: PathLike = COMPENDIUM_DIR,
+    suffix: str = ".json",
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+) -> Iterator[Record]:
+    """Decoded files under ``root`` (a folder or archive), one at a time in sorted order.
+
+    Files that fail to decode are passed to ``on_error`` and skipped; without
+    ``on_error`` the error is raised.
+    """
+    with open_source(root) as source:
+        for name in source.files(suffix):
+            try:
+                data = json.loads(source.read_text(name))
+            except (ValueError, UnicodeDecodeError) as exc:
+                if on_error is None:
+                    raise
+                on_error(name, exc)
+                continue
+            yield Record(name, data)
+
+
+def transformed(records: Iterable[Record]) -> Iterator[Record]:
+    """Records in the class ability schema of extract_class_abilities.py."""
+    for record in records:
+        yield Record(record.name, transform_ability(Path(record.name), record.data))
+
+
+def simplified(records: Iterable[Record]) -> Iterator[Record]:
+    """Records in the simplified schema of generate_simplified_abilities.py."""
+    for record in records:
+        yield Record(record.name, convert_ability(record.data, record.level))
+
+
+# -----------------------------------------------------------------------------
+# Sinks
+# -----------------------------------------------------------------------------
+
+class RecordSink:
+    """Consumes records one at a time; closing without an error commits the output."""
+
+    count = 0
+
+    def write(self, record: Record) -> None:
+        raise NotImplementedError
+
+    def close(self, commit: bool = True) -> None:
+        pass
+
+    def __enter__(self) -> "RecordSink":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close(commit=exc_type is None)
+
+
+class TreeSink(RecordSink):
+    """One file per record at its source path, in a folder or archive (like extract_class_abilities.py)."""
+
+    def __init__(self, target: PathLike, store: bool = False):
+        self._sink: Sink = open_sink(target, store=store)
+
+    def write(self, record: Record) -> None:
+        self._sink.write_text(record.name, json.dumps(to_jsonable(record.data), indent=2, ensure_ascii=True) + "\n")
+        self.count += 1
+
+    def close(self, commit: bool = True) -> None:
+        self._sink.close(commit=commit)
+
+
+class JsonArraySink(RecordSink):
+    """All records in one JSON array file (or open handle), written as they arrive."""
+
+    def __init__(self, target: Union[PathLike, TextIO], indent: Optional[int] = 2):
+        self._writer = JsonArrayWriter(target, indent=indent)
+
+    def write(self, record: Record) -> None:
+        self._writer.write(to_jsonable(record.data))
+        self.count += 1
+
+    def close(self, commit: bool = True) -> None:
+        if commit:
+            self._writer.close()
+        else:
+            self._writer.abort()
+
+
+class ClassArraySink(RecordSink):
+    """One ``<class>_abilities.json`` array per class folder, like generate_simplified_abilities.py."""
+
+    def __init__(self, output_dir: PathLike):
+        self.output_dir = Path(output_dir)
+        self._writers: Dict[str, JsonArrayWriter] = {}
+
+    def write(self, record: Record) -> None:
+        writer = self._writers.get(record.class_name)
+        if writer is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            writer = JsonArrayWriter(self.output_dir / f"{record.class_name.lower()}_abilities.json")
+            self._writers[record.class_name] = writer
+        writer.write(to_jsonable(record.data))
+        self.count += 1
+
+    def close(self, commit: bool = True) -> None:
+        for writer in self._writers.values():
+            if commit:
+                writer.close()
+            else:
+                writer.abort()
+
+
+def drain(records: Iterable[Record], sink: RecordSink) -> int:
+    """Write every record to ``sink``; returns how many were written."""
+    written = 0
+    for record in records:
+        sink.write(record)
+        written += 1
+    return written
+
+
+# -----------------------------------------------------------------------------
+# CLI
+# -----------------------------------------------------------------------------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Stream compendium abilities through the converters.")
+    parser.add_argument("root", nargs="?", type=Path, default=COMPENDIUM_DIR, help="Compendium Abilities folder or archive.")
+    parser.add_argument("--stage", choices=["raw", "transform", "simplify"], default="raw", help="Converter to apply.")
+    parser.add_argument("--class", dest="class_name", help="Only this class folder (e.g. Fury, Common).")
+    parser.add_argument("--level", type=int, help="Only abilities of this folder level.")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--out", help="'-' or a .json file for one array, otherwise a folder or archive of files.")
+    output.add_argument("--per-class", type=Path, help="Folder for one <class>_abilities.json per class.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    started = time.perf_counter()
+
+    def report(name: str, exc: Exception) -> None:
+        print(f"✗ {name}: {exc}", file=sys.stderr)
+
+    records: Iterable[Record] = iter_source_records(args.root, on_error=report)
+    if args.class_name:
+        records = (record for record in records if record.class_name.lower() == args.class_name.lower())
+    if args.level is not None:
+        records = (record for record in records if record.level == args.level)
+    if args.stage == "transform":
+        records = transformed(records)
+    elif args.stage == "simplify":
+        records = simplified(records)
+
+    if args.per_class:
+        sink: Optional[RecordSink] = ClassArraySink(args.per_class)
+    elif args.out == "-":
+        sink = JsonArraySink(sys.stdout)
+    elif args.out and args.out.endswith(".json"):
+        sink = JsonArraySink(args.out)
+    elif args.out:
+        sink = TreeSink(args.out)
+    else:
+        sink = None
+
+    if sink is None:
+        counts: Dict[str, int] = {}
+        for record in records:
+            counts[record.class_name] = counts.get(record.class_name, 0) + 1
+        for class_name, count in counts.items():
+            print(f"{class_name:<16} {count:>5}")
+        total = sum(counts.values())
+    else:
+        with sink:
+            total = drain(records, sink)
+        if args.out == "-":
+            print()
+    print(f"✓ {total} record(s) in {(time.perf_counter() - started) * 1000:.0f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,15 @@ This script takes a mapping of ability names to subclass names and updates
 all class ability JSON files, adding a "subclass" field after the "level" field.
 """
 
+import argparse
 import json
 import os
+import sys
 from pathlib import Path
 from typing import Dict, Optional
 
+from json_stream import JsonArrayError, JsonArrayWriter, iter_json_array
+
 # =============================================================================
 # CONFIGURATION: Map ability names to their subclass
 # =============================================================================
@@ -210,8 +214,8 @@ ABILITY_TO_SUBCLASS: Dict[str, Optional[str]] = {
 
 def get_class_abilities_dir() -> Path:
     """Get the path to the class_abilities_simplified directory."""
-    script_dir = Path(__file__).parent
-    return script_dir.parent / "data" / "abilities" / "class_abilities_simplified"
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    return repo_root / "hero_smith" / "data" / "abilities" / "class_abilities_simplified"
 
 
 def add_subclass_to_ability(ability: dict, subclass_map: Dict[str, Optional[str]]) -> bool:
@@ -245,40 +249,47 @@ def process_abilities_file(file_path: Path, subclass_map: Dict[str, Optional[str
     """
     Process a single abilities JSON file.
     
+    Abilities are streamed one at a time into a temporary file that replaces
+    the original only if something was modified.
+    
     Returns the number of abilities modified.
     """
+    modified_count = 0
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            abilities = json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"  Error reading {file_path.name}: {e}")
-        return 0
-    
-    if not isinstance(abilities, list):
+        with JsonArrayWriter(file_path, indent=2, ensure_ascii=False) as writer:
+            for ability in iter_json_array(file_path):
+                if isinstance(ability, dict) and add_subclass_to_ability(ability, subclass_map):
+                    modified_count += 1
+                writer.write(ability)
+            if modified_count == 0:
+                writer.abort()
+                print(f"  No matching abilities in {file_path.name}")
+                return 0
+    except JsonArrayError:
         print(f"  Skipping {file_path.name}: not a list of abilities")
         return 0
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"  Error processing {file_path.name}: {e}")
+        return 0
     
-    modified_count = 0
-    for ability in abilities:
-        if isinstance(ability, dict) and add_subclass_to_ability(ability, subclass_map):
-            modified_count += 1
-    
-    if modified_count > 0:
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(abilities, f, indent=2, ensure_ascii=False)
-            print(f"  Modified {modified_count} abilities in {file_path.name}")
-        except IOError as e:
-            print(f"  Error writing {file_path.name}: {e}")
-            return 0
-    else:
-        print(f"  No matching abilities in {file_path.name}")
-    
+    print(f"  Modified {modified_count} abilities in {file_path.name}")
     return modified_count
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Add the subclass field to class ability files.")
+    parser.add_argument(
+        "--abilities-dir",
+        type=Path,
+        default=get_class_abilities_dir(),
+        help="Folder containing the <class>_abilities.json files.",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main entry point."""
+    args = parse_args()
     if not ABILITY_TO_SUBCLASS:
         print("WARNING: ABILITY_TO_SUBCLASS mapping is empty!")
         print("Please add your ability-to-subclass mappings to the script.")
@@ -290,11 +301,11 @@ def main():
         print('}')
         return
     
-    abilities_dir = get_class_abilities_dir()
+    abilities_dir = args.abilities_dir
     
     if not abilities_dir.exists():
         print(f"Error: Directory not found: {abilities_dir}")
-        return
+        sys.exit(1)
     
     print(f"Processing class abilities in: {abilities_dir}")
     print(f"Mapping {len(ABILITY_TO_SUBCLASS)} abilities to subclasses\n")
@@ -304,7 +315,7 @@ def main():
     
     if not json_files:
         print("No ability files found!")
-        return
+        sys.exit(1)
     
     for file_path in sorted(json_files):
         modified = process_abilities_file(file_path, ABILITY_TO_SUBCLASS)
@@ -317,11 +328,9 @@ def main():
     found_abilities = set()
     for file_path in json_files:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                abilities = json.load(f)
-                for ability in abilities:
-                    if isinstance(ability, dict):
-                        found_abilities.add(ability.get("name", ""))
+            for ability in iter_json_array(file_path):
+                if isinstance(ability, dict):
+                    found_abilities.add(ability.get("name", ""))
         except:
             pass
     
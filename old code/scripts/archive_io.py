@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Folder, zip and tar storage for the ability converters.
+
+``open_source`` and ``open_sink`` take either a folder or an archive path and
+return an object with the same small interface, so ``convert_files`` and
+``generate_simplified_abilities`` can read the compendium straight from a
+cached archive and write their output as a single archive instead of
+thousands of small files. A path may point inside an archive, e.g.
+``compendium.zip/Abilities``.
+
+Zip and ``.tar`` archives are memory-mapped and each member is sliced out of
+the mapping (and inflated, for deflated zip members), so reader threads never
+share a file position. ``.tar.gz`` has to be decompressed front to back and
+is loaded once when it is opened.
+
+Archives are written when the sink is closed, with members sorted by name and
+fixed timestamps, so the same output always produces the same archive bytes.
+Member contents are identical to the files written in folder mode. An
+archive sink opened with ``keep_existing`` behaves like a folder that is
+written into: members of the archive already on disk count as existing and
+are carried over unless they are written again.
+
+Usage:
+    python archive_io.py pack ../data_unused/compendium/Abilities /tmp/abilities.zip --store
+    python archive_io.py bench                 # folder vs archive converters
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gzip
+import io
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPENDIUM_DIR = ROOT / "data_unused" / "compendium" / "Abilities"
+
+ARCHIVE_SUFFIXES = {".zip": "zip", ".tar": "tar", ".tar.gz": "tar.gz", ".tgz": "tar.gz"}
+# Earliest date a zip entry can hold; used for every member so archives are reproducible
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+_ZIP_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+PathLike = Union[str, Path]
+
+
+def archive_kind(path: PathLike) -> Optional[str]:
+    name = str(path).lower()
+    for suffix, kind in ARCHIVE_SUFFIXES.items():
+        if name.endswith(suffix):
+            return kind
+    return None
+
+
+def split_archive_path(path: PathLike) -> Tuple[Path, str]:
+    """Split ``x/compendium.zip/Abilities`` into the archive and the folder inside it."""
+    path = Path(path)
+    for candidate in (path, *path.parents):
+        if archive_kind(candidate) and candidate.is_file():
+            inner = path.relative_to(candidate).as_posix()
+            return candidate, "" if inner == "." else inner
+    return path, ""
+
+
+# -----------------------------------------------------------------------------
+# Sources
+# -----------------------------------------------------------------------------
+
+class Source:
+    """Read-only view of a tree of files, addressed by relative POSIX paths."""
+
+    def names(self) -> List[str]:
+        """Every file in the tree, sorted."""
+        raise NotImplementedError
+
+    def read_bytes(self, name: str) -> bytes:
+        raise NotImplementedError
+
+    def read_text(self, name: str) -> str:
+        return self.read_bytes(name).decode("utf-8")
+
+    def files(self, suffix: str = "") -> List[str]:
+        return [name for name in self.names() if name.endswith(suffix)]
+
+    def listdir(self, folder: str = "") -> Tuple[List[str], List[str]]:
+        """Sorted names of the folders and files directly inside ``folder``."""
+        prefix = f"{folder.strip('/')}/" if folder.strip("/") else ""
+        folders, files = set(), []
+        for name in self.names():
+            if not name.startswith(prefix):
+                continue
+            head, _, rest = name[len(prefix):].partition("/")
+            if rest:
+                folders.add(head)
+            else:
+                files.append(head)
+        return sorted(folders), files
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Source":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class DirectorySource(Source):
+    def __init__(self, root: Path):
+        if not root.is_dir():
+            raise FileNotFoundError(f"Source directory not found: {root}")
+        self.root = root
+        self._names = sorted(path.relative_to(root).as_posix() for path in root.rglob("*") if path.is_file())
+
+    def names(self) -> List[str]:
+        return self._names
+
+    def read_bytes(self, name: str) -> bytes:
+        return (self.root / name).read_bytes()
+
+    def read_text(self, name: str) -> str:
+        # Text mode, exactly like the converters read loose files
+        with (self.root / name).open("r", encoding="utf-8") as handle:
+            return handle.read()
+
+
+class _ArchiveSource(Source):
+    """Shared bookkeeping for archives: member names below the inner folder."""
+
+    def __init__(self, path: Path, inner: str):
+        self.path = path
+        self.prefix = f"{inner.strip('/')}/" if inner.strip("/") else ""
+        self._handle = path.open("rb")
+        size = os.fstat(self._handle.fileno()).st_size
+        self._map: Optional[mmap.mmap] = (
+            mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        )
+        self._names: List[str] = []
+
+    def _relative(self, member: str) -> Optional[str]:
+        member = member.lstrip("/")
+        while member.startswith("./"):
+            member = member[2:]
+        if not member.startswith(self.prefix) or member.endswith("/"):
+            return None
+        return member[len(self.prefix):]
+
+    def names(self) -> List[str]:
+        return self._names
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._handle.close()
+
+
+class ZipSource(_ArchiveSource):
+    def __init__(self, path: Path, inner: str = ""):
+        super().__init__(path, inner)
+        # The central directory is parsed by zipfile; member data is read from the mapping
+        self._zip = zipfile.ZipFile(self._handle)
+        self._members: Dict[str, zipfile.ZipInfo] = {}
+        for info in self._zip.infolist():
+            name = self._relative(info.filename)
+            if name is not None:
+                self._members[name] = info
+        self._names = sorted(self._members)
+
+    def read_bytes(self, name: str) -> bytes:
+        info = self._members[name]
+        if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED) or info.flag_bits & 0x1:
+            return self._zip.read(info)
+        # Slicing the mapping needs no shared file position, so reader threads
+        # do not take zipfile's lock
+        header = _ZIP_LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+        start = info.header_offset + _ZIP_LOCAL_HEADER.size + header[10] + header[11]
+        data = self._map[start:start + info.compress_size]
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -zlib.MAX_WBITS)
+        if zlib.crc32(data) != info.CRC:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for {info.filename} in {self.path}")
+        return data
+
+    def close(self) -> None:
+        self._zip.close()
+        super().close()
+
+
+class TarSource(_ArchiveSource):
+    def __init__(self, path: Path, inner: str = "", compressed: bool = False):
+        super().__init__(path, inner)
+        self._data: Dict[str, bytes] = {}
+        self._spans: Dict[str, Tuple[int, int]] = {}
+        if compressed:
+            # A gzip stream cannot be sliced, so read every member once
+            with tarfile.open(fileobj=self._handle, mode="r:*") as archive:
+                for member in archive:
+                    name = self._relative(member.name)
+                    if name is not None and member.isfile():
+                        self._data[name] = archive.extractfile(member).read()
+            self._names = sorted(self._data)
+        elif self._map is not None:
+            with tarfile.open(fileobj=self._map, mode="r:") as archive:
+                for member in archive:
+                    name = self._relative(member.name)
+                    if name is not None and member.isfile():
+                        self._spans[name] = (member.offset_data, member.size)
+            self._names = sorted(self._spans)
+
+    def read_bytes(self, name: str) -> bytes:
+        if name in self._data:
+            return self._data[name]
+        offset, size = self._spans[name]
+        return self._map[offset:offset + size]
+
+
+def open_source(path: PathLike) -> Source:
+    archive, inner = split_archive_path(path)
+    kind = archive_kind(archive) if archive.is_file() else None
+    if kind is None:
+        return DirectorySource(Path(path))
+    if kind == "zip":
+        return ZipSource(archive, inner)
+    return TarSource(archive, inner, compressed=kind != "tar")
+
+
+# -----------------------------------------------------------------------------
+# Sinks
+# -----------------------------------------------------------------------------
+
+class Sink:
+    """Write-only tree of files; safe to use from several writer threads."""
+
+    def exists(self, name: str) -> bool:
+        raise NotImplementedError
+
+    def write_text(self, name: str, text: str) -> None:
+        raise NotImplementedError
+
+    def close(self, commit: bool = True) -> None:
+        pass
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close(commit=exc_type is None)
+
+
+class DirectorySink(Sink):
+    def __init__(self, root: Path):
+        self.root = root
+
+    def exists(self, name: str) -> bool:
+        return (self.root / name).exists()
+
+    def write_text(self, name: str, text: str) -> None:
+        target = self.root / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("w", encoding="utf-8") as handle:
+            handle.write(text)
+
+
+class ArchiveSink(Sink):
+    """Collects members in memory and writes the archive in one go on close.
+
+    A failed run leaves any previous archive at ``path`` untouched. With
+    ``keep_existing`` the members of that archive are kept unless rewritten.
+    """
+
+    def __init__(self, path: Path, kind: str, store: bool = False, keep_existing: bool = False):
+        self.path = path
+        self.kind = kind
+        self.store = store
+        self._members: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._existing: Optional[Source] = None
+        self._existing_names: frozenset = frozenset()
+        if keep_existing and path.is_file():
+            self._existing = ZipSource(path) if kind == "zip" else TarSource(path, compressed=kind != "tar")
+            self._existing_names = frozenset(self._existing.names())
+
+    def exists(self, name: str) -> bool:
+        with self._lock:
+            return name in self._members or name in self._existing_names
+
+    def write_text(self, name: str, text: str) -> None:
+        data = text.encode("utf-8")
+        with self._lock:
+            self._members[name] = data
+
+    def _write_zip(self, handle) -> None:
+        compression = zipfile.ZIP_STORED if self.store else zipfile.ZIP_DEFLATED
+        with zipfile.ZipFile(handle, "w", compression=compression) as archive:
+            for name in sorted(self._members):
+                info = zipfile.ZipInfo(name, date_time=ZIP_EPOCH)
+                info.compress_type = compression
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, self._members[name])
+
+    def _write_tar(self, handle) -> None:
+        with tarfile.open(fileobj=handle, mode="w", format=tarfile.PAX_FORMAT) as archive:
+            for name in sorted(self._members):
+                info = tarfile.TarInfo(name)
+                info.size = len(self._members[name])
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(self._members[name]))
+
+    def _carry_over_existing(self) -> None:
+        if self._existing is None:
+            return
+        try:
+            for name in self._existing_names - set(self._members):
+                self._members[name] = self._existing.read_bytes(name)
+        finally:
+            # Closed before the archive is replaced
+            self._existing.close()
+            self._existing = None
+
+    def close(self, commit: bool = True) -> None:
+        if not commit:
+            if self._existing is not None:
+                self._existing.close()
+                self._existing = None
+            return
+        self._carry_over_existing()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                if self.kind == "zip":
+                    self._write_zip(handle)
+                elif self.kind == "tar":
+                    self._write_tar(handle)
+                else:
+                    # mtime=0 keeps the gzip header reproducible
+                    with gzip.GzipFile(fileobj=handle, mode="wb", mtime=0) as compressed:
+                        self._write_tar(compressed)
+            os.replace(temp_name, self.path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+
+def open_sink(path: PathLike, store: bool = False, keep_existing: bool = False) -> Sink:
+    """Archive sink for archive suffixes, folder sink for anything else.
+
+    ``store`` writes zip members uncompressed, which lets readers slice them
+    out of a memory mapping. ``keep_existing`` makes an archive sink keep the
+    members of the archive already at ``path``, the way files already in a
+    folder stay there; folder sinks always do.
+    """
+    path = Path(path)
+    kind = archive_kind(path)
+    if kind is None:
+        return DirectorySink(path)
+    return ArchiveSink(path, kind, store=store, keep_existing=keep_existing)
+
+
+def pack(source: PathLike, target: PathLike, store: bool = False) -> int:
+    with open_source(source) as reader, open_sink(target, store=store) as writer:
+        for name in reader.names():
+            writer.write_text(name, reader.read_bytes(name).decode("utf-8"))
+        return len(reader.names())
+
+
+# -----------------------------------------------------------------------------
+# Benchmark
+# -----------------------------------------------------------------------------
+
+def _tree_bytes(path: PathLike) -> Dict[str, bytes]:
+    with open_source(path) as source:
+        return {name: source.read_bytes(name) for name in source.names()}
+
+
+def _timed(func, *args, **kwargs) -> float:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(*args, **kwargs)
+    return time.perf_counter() - started
+
+
+def _extract(archive: Path, target: Path) -> None:
+    if archive_kind(archive) == "zip":
+        with zipfile.ZipFile(archive) as handle:
+            handle.extractall(target)
+    else:
+        with tarfile.open(archive) as handle:
+            handle.extractall(target, filter="data")
+
+
+def benchmark(compendium: Path, work: Path, repeats: int) -> bool:
+    from extract_class_abilities import convert_files
+    from generate_simplified_abilities import write_simplified
+
+    archives = {
+        "zip": work / "in" / "abilities.zip",
+        "zip (stored)": work / "in" / "abilities_stored.zip",
+        "tar": work / "in" / "abilities.tar",
+        "tar.gz": work / "in" / "abilities.tar.gz",
+    }
+    count = 0
+    for label, path in archives.items():
+        count = pack(compendium, path, store=label == "zip (stored)")
+
+    converters = {
+        "extract": lambda source, target: convert_files(source_dir=source, target_dir=target),
+        "simplify": lambda source, target: write_simplified(source, target),
+    }
+    identical = True
+    print(f"{count} compendium files; best of {repeats} run(s)")
+    print("Unpack + convert is the loose-file workflow: unpack the cached archive, then convert the folder.\n")
+    print(f"{'Converter':<10} {'Input':<13} {'Output':<7} {'Size':>8} {'Unpack+convert':>15} {'Direct':>9} {'Speedup':>8}  Same")
+    print("-" * 84)
+    for converter, run in converters.items():
+        reference = work / "out" / converter / "loose"
+        loose = min(_timed(run, compendium, reference / str(i)) for i in range(repeats))
+        expected = _tree_bytes(reference / "0")
+        print(f"{converter:<10} {'folder':<13} {'folder':<7} {'':>8} {loose * 1000:>13.0f}ms {'':>9} {'':>8}  ✓")
+
+        for label, archive in archives.items():
+            unpack = min(_timed(_extract, archive, work / "x" / converter / label / str(i)) for i in range(repeats))
+            for output in ("folder", "zip"):
+                target = work / "out" / converter / f"{label}.{output}"
+                runs = []
+                for i in range(repeats):
+                    destination = target / str(i) if output == "folder" else target / f"{i}.zip"
+                    runs.append(_timed(run, archive, destination))
+                same = _tree_bytes(target / "0" if output == "folder" else target / "0.zip") == expected
+                identical &= same
+                direct = min(runs)
+                print(
+                    f"{'':<10} {label:<13} {output:<7} {archive.stat().st_size / 1024:>6.0f} K "
+                    f"{(unpack + loose) * 1000:>13.0f}ms {direct * 1000:>7.0f}ms {(unpack + loose) / direct:>7.2f}x  "
+                    f"{'✓' if same else '✗'}"
+                )
+        print()
+    return identical
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Folder and archive storage for the converters.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = sub.add_parser("pack", help="Pack a folder (or archive) into a reproducible archive.")
+    pack_parser.add_argument("source", type=Path)
+    pack_parser.add_argument("target", type=Path, help="Archive to write (.zip, .tar, .tar.gz).")
+    pack_parser.add_argument("--store", action="store_true", help="Write zip members uncompressed.")
+
+    bench = sub.add_parser("bench", help="Compare folder and archive input/output for both converters.")
+    bench.add_argument("--compendium-dir", type=Path, default=COMPENDIUM_DIR)
+    bench.add_argument("--repeats", type=int, default=3)
+    bench.add_argument("--keep", type=Path, help="Keep the benchmark files in this folder.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "pack":
+        if archive_kind(args.target) is None:
+            print(f"✗ Not an archive path: {args.target}", file=sys.stderr)
+            sys.exit(2)
+        started = time.perf_counter()
+        count = pack(args.source, args.target, store=args.store)
+        print(
+            f"✓ Packed {count} files into {args.target} ({args.target.stat().st_size / 1024:,.1f} KiB) "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        return
+
+    work = args.keep or Path(tempfile.mkdtemp(prefix="archive_bench_"))
+    try:
+        identical = benchmark(args.compendium_dir, work, args.repeats)
+    finally:
+        if args.keep is None:
+            shutil.rmtree(work, ignore_errors=True)
+    if not identical:
+        print("✗ Archive output differs from folder output", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Size and decode-time budget report for the bundled hero_smith/data assets.
+
+For every file under hero_smith/data the report measures the raw size, the
+gzip size (what the download roughly costs), the record count, the JSON decode
+time and the largest records. The numbers are compared with a stored baseline
+and the script exits with status 1 when a budget is exceeded, so a
+regeneration that doubles a file is noticed.
+
+Budgets live in the baseline file next to the measurements and can be
+overridden on the command line:
+
+    max_file_growth_pct    gzip growth allowed per file (ignored below
+                           growth_floor_bytes of absolute growth)
+    max_total_growth_pct   gzip growth allowed for the whole data folder
+    max_total_gzip_bytes   absolute cap on the gzip total (optional)
+    max_file_decode_ms     decode time cap for a single file (optional)
+
+Usage:
+    python asset_budget.py                      # report and check budgets
+    python asset_budget.py --update-baseline    # accept the current sizes
+    python asset_budget.py --max-file-growth 25 --records 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DATA_DIR = SCRIPT_DIR.parent.parent / "hero_smith" / "data"
+BASELINE_FILE = SCRIPT_DIR / "asset_budget_baseline.json"
+
+DEFAULT_BUDGETS: Dict[str, Optional[float]] = {
+    "max_file_growth_pct": 10.0,
+    "growth_floor_bytes": 1024,
+    "max_total_growth_pct": 5.0,
+    "max_total_gzip_bytes": None,
+    "max_file_decode_ms": None,
+}
+
+
+def _record_label(record: Any, index: int) -> str:
+    if isinstance(record, dict):
+        for key in ("id", "name", "title"):
+            value = record.get(key)
+            if isinstance(value, str) and value:
+                return value
+    return f"#{index}"
+
+
+def _records(data: Any) -> List[Tuple[str, Any]]:
+    """Top-level records: list elements, or the values of a dict of objects."""
+    if isinstance(data, list):
+        return [(_record_label(item, index), item) for index, item in enumerate(data)]
+    if isinstance(data, dict):
+        if data and all(isinstance(value, (dict, list)) for value in data.values()):
+            return [(str(key), value) for key, value in data.items()]
+        return [(_record_label(data, 0), data)]
+    return []
+
+
+def measure_file(path: Path, repeats: int = 3, top_records: int = 3) -> Dict[str, Any]:
+    raw = path.read_bytes()
+    entry: Dict[str, Any] = {
+        "raw_bytes": len(raw),
+        "gzip_bytes": len(gzip.compress(raw, compresslevel=9, mtime=0)),
+    }
+    if path.suffix.lower() != ".json":
+        return entry
+
+    best = float("inf")
+    data: Any = None
+    try:
+        for _ in range(max(1, repeats)):
+            started = time.perf_counter()
+            data = json.loads(raw.decode("utf-8"))
+            best = min(best, time.perf_counter() - started)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        entry["error"] = str(exc)
+        return entry
+
+    records = _records(data)
+    sizes = sorted(
+        ((len(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")), label)
+         for label, record in records),
+        reverse=True,
+    )
+    entry["records"] = len(records)
+    entry["decode_ms"] = round(best * 1000, 3)
+    entry["largest"] = [{"label": label, "bytes": size} for size, label in sizes[:top_records]]
+    return entry
+
+
+def measure(data_dir: Path, repeats: int = 3, top_records: int = 3) -> Dict[str, Dict[str, Any]]:
+    return {
+        path.relative_to(data_dir).as_posix(): measure_file(path, repeats, top_records)
+        for path in sorted(p for p in data_dir.rglob("*") if p.is_file())
+    }
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {"budgets": dict(DEFAULT_BUDGETS), "files": {}}
+    with path.open("r", encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    budgets = dict(DEFAULT_BUDGETS)
+    budgets.update(baseline.get("budgets", {}))
+    baseline["budgets"] = budgets
+    baseline.setdefault("files", {})
+    return baseline
+
+
+def save_baseline(path: Path, budgets: Dict[str, Any], files: Dict[str, Dict[str, Any]]) -> None:
+    stored = {
+        name: {key: entry[key] for key in ("raw_bytes", "gzip_bytes", "records") if key in entry}
+        for name, entry in files.items()
+    }
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump({"budgets": budgets, "files": stored}, handle, indent=2, ensure_ascii=False)
+        handle.write("\n")
+
+
+def _growth_pct(current: int, previous: int) -> Optional[float]:
+    if not previous:
+        return None
+    return (current - previous) * 100.0 / previous
+
+
+def check_budgets(
+    files: Dict[str, Dict[str, Any]],
+    baseline_files: Dict[str, Dict[str, Any]],
+    budgets: Dict[str, Any],
+) -> List[str]:
+    violations: List[str] = []
+    floor = budgets.get("growth_floor_bytes") or 0
+
+    max_file_growth = budgets.get("max_file_growth_pct")
+    max_decode = budgets.get("max_file_decode_ms")
+    for name, entry in files.items():
+        previous = baseline_files.get(name)
+        if previous and max_file_growth is not None:
+            growth = _growth_pct(entry["gzip_bytes"], previous["gzip_bytes"])
+            delta = entry["gzip_bytes"] - previous["gzip_bytes"]
+            if growth is not None and growth > max_file_growth and delta > floor:
+                violations.append(
+                    f"{name}: gzip size grew {growth:.1f}% ({previous['gzip_bytes']} -> {entry['gzip_bytes']} bytes), "
+                    f"budget {max_file_growth}%"
+                )
+        if max_decode is not None and entry.get("decode_ms", 0) > max_decode:
+            violations.append(f"{name}: decode took {entry['decode_ms']:.2f} ms, budget {max_decode} ms")
+
+    total = sum(entry["gzip_bytes"] for entry in files.values())
+    previous_total = sum(entry["gzip_bytes"] for entry in baseline_files.values())
+    max_total_growth = budgets.get("max_total_growth_pct")
+    if baseline_files and max_total_growth is not None:
+        growth = _growth_pct(total, previous_total)
+        if growth is not None and growth > max_total_growth:
+            violations.append(
+                f"total gzip size grew {growth:.1f}% ({previous_total} -> {total} bytes), budget {max_total_growth}%"
+            )
+    max_total = budgets.get("max_total_gzip_bytes")
+    if max_total is not None and total > max_total:
+        violations.append(f"total gzip size {total} bytes exceeds budget {int(max_total)} bytes")
+    return violations
+
+
+def _kib(size: int) -> str:
+    return f"{size / 1024:,.1f}"
+
+
+def print_report(
+    files: Dict[str, Dict[str, Any]],
+    baseline_files: Dict[str, Dict[str, Any]],
+    top: int,
+    show_records: int,
+) -> None:
+    ordered = sorted(files.items(), key=lambda item: item[1]["gzip_bytes"], reverse=True)
+    header = f"{'File':<58} {'Raw KiB':>9} {'Gzip KiB':>9} {'Δ gzip':>8} {'Records':>8} {'Decode ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, entry in ordered[:top] if top else ordered:
+        previous = baseline_files.get(name)
+        if previous is None:
+            change = "new"
+        else:
+            growth = _growth_pct(entry["gzip_bytes"], previous["gzip_bytes"])
+            change = f"{growth:+.1f}%" if growth is not None else "-"
+        records = entry.get("records")
+        decode = entry.get("decode_ms")
+        print(
+            f"{name:<58} {_kib(entry['raw_bytes']):>9} {_kib(entry['gzip_bytes']):>9} {change:>8} "
+            f"{records if records is not None else '-':>8} {f'{decode:.2f}' if decode is not None else '-':>10}"
+        )
+        if show_records:
+            for record in entry.get("largest", [])[:show_records]:
+                print(f"    {record['label']:<54} {_kib(record['bytes']):>9}")
+        if "error" in entry:
+            print(f"    ⚠ not valid JSON: {entry['error']}")
+    if top and len(ordered) > top:
+        print(f"... {len(ordered) - top} smaller file(s) not shown")
+
+    removed = sorted(set(baseline_files) - set(files))
+    for name in removed:
+        print(f"{name:<58} {'removed':>9}")
+
+    total_raw = sum(entry["raw_bytes"] for entry in files.values())
+    total_gzip = sum(entry["gzip_bytes"] for entry in files.values())
+    total_decode = sum(entry.get("decode_ms", 0) for entry in files.values())
+    total_records = sum(entry.get("records", 0) for entry in files.values())
+    print("-" * len(header))
+    print(
+        f"{f'Total ({len(files)} files)':<58} {_kib(total_raw):>9} {_kib(total_gzip):>9} {'':>8} "
+        f"{total_records:>8} {total_decode:>10.2f}"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report asset sizes and check them against budgets.")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="Asset folder to measure.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Stored baseline and budgets.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the current measurements as the baseline.")
+    parser.add_argument("--max-file-growth", type=float, help="Override max_file_growth_pct.")
+    parser.add_argument("--max-total-growth", type=float, help="Override max_total_growth_pct.")
+    parser.add_argument("--max-total-gzip", type=int, help="Override max_total_gzip_bytes.")
+    parser.add_argument("--max-decode-ms", type=float, help="Override max_file_decode_ms.")
+    parser.add_argument("--repeats", type=int, default=3, help="Decode repetitions per file (best is kept).")
+    parser.add_argument("--top", type=int, default=25, help="Files to list, largest first (0 for all).")
+    parser.add_argument("--records", type=int, default=0, help="Largest records to list per file.")
+    parser.add_argument("--json", action="store_true", help="Print the measurements as JSON instead of a table.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.data_dir.exists():
+        print(f"Data folder not found: {args.data_dir}", file=sys.stderr)
+        sys.exit(2)
+
+    baseline = load_baseline(args.baseline)
+    budgets = baseline["budgets"]
+    overrides = {
+        "max_file_growth_pct": args.max_file_growth,
+        "max_total_growth_pct": args.max_total_growth,
+        "max_total_gzip_bytes": args.max_total_gzip,
+        "max_file_decode_ms": args.max_decode_ms,
+    }
+    budgets.update({key: value for key, value in overrides.items() if value is not None})
+
+    files = measure(args.data_dir, args.repeats, max(args.records, 3))
+
+    if args.json:
+        print(json.dumps({"budgets": budgets, "files": files}, indent=2, ensure_ascii=False))
+    else:
+        print_report(files, baseline["files"], args.top, args.records)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, budgets, files)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not baseline["files"]:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one.")
+        return
+
+    violations = check_budgets(files, baseline["files"], budgets)
+    if violations:
+        print(f"\n{len(violations)} budget violation(s):")
+        for violation in violations:
+            print(f"  ✗ {violation}")
+        sys.exit(1)
+    print("\n✓ All assets within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, deduplicated store for data backups.
+
+Instead of copying the whole hero_smith/data folder for every backup, file
+contents are stored once under their SHA-256 in a shared object store, and a
+snapshot is a small manifest that maps paths to object hashes:
+
+    data backup/store/
+        objects/ab/cdef...          file contents, one per distinct hash
+        snapshots/<name>.json       {"files": {"story/titles.json": {...}}}
+
+Taking a snapshot only hashes files whose size or modification time changed
+since the last snapshot of the same folder (a stat cache kept next to the
+store), and only writes objects that are not in the store yet.
+
+Usage:
+    python backup_store.py take                         # snapshot hero_smith/data
+    python backup_store.py take --name before_rework --source ../../hero_smith/data
+    python backup_store.py list
+    python backup_store.py restore before_rework /tmp/restored
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DATA_DIR = REPO_ROOT / "hero_smith" / "data"
+STORE_DIR = REPO_ROOT / "data backup" / "store"
+STAT_CACHE_NAME = ".stat_cache.json"
+HASH_CHUNK = 1024 * 1024
+HEX_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+class BackupStore:
+    def __init__(self, root: Path = STORE_DIR):
+        self.root = root
+        self.objects = root / "objects"
+        self.snapshots = root / "snapshots"
+        self.stat_cache_file = root / STAT_CACHE_NAME
+
+    # -- objects -------------------------------------------------------------
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    def has_object(self, digest: str) -> bool:
+        return self.object_path(digest).exists()
+
+    def put_object(self, digest: str, source: Path) -> bool:
+        """Copy ``source`` into the store; returns False if it was already there."""
+        target = self.object_path(digest)
+        if target.exists():
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(prefix=".obj.", dir=target.parent)
+        try:
+            with os.fdopen(fd, "wb") as out, source.open("rb") as handle:
+                hasher = hashlib.sha256()
+                for chunk in iter(lambda: handle.read(HASH_CHUNK), b""):
+                    hasher.update(chunk)
+                    out.write(chunk)
+            if hasher.hexdigest() != digest:
+                raise RuntimeError(f"{source} changed while it was being stored")
+            os.replace(temp_name, target)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return True
+
+    # -- snapshots -----------------------------------------------------------
+
+    def snapshot_path(self, name: str) -> Path:
+        # Names become file names directly under snapshots/, never paths
+        if not name or "/" in name or "\\" in name or ".." in name or "\0" in name:
+            raise ValueError(f"Invalid snapshot name {name!r}: path separators and '..' are not allowed")
+        return self.snapshots / f"{name}.json"
+
+    def snapshot_names(self) -> List[str]:
+        if not self.snapshots.exists():
+            return []
+        return sorted(path.stem for path in self.snapshots.glob("*.json"))
+
+    def load_snapshot(self, name: str) -> Dict:
+        path = self.snapshot_path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"No snapshot named {name!r} in {self.root}")
+        with path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _load_stat_cache(self) -> Dict[str, Dict[str, List]]:
+        if not self.stat_cache_file.exists():
+            return {}
+        try:
+            with self.stat_cache_file.open("r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_stat_cache(self, cache: Dict[str, Dict[str, List]]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp = self.stat_cache_file.with_suffix(".tmp")
+        with temp.open("w", encoding="utf-8") as handle:
+            json.dump(cache, handle)
+        temp.replace(self.stat_cache_file)
+
+    def take(self, source: Path, name: str) -> Tuple[Dict, Counter]:
+        """Snapshot ``source`` under ``name``; returns the manifest and work counters."""
+        if self.snapshot_path(name).exists():
+            raise FileExistsError(f"Snapshot {name!r} already exists")
+        source = source.resolve()
+        cache = self._load_stat_cache()
+        previous = cache.get(str(source), {})
+        current: Dict[str, List] = {}
+        files: Dict[str, Dict] = {}
+        counts: Counter = Counter()
+
+        for path in sorted(p for p in source.rglob("*") if p.is_file()):
+            relative = path.relative_to(source).as_posix()
+            stat = path.stat()
+            cached = previous.get(relative)
+            if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns and self.has_object(cached[2]):
+                digest = cached[2]
+                counts["unchanged"] += 1
+            else:
+                hasher = hashlib.sha256()
+                with path.open("rb") as handle:
+                    for chunk in iter(lambda: handle.read(HASH_CHUNK), b""):
+                        hasher.update(chunk)
+                digest = hasher.hexdigest()
+                counts["hashed"] += 1
+                if self.put_object(digest, path):
+                    counts["stored"] += 1
+                    counts["stored_bytes"] += stat.st_size
+            current[relative] = [stat.st_size, stat.st_mtime_ns, digest]
+            files[relative] = {"hash": digest, "size": stat.st_size, "mode": stat.st_mode & 0o777}
+
+        manifest = {
+            "name": name,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "source": os.path.relpath(source, REPO_ROOT),
+            "files": files,
+        }
+        self.snapshots.mkdir(parents=True, exist_ok=True)
+        # Readers only ever see a complete manifest
+        fd, temp_name = tempfile.mkstemp(prefix=".snapshot.", dir=self.snapshots)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(manifest, handle, indent=2, ensure_ascii=False)
+                handle.write("\n")
+            os.replace(temp_name, self.snapshot_path(name))
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        cache[str(source)] = current
+        self._save_stat_cache(cache)
+        return manifest, counts
+
+    def restore(self, name: str, target: Path, force: bool = False) -> Counter:
+        """Write snapshot ``name`` into ``target``, skipping files that already match."""
+        manifest = self.load_snapshot(name)
+        if target.exists() and any(target.iterdir()) and not force:
+            raise FileExistsError(f"{target} is not empty; use --force to restore over it")
+        # Check every entry before writing anything: a manifest is plain JSON
+        # and must not be able to write outside ``target`` or read outside
+        # the object store.
+        root = target.resolve()
+        destinations: Dict[str, Path] = {}
+        for relative, entry in manifest["files"].items():
+            destination = (root / relative).resolve()
+            if destination == root or root not in destination.parents:
+                raise ValueError(f"Snapshot {name!r} has a path outside the target: {relative!r}")
+            if not HEX_DIGEST.fullmatch(str(entry.get("hash", ""))):
+                raise ValueError(f"Snapshot {name!r} has an invalid hash for {relative!r}")
+            destinations[relative] = destination
+
+        counts: Counter = Counter()
+        for relative, entry in manifest["files"].items():
+            destination = destinations[relative]
+            if destination.exists() and destination.stat().st_size == entry["size"]:
+                if hashlib.sha256(destination.read_bytes()).hexdigest() == entry["hash"]:
+                    counts["unchanged"] += 1
+                    continue
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            data = self.object_path(entry["hash"]).read_bytes()
+            if hashlib.sha256(data).hexdigest() != entry["hash"]:
+                raise RuntimeError(f"Object for {relative} is corrupt: {entry['hash']}")
+            destination.write_bytes(data)
+            os.chmod(destination, entry.get("mode", 0o644))
+            counts["written"] += 1
+        if force:
+            wanted = set(manifest["files"])
+            for path in target.rglob("*"):
+                if path.is_file() and path.relative_to(target).as_posix() not in wanted:
+                    path.unlink()
+                    counts["deleted"] += 1
+            for path in sorted(target.rglob("*"), key=lambda p: len(p.parts), reverse=True):
+                if path.is_dir() and not any(path.iterdir()):
+                    path.rmdir()
+        return counts
+
+    def usage(self) -> List[Dict]:
+        """Per-snapshot totals; unique bytes are objects no other snapshot uses."""
+        manifests = sorted(
+            (self.load_snapshot(name) for name in self.snapshot_names()),
+            key=lambda manifest: (manifest.get("created", ""), manifest["name"]),
+        )
+        references: Counter = Counter()
+        for manifest in manifests:
+            for digest in {entry["hash"] for entry in manifest["files"].values()}:
+                references[digest] += 1
+        rows = []
+        for manifest in manifests:
+            sizes = {entry["hash"]: entry["size"] for entry in manifest["files"].values()}
+            rows.append({
+                "name": manifest["name"],
+                "created": manifest.get("created", ""),
+                "files": len(manifest["files"]),
+                "total_bytes": sum(entry["size"] for entry in manifest["files"].values()),
+                "unique_bytes": sum(size for digest, size in sizes.items() if references[digest] == 1),
+            })
+        return rows
+
+    def object_bytes(self) -> int:
+        if not self.objects.exists():
+            return 0
+        return sum(path.stat().st_size for path in self.objects.rglob("*") if path.is_file())
+
+
+def _kib(size: int) -> str:
+    return f"{size / 1024:,.1f} KiB"
+
+
+def default_name() -> str:
+    # Matches the existing "data_backup_08.01.2026" folders
+    today = datetime.date.today()
+    return f"data_backup_{today.day:02d}.{today.month:02d}.{today.year}"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Deduplicated snapshots of hero_smith/data.")
+    parser.add_argument("--store", type=Path, default=STORE_DIR, help="Object store folder.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    take = sub.add_parser("take", help="Take a snapshot.")
+    take.add_argument("--source", type=Path, default=DATA_DIR, help="Folder to snapshot.")
+    take.add_argument("--name", help="Snapshot name (default: data_backup_DD.MM.YYYY).")
+
+    restore = sub.add_parser("restore", help="Restore a snapshot into a folder.")
+    restore.add_argument("name")
+    restore.add_argument("target", type=Path)
+    restore.add_argument("--force", action="store_true", help="Restore over a non-empty folder, removing extra files.")
+
+    sub.add_parser("list", help="List snapshots and their sizes.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    store = BackupStore(args.store)
+    started = time.perf_counter()
+
+    try:
+        if args.command == "take":
+            if not args.source.is_dir():
+                print(f"Source folder not found: {args.source}", file=sys.stderr)
+                sys.exit(2)
+            manifest, counts = store.take(args.source, args.name or default_name())
+            print(
+                f"✓ Snapshot {manifest['name']}: {len(manifest['files'])} files, "
+                f"{counts['hashed']} hashed, {counts['unchanged']} unchanged by stat, "
+                f"{counts['stored']} new object(s) ({_kib(counts['stored_bytes'])}) "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+        elif args.command == "restore":
+            counts = store.restore(args.name, args.target, args.force)
+            print(
+                f"✓ Restored {args.name} to {args.target}: {counts['written']} written, "
+                f"{counts['unchanged']} already up to date, {counts['deleted']} removed "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+        else:
+            rows = store.usage()
+            if not rows:
+                print(f"No snapshots in {store.root}")
+                return
+            print(f"{'Snapshot':<32} {'Created':<20} {'Files':>6} {'Total':>14} {'Unique':>14}")
+            for row in rows:
+                print(
+                    f"{row['name']:<32} {row['created']:<20} {row['files']:>6} "
+                    f"{_kib(row['total_bytes']):>14} {_kib(row['unique_bytes']):>14}"
+                )
+            logical = sum(row["total_bytes"] for row in rows)
+            stored = store.object_bytes()
+            print(f"\nStore holds {_kib(stored)} for {_kib(logical)} of snapshots")
+    except (FileExistsError, FileNotFoundError, ValueError) as exc:
+        print(f"✗ {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the data pipeline scripts.
+
+Every script is declared as a build step with the files it reads, the files it
+writes and the steps that must finish before it. A step is skipped when the
+content hashes of its inputs and outputs match the last successful run, so a
+build only redoes the work affected by a change. Independent steps run
+concurrently and a per-step timing summary is printed at the end.
+
+Usage:
+    python build.py                 # build everything that is out of date
+    python build.py add_subclass    # build one step (and the steps it needs)
+    python build.py --force         # ignore the recorded hashes
+    python build.py --list          # show the declared steps
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+OLD_CODE_DIR = SCRIPTS_DIR.parent
+REPO_ROOT = OLD_CODE_DIR.parent
+APP_DIR = REPO_ROOT / "hero_smith"
+TEST_HEROES_DIR = OLD_CODE_DIR / "test_heroes"
+STATE_FILE = SCRIPTS_DIR / ".build_state.json"
+
+COMPENDIUM_DIR = OLD_CODE_DIR / "data_unused" / "compendium"
+APP_DATA_DIR = APP_DIR / "data"
+SIMPLIFIED_DIR = APP_DATA_DIR / "abilities" / "class_abilities_simplified"
+CLASS_FEATURES_DIR = APP_DATA_DIR / "features" / "class_features"
+ANCESTRY_TRAITS_FILE = APP_DATA_DIR / "story" / "ancestries" / "ancestry_traits.json"
+APP_BUILD_DIR = APP_DIR / "build"
+CLASS_ABILITIES_DIR = APP_BUILD_DIR / "class_abilities_new"
+
+
+@dataclass
+class Step:
+    name: str
+    script: Path
+    cwd: Path
+    inputs: List[str]
+    outputs: List[str]
+    deps: List[str] = field(default_factory=list)
+    args: List[str] = field(default_factory=list)
+
+    def command(self) -> List[str]:
+        return [sys.executable, str(self.script), *self.args]
+
+
+def rel(path: Path, pattern: str = "") -> str:
+    """Glob pattern for ``pattern`` under ``path``, relative to the repository root."""
+    base = path.relative_to(REPO_ROOT).as_posix()
+    return f"{base}/{pattern}" if pattern else base
+
+
+# Paths in ``inputs``/``outputs`` are glob patterns relative to the repository
+# root. The script itself and the outputs of every step in ``deps`` are always
+# treated as inputs of a step, so a change upstream invalidates everything
+# downstream of it; ``inputs`` lists the rest, including the helper modules
+# the script imports. Every step is given its folders explicitly so the
+# declared patterns and the files the script touches cannot drift apart, and a
+# step whose input pattern matches no file fails instead of running.
+STEPS: List[Step] = [
+    Step(
+        name="convert_abilities",
+        script=SCRIPTS_DIR / "extract_class_abilities.py",
+        cwd=SCRIPTS_DIR,
+        inputs=["old code/scripts/archive_io.py", rel(COMPENDIUM_DIR, "Abilities/**/*.json")],
+        outputs=[rel(CLASS_ABILITIES_DIR, "**/*.json")],
+        args=["--source-dir", str(COMPENDIUM_DIR / "Abilities"), "--target-dir", str(CLASS_ABILITIES_DIR)],
+    ),
+    Step(
+        name="generate_simplified",
+        script=SCRIPTS_DIR / "generate_simplified_abilities.py",
+        cwd=SCRIPTS_DIR,
+        inputs=["old code/scripts/archive_io.py", rel(COMPENDIUM_DIR, "Abilities/**/*.json")],
+        outputs=[rel(SIMPLIFIED_DIR, "*_abilities.json")],
+        args=["--compendium-dir", str(COMPENDIUM_DIR / "Abilities"), "--output-dir", str(SIMPLIFIED_DIR)],
+    ),
+    Step(
+        name="add_subclass",
+        script=SCRIPTS_DIR / "add_subclass_to_abilities.py",
+        cwd=SCRIPTS_DIR,
+        inputs=["old code/scripts/json_stream.py"],
+        outputs=[rel(SIMPLIFIED_DIR, "*_abilities.json")],
+        deps=["generate_simplified"],
+        args=["--abilities-dir", str(SIMPLIFIED_DIR)],
+    ),
+    Step(
+        name="validate_abilities",
+        script=SCRIPTS_DIR / "validate_abilities.py",
+        cwd=SCRIPTS_DIR,
+        inputs=["old code/scripts/json_stream.py"],
+        outputs=[],
+        deps=["convert_abilities", "add_subclass"],
+        args=[str(CLASS_ABILITIES_DIR), str(SIMPLIFIED_DIR)],
+    ),
+    Step(
+        name="ability_availability",
+        script=SCRIPTS_DIR / "build_ability_availability.py",
+        cwd=SCRIPTS_DIR,
+        inputs=[rel(COMPENDIUM_DIR, "Features/**/*.json")],
+        outputs=[rel(APP_BUILD_DIR, "ability_availability.json")],
+        deps=["add_subclass"],
+        args=[
+            "--abilities-dir", str(SIMPLIFIED_DIR),
+            "--features-dir", str(COMPENDIUM_DIR / "Features"),
+            "--output", str(APP_BUILD_DIR / "ability_availability.json"),
+        ],
+    ),
+    Step(
+        name="asset_database",
+        script=SCRIPTS_DIR / "build_asset_database.py",
+        cwd=SCRIPTS_DIR,
+        inputs=["hero_smith/pubspec.yaml", rel(APP_DATA_DIR, "**/*.json")],
+        outputs=[rel(APP_BUILD_DIR, "hero_smith_assets.db")],
+        deps=["validate_abilities"],
+        args=[
+            "--app-dir", str(APP_DIR),
+            "--class-abilities-dir", str(CLASS_ABILITIES_DIR),
+            "--output", str(APP_BUILD_DIR / "hero_smith_assets.db"),
+        ],
+    ),
+    Step(
+        name="asset_budget",
+        script=SCRIPTS_DIR / "asset_budget.py",
+        cwd=SCRIPTS_DIR,
+        inputs=[rel(APP_DATA_DIR, "**/*"), "old code/scripts/asset_budget_baseline.json"],
+        outputs=[],
+        deps=["add_subclass"],
+        args=["--data-dir", str(APP_DATA_DIR)],
+    ),
+    Step(
+        name="check_conduit_duplicates",
+        script=SCRIPTS_DIR / "check_conduit_option_duplicates.py",
+        cwd=SCRIPTS_DIR,
+        inputs=[rel(CLASS_FEATURES_DIR, "conduit_features.json")],
+        outputs=[],
+        deps=["add_subclass"],
+        args=[str(CLASS_FEATURES_DIR / "conduit_features.json")],
+    ),
+    Step(
+        name="check_feature_duplicates",
+        script=SCRIPTS_DIR / "check_feature_option_duplicates.py",
+        cwd=SCRIPTS_DIR,
+        inputs=[rel(CLASS_FEATURES_DIR, "*_features.json")],
+        outputs=[],
+        deps=["add_subclass"],
+        args=[str(CLASS_FEATURES_DIR)],
+    ),
+    Step(
+        name="update_ancestry_descriptions",
+        script=SCRIPTS_DIR / "update_ancestry_descriptions.py",
+        cwd=SCRIPTS_DIR,
+        inputs=[rel(COMPENDIUM_DIR, "Ancestries/*.ts")],
+        outputs=[rel(ANCESTRY_TRAITS_FILE)],
+        args=["--ts-dir", str(COMPENDIUM_DIR / "Ancestries"), "--json-file", str(ANCESTRY_TRAITS_FILE)],
+    ),
+    Step(
+        name="generate_import_codes",
+        script=TEST_HEROES_DIR / "generate_import_codes.py",
+        cwd=TEST_HEROES_DIR,
+        inputs=[rel(TEST_HEROES_DIR, "hero_*.json")],
+        outputs=[rel(TEST_HEROES_DIR, "import_codes/*.txt")],
+        args=["--heroes-dir", str(TEST_HEROES_DIR), "--output-dir", str(TEST_HEROES_DIR / "import_codes")],
+    ),
+]
+
+
+class FileHasher:
+    """Content hasher that reuses digests of files whose stat is unchanged."""
+
+    def __init__(self, cache: Optional[Dict[str, List]] = None):
+        self.cache: Dict[str, List] = dict(cache or {})
+
+    def file_digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = path.relative_to(REPO_ROOT).as_posix()
+        cached = self.cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+        self.cache[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def tree_digest(self, patterns: Iterable[str]) -> str:
+        """Hash the names and contents of every file matched by ``patterns``."""
+        files = set()
+        for pattern in patterns:
+            files.update(path for path in REPO_ROOT.glob(pattern) if path.is_file())
+
+        combined = hashlib.blake2b(digest_size=16)
+        for path in sorted(files):
+            combined.update(path.relative_to(REPO_ROOT).as_posix().encode("utf-8"))
+            combined.update(b"\0")
+            combined.update(self.file_digest(path).encode("ascii"))
+            combined.update(b"\n")
+        return combined.hexdigest()
+
+
+def step_inputs(step: Step) -> List[str]:
+    """The script, the declared inputs and the outputs of every dependency."""
+    by_name = {candidate.name: candidate for candidate in STEPS}
+    patterns = [step.script.relative_to(REPO_ROOT).as_posix(), *step.inputs]
+    for dep in step.deps:
+        patterns.extend(by_name[dep].outputs)
+    return list(dict.fromkeys(patterns))
+
+
+def unmatched_inputs(step: Step) -> List[str]:
+    """Input patterns of ``step`` that match no file.
+
+    An empty match set hashes to the same constant on every run, so a step
+    pointed at a missing folder would otherwise look up to date forever.
+    """
+    return [
+        pattern
+        for pattern in step_inputs(step)
+        if not any(path.is_file() for path in REPO_ROOT.glob(pattern))
+    ]
+
+
+def step_digests(step: Step, hasher: FileHasher) -> Tuple[str, str]:
+    inputs = hasher.tree_digest(step_inputs(step))
+    outputs = hasher.tree_digest(step.outputs)
+    return inputs, outputs
+
+
+def load_state() -> Dict:
+    if not STATE_FILE.exists():
+        return {"steps": {}, "files": {}}
+    try:
+        with STATE_FILE.open("r", encoding="utf-8") as handle:
+            state = json.load(handle)
+    except (json.JSONDecodeError, OSError):
+        return {"steps": {}, "files": {}}
+    state.setdefault("steps", {})
+    state.setdefault("files", {})
+    return state
+
+
+def save_state(state: Dict) -> None:
+    with STATE_FILE.open("w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def select_steps(requested: List[str]) -> List[Step]:
+    """Return the requested steps plus everything they depend on, in declaration order."""
+    by_name = {step.name: step for step in STEPS}
+    if not requested:
+        return list(STEPS)
+
+    unknown = [name for name in requested if name not in by_name]
+    if unknown:
+        raise SystemExit(f"Unknown step(s): {', '.join(unknown)}")
+
+    selected = set()
+    pending = list(requested)
+    while pending:
+        name = pending.pop()
+        if name in selected:
+            continue
+        selected.add(name)
+        pending.extend(by_name[name].deps)
+    return [step for step in STEPS if step.name in selected]
+
+
+def run_step(step: Step) -> Tuple[bool, str]:
+    result = subprocess.run(
+        step.command(),
+        cwd=step.cwd,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    output = (result.stdout + result.stderr).strip()
+    return result.returncode == 0, output
+
+
+def build(requested: List[str], force: bool = False, jobs: int = 4, verbose: bool = False) -> int:
+    steps = select_steps(requested)
+    state = load_state()
+    hasher = FileHasher(state["files"])
+
+    status: Dict[str, str] = {}
+    timings: Dict[str, float] = {}
+    remaining = {step.name: step for step in steps}
+    selected = set(remaining)
+    running: Dict[Future, Tuple[Step, float]] = {}
+    failures: List[Tuple[str, str]] = []
+    build_start = time.perf_counter()
+
+    def deps_state(step: Step) -> Optional[str]:
+        """None while a dependency is pending, 'blocked' if one failed, else 'ready'."""
+        for dep in step.deps:
+            if dep not in selected:
+                continue
+            dep_status = status.get(dep)
+            if dep_status is None:
+                return None
+            if dep_status in ("failed", "blocked"):
+                return "blocked"
+        return "ready"
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while remaining or running:
+            for name, step in list(remaining.items()):
+                readiness = deps_state(step)
+                if readiness is None:
+                    continue
+                del remaining[name]
+                if readiness == "blocked":
+                    status[name] = "blocked"
+                    timings[name] = 0.0
+                    continue
+
+                check_start = time.perf_counter()
+                missing = unmatched_inputs(step)
+                if missing:
+                    status[name] = "failed"
+                    timings[name] = time.perf_counter() - check_start
+                    state["steps"].pop(name, None)
+                    failures.append((name, "\n".join(f"  input matched no files: {pattern}" for pattern in missing)))
+                    continue
+
+                inputs, outputs = step_digests(step, hasher)
+                recorded = state["steps"].get(name, {})
+                if not force and recorded.get("inputs") == inputs and recorded.get("outputs") == outputs:
+                    status[name] = "up to date"
+                    timings[name] = time.perf_counter() - check_start
+                    continue
+
+                running[pool.submit(run_step, step)] = (step, check_start)
+
+            if not running:
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                step, started = running.pop(future)
+                ok, output = future.result()
+                if ok:
+                    inputs, outputs = step_digests(step, hasher)
+                    state["steps"][step.name] = {"inputs": inputs, "outputs": outputs}
+                    status[step.name] = "built"
+                else:
+                    state["steps"].pop(step.name, None)
+                    status[step.name] = "failed"
+                    failures.append((step.name, output))
+                timings[step.name] = time.perf_counter() - started
+                if verbose and output:
+                    print(f"--- {step.name} ---\n{output}\n")
+
+    # A later step may rewrite an earlier step's outputs in place (add_subclass
+    # edits the generated simplified files), so record the outputs as the
+    # whole build left them rather than as each step left them.
+    for step in steps:
+        if status[step.name] in ("built", "up to date"):
+            state["steps"][step.name]["outputs"] = hasher.tree_digest(step.outputs)
+
+    state["files"] = hasher.cache
+    save_state(state)
+
+    total = time.perf_counter() - build_start
+    width = max(len(step.name) for step in steps)
+    print(f"{'step'.ljust(width)}  {'status':<10}  {'time':>8}")
+    for step in steps:
+        print(f"{step.name.ljust(width)}  {status[step.name]:<10}  {timings[step.name]:>7.3f}s")
+    print(f"{'total'.ljust(width)}  {'':<10}  {total:>7.3f}s")
+
+    for name, output in failures:
+        print(f"\n✗ {name} failed:")
+        print(output or "  (no output)")
+
+    return 1 if failures else 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the data pipeline, skipping up-to-date steps.")
+    parser.add_argument("steps", nargs="*", help="Steps to build (default: all). Dependencies are included.")
+    parser.add_argument("--force", action="store_true", help="Run steps even if their inputs are unchanged.")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="Maximum number of steps to run at once.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the output of every step that ran.")
+    parser.add_argument("--list", action="store_true", help="List the declared steps and exit.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.list:
+        for step in STEPS:
+            deps = f" (after {', '.join(step.deps)})" if step.deps else ""
+            print(f"{step.name}{deps}")
+        return
+    sys.exit(build(args.steps, force=args.force, jobs=args.jobs, verbose=args.verbose))
+
+
+if __name__ == "__main__":
+    main()
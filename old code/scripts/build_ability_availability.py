@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Precompute which class abilities a hero can pick at each level.
+
+The simplified class ability files hold a flat list per class, with ``level``
+from the compendium folder names and ``subclass`` added by
+add_subclass_to_abilities.py. This script turns them into one lookup table so
+the ability pickers can slice a list instead of filtering every ability:
+
+    {
+      "max_level": 10,
+      "classes": {
+        "censor": {
+          "abilities": ["arrest-5-wrath", ...],   # sorted by level, then name
+          "through_level": [17, 17, 21, ...],     # abilities[:through_level[L - 1]]
+                                                  # are available at level L
+          "subclasses": {"Exorcist": {"abilities": [...], "through_level": [...]}},
+          "features": {"2nd-level-exorcist-ability": {"level": 2, "abilities": [...]}}
+        },
+        "common": {...}
+      }
+    }
+
+Abilities that appear at several levels (later picks offering the same
+options again) are listed once, at the lowest level. ``features`` links the
+compendium Features tree to the abilities each feature grants, by ability
+name within the class (falling back to the common abilities).
+
+The app does not read this table yet. The pickers still go through
+AbilityDataService.loadClassAbilitiesSimplified
+(hero_smith/lib/core/services/ability_data_service.dart), which loads the
+whole class file and filters it by level and subclass at runtime. Until that
+service slices ``abilities[:through_level[L - 1]]`` instead, the table is
+written to hero_smith/build/, next to the asset database and outside the
+bundled asset folders, so it does not ship in the app. Switching the service
+over means writing the table under data/abilities/ and loading it through
+rootBundle alongside the class files. compendium_server.py builds the same
+table in memory and already serves lookups from it.
+
+Usage:
+    python build_ability_availability.py
+    python build_ability_availability.py --check    # compare every lookup against a full scan
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+ABILITIES_DIR = REPO_ROOT / "hero_smith" / "data" / "abilities" / "class_abilities_simplified"
+FEATURES_DIR = REPO_ROOT / "old code" / "data_unused" / "compendium" / "Features"
+OUTPUT_FILE = REPO_ROOT / "hero_smith" / "build" / "ability_availability.json"
+MAX_LEVEL = 10
+SHARED_CLASS = "common"
+
+
+def _name_key(name: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "", name.lower())
+
+
+def load_class_abilities(abilities_dir: Path) -> Dict[str, List[Dict[str, Any]]]:
+    classes: Dict[str, List[Dict[str, Any]]] = {}
+    for path in sorted(abilities_dir.glob("*_abilities.json")):
+        with path.open("r", encoding="utf-8") as handle:
+            records = json.load(handle)
+        if not isinstance(records, list):
+            print(f"⚠ Skipping {path.name}: not a list of abilities")
+            continue
+        classes[path.name[: -len("_abilities.json")]] = [r for r in records if isinstance(r, dict) and r.get("id")]
+    return classes
+
+
+def level_table(records: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+    """Ability ids sorted by level with cumulative per-level counts; also returns the duplicates dropped."""
+    earliest: Dict[str, Tuple[int, str]] = {}
+    for record in records:
+        level = record.get("level") if isinstance(record.get("level"), int) else 1
+        current = earliest.get(record["id"])
+        if current is None or level < current[0]:
+            earliest[record["id"]] = (level, record.get("name") or "")
+    ordered = sorted(earliest.items(), key=lambda item: (item[1][0], item[1][1], item[0]))
+    through_level = []
+    position = 0
+    for level in range(1, MAX_LEVEL + 1):
+        while position < len(ordered) and ordered[position][1][0] <= level:
+            position += 1
+        through_level.append(position)
+    table = {"abilities": [ability_id for ability_id, _ in ordered], "through_level": through_level}
+    return table, len(records) - len(earliest)
+
+
+def _granted_ability_names(node: Any) -> Iterator[str]:
+    if isinstance(node, dict):
+        if node.get("feature_type") == "ability" and node.get("name"):
+            yield node["name"]
+        for value in node.values():
+            yield from _granted_ability_names(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _granted_ability_names(value)
+
+
+def feature_links(
+    features_dir: Path,
+    classes: Dict[str, List[Dict[str, Any]]],
+) -> Tuple[Dict[str, Dict[str, Dict[str, Any]]], List[str]]:
+    """Per class: compendium feature id -> level and the ability ids it grants."""
+    by_name: Dict[str, Dict[str, str]] = {
+        class_name: {_name_key(r.get("name") or ""): r["id"] for r in records}
+        for class_name, records in classes.items()
+    }
+    shared = by_name.get(SHARED_CLASS, {})
+    links: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    unmatched: List[str] = []
+    for path in sorted(features_dir.glob("*/*/*.json")):
+        class_name = path.parts[-3].lower()
+        with path.open("r", encoding="utf-8") as handle:
+            feature = json.load(handle)
+        names = list(dict.fromkeys(_granted_ability_names(feature.get("effects", []))))
+        if not names:
+            continue
+        metadata = feature.get("metadata", {})
+        granted = []
+        for name in names:
+            ability_id = by_name.get(class_name, {}).get(_name_key(name)) or shared.get(_name_key(name))
+            if ability_id is None:
+                unmatched.append(f"{path.relative_to(features_dir).as_posix()}: {name}")
+            elif ability_id not in granted:
+                granted.append(ability_id)
+        if granted:
+            feature_id = metadata.get("item_id") or path.stem
+            links.setdefault(class_name, {})[feature_id] = {"level": metadata.get("level"), "abilities": granted}
+    return links, unmatched
+
+
+def build_tables(abilities_dir: Path = ABILITIES_DIR, features_dir: Path = FEATURES_DIR) -> Tuple[Dict[str, Any], Dict[str, int], List[str]]:
+    classes = load_class_abilities(abilities_dir)
+    links, unmatched = feature_links(features_dir, classes) if features_dir.exists() else ({}, [])
+    duplicates: Dict[str, int] = {}
+    tables: Dict[str, Any] = {}
+    for class_name, records in classes.items():
+        base, dropped = level_table([r for r in records if not r.get("subclass")])
+        entry: Dict[str, Any] = dict(base)
+        subclasses: Dict[str, Any] = {}
+        for subclass in sorted({r["subclass"] for r in records if r.get("subclass")}):
+            subclasses[subclass], extra = level_table([r for r in records if r.get("subclass") == subclass])
+            dropped += extra
+        entry["subclasses"] = subclasses
+        entry["features"] = links.get(class_name, {})
+        tables[class_name] = entry
+        if dropped:
+            duplicates[class_name] = dropped
+    return {"max_level": MAX_LEVEL, "classes": tables}, duplicates, unmatched
+
+
+def subclass_name(entry: Dict[str, Any], subclass: str) -> str:
+    """The table's spelling of ``subclass``, matched case-insensitively; LookupError if the class has none such."""
+    for name in entry["subclasses"]:
+        if name.lower() == subclass.lower():
+            return name
+    known = ", ".join(entry["subclasses"]) or "none"
+    raise LookupError(f"unknown subclass {subclass!r}; known: {known}")
+
+
+def available(tables: Dict[str, Any], class_name: str, level: int, subclass: Optional[str] = None) -> List[str]:
+    """Ability ids a hero of ``class_name`` can have at ``level``; what the app does with the table."""
+    entry = tables["classes"][class_name]
+    index = min(max(level, 1), tables["max_level"]) - 1
+    ids = entry["abilities"][: entry["through_level"][index]]
+    if subclass:
+        sub = entry["subclasses"][subclass_name(entry, subclass)]
+        ids = ids + sub["abilities"][: sub["through_level"][index]]
+    return ids
+
+
+def _scan(records: List[Dict[str, Any]], level: int, subclass: Optional[str]) -> List[str]:
+    """The per-screen filter the table replaces."""
+    ids = []
+    for record in records:
+        record_level = record.get("level") if isinstance(record.get("level"), int) else 1
+        if record_level > level:
+            continue
+        if record.get("subclass") and record.get("subclass") != subclass:
+            continue
+        ids.append(record["id"])
+    return ids
+
+
+def check(tables: Dict[str, Any], abilities_dir: Path, repeats: int = 200) -> bool:
+    classes = load_class_abilities(abilities_dir)
+    queries = [
+        (class_name, level, subclass)
+        for class_name, entry in tables["classes"].items()
+        for subclass in [None, *entry["subclasses"]]
+        for level in range(1, MAX_LEVEL + 1)
+    ]
+    ok = True
+    for class_name, level, subclass in queries:
+        if set(available(tables, class_name, level, subclass)) != set(_scan(classes[class_name], level, subclass)):
+            print(f"✗ {class_name} level {level} {subclass or ''}: table and scan disagree")
+            ok = False
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for class_name, level, subclass in queries:
+            _scan(classes[class_name], level, subclass)
+    scan_us = (time.perf_counter() - started) / (repeats * len(queries)) * 1e6
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for class_name, level, subclass in queries:
+            available(tables, class_name, level, subclass)
+    lookup_us = (time.perf_counter() - started) / (repeats * len(queries)) * 1e6
+    print(
+        f"{'✓' if ok else '✗'} {len(queries)} class/level/subclass lookups match a full scan; "
+        f"scan {scan_us:.1f} µs, table {lookup_us:.1f} µs per lookup ({scan_us / lookup_us:.0f}x)"
+    )
+    return ok
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the class/level/subclass ability availability table.")
+    parser.add_argument("--abilities-dir", type=Path, default=ABILITIES_DIR, help="Simplified class ability folder.")
+    parser.add_argument("--features-dir", type=Path, default=FEATURES_DIR, help="Compendium Features folder.")
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE, help="Table to write.")
+    parser.add_argument("--check", action="store_true", help="Also compare every lookup against a full scan.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    tables, duplicates, unmatched = build_tables(args.abilities_dir, args.features_dir)
+
+    text = json.dumps(tables, indent=2, ensure_ascii=False) + "\n"
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    if not args.output.exists() or args.output.read_text(encoding="utf-8") != text:
+        args.output.write_text(text, encoding="utf-8")
+
+    for class_name, entry in tables["classes"].items():
+        print(
+            f"✓ {class_name:<12} {len(entry['abilities']):>3} abilities, {len(entry['subclasses']):>2} subclasses, "
+            f"{len(entry['features']):>2} features linked"
+            + (f"  ({duplicates[class_name]} repeated listing(s) folded)" if class_name in duplicates else "")
+        )
+    for line in unmatched:
+        print(f"⚠ Feature ability not found: {line}")
+    print(f"\nWrote {args.output} ({len(text.encode('utf-8')) / 1024:.1f} KiB)")
+
+    if args.check and not check(tables, args.abilities_dir):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Build a ready-made SQLite database from the hero_smith JSON assets.
+
+On first launch the app walks every bundled JSON asset and seeds its drift
+``components`` table from them (lib/core/seed/asset_seeder.dart). This script
+does the same work ahead of time and writes a database with the same
+``components`` table, following the seeder's rules for ids, types and names,
+plus:
+
+* ``ability_search``: an FTS5 index over ability names, keywords and effect
+  text (effects, tier effects, special effects and triggers);
+* ``ability_details``: the structured records written by
+  extract_class_abilities.py (range, costs, power roll tiers);
+* ``asset_manifest``: the source files with their content hashes and record
+  counts.
+
+Size and timing statistics are printed when the build finishes.
+
+The ability_details records are read from hero_smith/build/class_abilities_new,
+so run extract_class_abilities.py (or ``build.py asset_database``) first.
+
+Usage:
+    python build_asset_database.py
+    python build_asset_database.py --output path/to/hero_smith_assets.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT.parent / "hero_smith"
+DEFAULT_OUTPUT = APP_DIR / "build" / "hero_smith_assets.db"
+CLASS_ABILITIES_DIR = APP_DIR / "build" / "class_abilities_new"
+
+# Keys the seeder checks, in order, for a component id (AssetSeeder._popComponentId)
+ID_KEYS = ("id", "componentId", "classId", "abilityId", "featureId")
+
+SCHEMA = """
+CREATE TABLE components (
+    id TEXT NOT NULL PRIMARY KEY,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data_json TEXT NOT NULL DEFAULT '{}',
+    source TEXT NOT NULL DEFAULT 'seed',
+    parent_id TEXT NULL REFERENCES components (id),
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL
+);
+
+CREATE TABLE ability_details (
+    id TEXT NOT NULL,
+    name TEXT,
+    level INTEGER,
+    action_type TEXT,
+    distance TEXT,
+    area TEXT,
+    range_value TEXT,
+    cost_resource TEXT,
+    cost_amount INTEGER,
+    characteristics TEXT,
+    source_path TEXT NOT NULL PRIMARY KEY,
+    data_json TEXT NOT NULL
+);
+
+CREATE TABLE asset_manifest (
+    path TEXT NOT NULL PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    records INTEGER NOT NULL
+);
+
+CREATE VIRTUAL TABLE ability_search USING fts5(
+    component_id UNINDEXED,
+    name,
+    keywords,
+    effect,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+INDEXES = """
+CREATE INDEX idx_components_type ON components (type);
+CREATE INDEX idx_components_type_name ON components (type, name COLLATE NOCASE);
+CREATE INDEX idx_components_parent ON components (parent_id) WHERE parent_id IS NOT NULL;
+CREATE INDEX idx_ability_details_id ON ability_details (id);
+CREATE INDEX idx_ability_details_name ON ability_details (name COLLATE NOCASE);
+CREATE INDEX idx_ability_details_level ON ability_details (level, action_type);
+"""
+
+
+def bundled_asset_paths(app_dir: Path) -> List[str]:
+    """Return the data/*.json assets that pubspec.yaml bundles, like AssetManifest.json.
+
+    Directory entries in Flutter's asset list only include the files directly
+    inside that directory, not its subdirectories.
+    """
+    pubspec = app_dir / "pubspec.yaml"
+    entries: List[str] = []
+    in_assets = False
+    assets_indent = 0
+    for line in pubspec.read_text(encoding="utf-8").splitlines():
+        stripped = line.strip()
+        indent = len(line) - len(line.lstrip())
+        if stripped == "assets:":
+            in_assets = True
+            assets_indent = indent
+            continue
+        if not in_assets or not stripped or stripped.startswith("#"):
+            continue
+        if indent <= assets_indent and not stripped.startswith("-"):
+            in_assets = False
+            continue
+        match = re.match(r"-\s*(\S+)", stripped)
+        if match:
+            entries.append(match.group(1))
+
+    assets = set()
+    for entry in entries:
+        if not entry.startswith("data/"):
+            continue
+        path = app_dir / entry
+        if entry.endswith("/") and path.is_dir():
+            assets.update(
+                child.relative_to(app_dir).as_posix()
+                for child in path.iterdir()
+                if child.is_file() and child.suffix == ".json"
+            )
+        elif path.is_file() and path.suffix == ".json":
+            assets.add(entry)
+    return sorted(assets)
+
+
+def pop_component_id(record: Dict[str, Any]) -> Optional[str]:
+    for key in ID_KEYS:
+        value = record.pop(key, None)
+        if isinstance(value, str) and value:
+            return value
+    return None
+
+
+def iter_asset_components(asset_path: str, decoded: Any) -> Iterator[Tuple[str, str, str, Dict[str, Any]]]:
+    """Yield ``(id, type, name, data)`` rows the way the seeder derives them."""
+    if isinstance(decoded, list):
+        items = [item for item in decoded if isinstance(item, dict)]
+    elif isinstance(decoded, dict):
+        items = [decoded]
+    else:
+        return
+
+    is_ability_file = "/abilities/" in asset_path or asset_path.startswith("data/abilities/")
+    for item in items:
+        work = dict(item)
+        component_id = pop_component_id(work)
+        if not component_id:
+            continue
+        if is_ability_file:
+            maybe_action = work.pop("type", None)
+            if maybe_action is not None and work.get("action_type") is None:
+                work["action_type"] = maybe_action
+            component_type = "ability"
+        else:
+            component_type = work.pop("type", None) or "unknown"
+        name = work.pop("name", None) or ""
+        yield component_id, str(component_type), str(name), work
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return " ".join(_text(item) for item in value)
+    if isinstance(value, dict):
+        return " ".join(_text(item) for item in value.values())
+    return str(value)
+
+
+def search_fields(data: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the keyword and effect text of an ability for the FTS index."""
+    keywords = data.get("keywords")
+    if isinstance(keywords, str):
+        keywords = keywords.replace("/", " ")
+    effect_parts = [
+        data.get("effect"),
+        data.get("tier_effects"),
+        data.get("special_effect"),
+        data.get("trigger_text") or data.get("trigger"),
+    ]
+    return _text(keywords), "\n".join(_text(part) for part in effect_parts if part)
+
+
+def iter_class_ability_details(class_dir: Path) -> Iterator[Tuple]:
+    for path in sorted(class_dir.rglob("*.json")):
+        with path.open("r", encoding="utf-8") as handle:
+            record = json.load(handle)
+        range_data = record.get("range") or {}
+        costs = record.get("costs") or {}
+        power_roll = record.get("power_roll") or {}
+        range_value = range_data.get("range_value")
+        yield (
+            record.get("id"),
+            record.get("name"),
+            record.get("level"),
+            record.get("action_type"),
+            range_data.get("distance"),
+            range_data.get("area"),
+            str(range_value) if range_value is not None else None,
+            costs.get("resource"),
+            costs.get("amount"),
+            power_roll.get("characteristics"),
+            path.relative_to(class_dir).as_posix(),
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")),
+        )
+
+
+def build_database(
+    output: Path,
+    app_dir: Path = APP_DIR,
+    class_abilities_dir: Optional[Path] = CLASS_ABILITIES_DIR,
+) -> Dict[str, Any]:
+    """Build the asset database at ``output`` and return build statistics.
+
+    ``class_abilities_dir`` must contain the converted class abilities; pass
+    None to leave ability_details empty.
+    """
+    if class_abilities_dir is not None:
+        if not class_abilities_dir.is_dir():
+            raise FileNotFoundError(f"Class abilities folder not found: {class_abilities_dir}")
+        if next(class_abilities_dir.rglob("*.json"), None) is None:
+            raise FileNotFoundError(f"No class ability files in {class_abilities_dir}")
+
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp_output = output.with_name(output.name + ".tmp")
+    temp_output.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(temp_output)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("PRAGMA page_size = 4096")
+        try:
+            connection.executescript(SCHEMA)
+        except sqlite3.OperationalError as exc:
+            raise SystemExit(f"SQLite {sqlite3.sqlite_version} was built without FTS5 support: {exc}")
+
+        now = int(time.time())
+        seen_ids = set()
+        components: List[Tuple] = []
+        search_rows: List[Tuple] = []
+        manifest: List[Tuple] = []
+
+        phase = time.perf_counter()
+        for asset_path in bundled_asset_paths(app_dir):
+            # The seeder skips the legacy class_abilities folder
+            if "data/abilities/class_abilities/" in asset_path:
+                continue
+            raw = (app_dir / asset_path).read_bytes()
+            decoded = json.loads(raw)
+            records = 0
+            for component_id, component_type, name, data in iter_asset_components(asset_path, decoded):
+                if component_id in seen_ids:
+                    continue
+                seen_ids.add(component_id)
+                records += 1
+                components.append((
+                    component_id,
+                    component_type,
+                    name,
+                    json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+                    now,
+                    now,
+                ))
+                if component_type == "ability":
+                    keywords, effect = search_fields(data)
+                    search_rows.append((component_id, name, keywords, effect))
+            manifest.append((asset_path, hashlib.sha256(raw).hexdigest(), records))
+        timings["load"] = time.perf_counter() - phase
+
+        phase = time.perf_counter()
+        with connection:
+            connection.executemany(
+                "INSERT INTO components (id, type, name, data_json, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                components,
+            )
+            connection.executemany("INSERT INTO asset_manifest VALUES (?, ?, ?)", manifest)
+            details = 0
+            if class_abilities_dir is not None:
+                rows = list(iter_class_ability_details(class_abilities_dir))
+                connection.executemany(
+                    "INSERT INTO ability_details VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                details = len(rows)
+        timings["insert"] = time.perf_counter() - phase
+
+        phase = time.perf_counter()
+        with connection:
+            connection.executescript(INDEXES)
+        timings["index"] = time.perf_counter() - phase
+
+        phase = time.perf_counter()
+        with connection:
+            connection.executemany(
+                "INSERT INTO ability_search (component_id, name, keywords, effect) VALUES (?, ?, ?, ?)",
+                search_rows,
+            )
+            connection.execute("INSERT INTO ability_search (ability_search) VALUES ('optimize')")
+        timings["fts"] = time.perf_counter() - phase
+
+        phase = time.perf_counter()
+        connection.execute("ANALYZE")
+        connection.execute("VACUUM")
+        timings["vacuum"] = time.perf_counter() - phase
+    finally:
+        connection.close()
+
+    temp_output.replace(output)
+    timings["total"] = time.perf_counter() - started
+
+    source_bytes = sum((app_dir / path).stat().st_size for path, _, _ in manifest)
+    return {
+        "output": output,
+        "assets": len(manifest),
+        "source_bytes": source_bytes,
+        "database_bytes": output.stat().st_size,
+        "components": len(components),
+        "abilities_indexed": len(search_rows),
+        "ability_details": details,
+        "timings": timings,
+    }
+
+
+def print_stats(stats: Dict[str, Any]) -> None:
+    print(f"Wrote {stats['output']}")
+    print(f"  {stats['assets']} asset files, {stats['components']} components, "
+          f"{stats['abilities_indexed']} abilities in ability_search, "
+          f"{stats['ability_details']} ability_details rows")
+    print(f"  JSON sources: {stats['source_bytes'] / 1024:.1f} KiB, "
+          f"database: {stats['database_bytes'] / 1024:.1f} KiB")
+    print("  " + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in stats["timings"].items()))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build a prebuilt SQLite database from the app's JSON assets.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Database file to write.")
+    parser.add_argument("--app-dir", type=Path, default=APP_DIR, help="Flutter app folder containing pubspec.yaml.")
+    parser.add_argument(
+        "--class-abilities-dir",
+        type=Path,
+        default=CLASS_ABILITIES_DIR,
+        help="Output folder of extract_class_abilities.py for the ability_details table.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not (args.app_dir / "pubspec.yaml").exists():
+        print(f"Error: pubspec.yaml not found in {args.app_dir}")
+        sys.exit(1)
+    try:
+        stats = build_database(args.output, args.app_dir, args.class_abilities_dir)
+    except FileNotFoundError as exc:
+        print(f"Error: {exc}")
+        print("Run extract_class_abilities.py first or pass --class-abilities-dir.")
+        sys.exit(1)
+    print_stats(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
+import argparse
 import json
 import re
+import sys
 from collections import Counter
 from pathlib import Path
 
-path = Path("data/features/class_features/conduit_features.json")
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_PATH = REPO_ROOT / "hero_smith" / "data" / "features" / "class_features" / "conduit_features.json"
 
 def slugify(value: str) -> str:
     normalized = re.sub(r"[^a-z0-9]+", "_", value.strip().lower())
@@ -21,21 +24,34 @@ def option_key(option: dict) -> str:
         return slugify(str(option["benefit"]))
     return "option"
 
-with path.open("r", encoding="utf-8") as f:
-    data = json.load(f)
+def check_file(path: Path) -> None:
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
 
-for entry in data:
-    if not isinstance(entry, dict):
-        continue
-    feature_id = entry.get("id")
-    options = entry.get("options")
-    if not isinstance(options, list):
-        continue
-    counter = Counter()
-    for option in options:
-        if not isinstance(option, dict):
+    for entry in data:
+        if not isinstance(entry, dict):
             continue
-        counter[option_key(option)] += 1
-    duplicates = {k: v for k, v in counter.items() if v > 1}
-    if duplicates:
-        print(feature_id, duplicates)
+        feature_id = entry.get("id")
+        options = entry.get("options")
+        if not isinstance(options, list):
+            continue
+        counter = Counter()
+        for option in options:
+            if not isinstance(option, dict):
+                continue
+            counter[option_key(option)] += 1
+        duplicates = {k: v for k, v in counter.items() if v > 1}
+        if duplicates:
+            print(feature_id, duplicates)
+
+def main():
+    parser = argparse.ArgumentParser(description="Report conduit features with duplicate option keys.")
+    parser.add_argument("path", type=Path, nargs="?", default=DEFAULT_PATH, help="conduit_features.json to check.")
+    path = parser.parse_args().path
+    if not path.is_file():
+        print(f"Error: File not found: {path}")
+        sys.exit(1)
+    check_file(path)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
+import argparse
 import json
 import os
 import re
+import sys
 from pathlib import Path
 
+from json_stream import iter_json_array
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
 def slugify(value: str) -> str:
     normalized = re.sub(r"[^a-z0-9]+", "_", value.strip().lower())
     collapsed = re.sub(r"_+", "_", normalized)
@@ -23,11 +29,8 @@ def option_key(option: dict) -> str:
     return slugify(feature_option_label(option))
 
 def check_file(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
     problems = []
-    for entry in data:
+    for entry in iter_json_array(path):
         if not isinstance(entry, dict):
             continue
         feature_id = entry.get("id") or entry.get("name")
@@ -52,8 +55,23 @@ def check_file(path: Path):
                 seen[key] = option.get("name")
     return problems
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report class features with duplicate option keys.")
+    parser.add_argument(
+        "root",
+        type=Path,
+        nargs="?",
+        default=REPO_ROOT / "hero_smith" / "data" / "features" / "class_features",
+        help="Folder containing the <class>_features.json files.",
+    )
+    return parser.parse_args()
+
+
 def main():
-    root = Path("data/features/class_features")
+    root = parse_args().root
+    if not root.is_dir():
+        print(f"Error: Directory not found: {root}")
+        sys.exit(1)
     issues = {}
     for path in root.glob("*_features.json"):
         problems = check_file(path)
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Local HTTP server that keeps the compendium and app data warm for lookups.
+
+Dev tooling and test scripts tend to load the same JSON over and over to
+answer one small question. This server loads it once and answers from
+memory:
+
+    GET /component/<id>                          any record with an id, by the seeder's rules
+    GET /ability/<id>                            same, abilities only
+    GET /abilities?class=fury&level=5[&subclass=Berserker]
+                                                 abilities a hero can pick, from the availability tables
+    GET /features?class=conduit[&level=4][&options=1]
+                                                 class features, optionally only those with options
+    GET /search?q=conditions:restrained&limit=20 search_index.py query syntax
+    GET /stats                                   data counts, reloads and per-endpoint latency
+
+Components come from the assets pubspec.yaml bundles, exactly as
+build_asset_database.py derives them, and /search runs on the persistent
+search index. A background thread polls file sizes and modification times;
+when something changed, only the changed files are parsed again and the new
+tables are swapped in, so requests never wait on a reload. A file that cannot
+be read or decoded (typically one caught half-written) is logged, the tables
+built from its previous contents keep being served, and it is retried on the
+next poll. Latency is
+measured inside the handler for every request and reported as p50/p99 by
+/stats and the ``bench`` command.
+
+Usage:
+    python compendium_server.py serve                   # http://127.0.0.1:8765
+    python compendium_server.py serve --port 9000 --poll 0.5
+    python compendium_server.py bench --requests 5000   # in-process server, p50/p99 per endpoint
+    curl 'http://127.0.0.1:8765/abilities?class=fury&level=5'
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import math
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from build_ability_availability import available, build_tables
+from build_asset_database import APP_DIR, bundled_asset_paths, iter_asset_components
+from search_index import COMPENDIUM_DIR, INDEX_FILE, iter_sources, open_index
+
+
+DEFAULT_PORT = 8765
+SIMPLIFIED_ABILITIES = "abilities/class_abilities_simplified"
+CLASS_FEATURES_PREFIX = "data/features/class_features/"
+# Latency samples kept per endpoint
+LATENCY_WINDOW = 10_000
+
+Component = Dict[str, Any]
+
+
+def json_error(path: Path) -> Optional[str]:
+    """Why ``path`` cannot be decoded as JSON, or None if it can."""
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            json.load(handle)
+    except (OSError, ValueError) as exc:
+        return str(exc)
+    return None
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+class WarmData:
+    """In-memory tables, rebuilt per changed file and swapped in atomically."""
+
+    def __init__(self, app_dir: Path = APP_DIR, compendium_dir: Path = COMPENDIUM_DIR, index_file: Path = INDEX_FILE):
+        self.app_dir = app_dir
+        self.data_dir = app_dir / "data"
+        self.compendium_dir = compendium_dir
+        self.abilities_dir = self.data_dir / SIMPLIFIED_ABILITIES
+        # Features sit next to the Abilities folder in the compendium
+        self.features_dir = compendium_dir.parent / "Features"
+        self.index_file = index_file
+        self.lock = threading.Lock()
+        self.reloads = 0
+        self.last_reload: Dict[str, Any] = {}
+        # path -> error of files that could not be loaded on the last refresh
+        self.failures: Dict[str, str] = {}
+
+        # asset path -> components of that file, in file order
+        self._file_components: Dict[str, List[Component]] = {}
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self.components: Dict[str, Component] = {}
+        self.class_features: Dict[str, List[Component]] = {}
+        self.availability: Optional[Dict[str, Any]] = None
+
+        started = time.perf_counter()
+        self.search, _, _ = open_index(compendium_dir, self.data_dir, index_file)
+        self.refresh()
+        self.load_seconds = time.perf_counter() - started
+
+    # -- loading -------------------------------------------------------------
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Size and mtime of every file the tables depend on."""
+        stats: Dict[str, Tuple[int, int]] = {}
+        paths = [self.app_dir / "pubspec.yaml"]
+        paths += sorted(self.data_dir.rglob("*.json")) if self.data_dir.exists() else []
+        paths += sorted(self.compendium_dir.rglob("*.json")) if self.compendium_dir.exists() else []
+        paths += sorted(self.features_dir.rglob("*.json")) if self.features_dir.exists() else []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            stats[path.as_posix()] = (stat.st_size, stat.st_mtime_ns)
+        return stats
+
+    def _load_asset(self, asset: str) -> List[Component]:
+        decoded = json.loads((self.app_dir / asset).read_text(encoding="utf-8"))
+        return [
+            {"id": component_id, "type": component_type, "name": name, "asset": asset, "data": data}
+            for component_id, component_type, name, data in iter_asset_components(asset, decoded)
+        ]
+
+    def refresh(self) -> Dict[str, int]:
+        """Reload whatever changed since the last call; returns per-kind file counts."""
+        stats = self._snapshot()
+        changed = {path for path, stat in stats.items() if self._stats.get(path) != stat}
+        removed = set(self._stats) - set(stats)
+        if not changed and not removed:
+            return {"changed": 0, "removed": 0}
+
+        started = time.perf_counter()
+        failures: Dict[str, str] = {}
+        assets = bundled_asset_paths(self.app_dir)
+        file_components = {asset: self._file_components[asset] for asset in assets if asset in self._file_components}
+        reparsed = 0
+        for asset in assets:
+            path = (self.app_dir / asset).as_posix()
+            if asset not in file_components or path in changed:
+                try:
+                    file_components[asset] = self._load_asset(asset)
+                except (OSError, ValueError) as exc:
+                    # Keep the components from the last good read
+                    failures[path] = str(exc)
+                    file_components[asset] = self._file_components.get(asset, [])
+                reparsed += 1
+
+        # First record wins, like the seeder
+        components: Dict[str, Component] = {}
+        for asset in assets:
+            for component in file_components[asset]:
+                components.setdefault(component["id"], component)
+        class_features: Dict[str, List[Component]] = {}
+        for asset in assets:
+            if asset.startswith(CLASS_FEATURES_PREFIX):
+                for component in file_components[asset]:
+                    class_name = component["data"].get("class")
+                    if isinstance(class_name, str) and components.get(component["id"]) is component:
+                        class_features.setdefault(class_name.lower(), []).append(component)
+
+        # Same tables build_ability_availability.py writes, rebuilt when the
+        # simplified abilities or the compendium features change
+        availability = self.availability
+        watched = (self.abilities_dir.as_posix() + "/", self.features_dir.as_posix() + "/")
+        watched_changed = sorted(path for path in changed if path.startswith(watched))
+        if availability is None or watched_changed or any(path.startswith(watched) for path in removed):
+            unreadable = {path: error for path in watched_changed if (error := json_error(Path(path)))}
+            if unreadable:
+                failures.update(unreadable)
+            else:
+                try:
+                    availability = build_tables(self.abilities_dir, self.features_dir)[0] if self.abilities_dir.exists() else None
+                except (OSError, ValueError) as exc:
+                    # Changed again while the tables were being built
+                    failures.update({path: str(exc) for path in watched_changed or [self.abilities_dir.as_posix()]})
+
+        with self.lock:
+            # The search index updates in place, so queries wait for it; it only
+            # re-reads files whose size, mtime and hash changed.
+            search_counts = self.search.update(iter_sources(self.compendium_dir, self.data_dir))
+            self._file_components = file_components
+            self.components = components
+            self.class_features = class_features
+            self.availability = availability
+        for path, error in failures.items():
+            if self.failures.get(path) != error:
+                print(f"✗ Keeping the previous data for {path}: {error}")
+            # Not recorded, so the file is read again on the next poll
+            stats.pop(path, None)
+        self.failures = failures
+        self._stats = stats
+        self.reloads += 1
+        self.last_reload = {
+            "files_changed": len(changed),
+            "files_removed": len(removed),
+            "files_failed": len(failures),
+            "assets_parsed": reparsed,
+            "search_files_reindexed": search_counts["added"] + search_counts["changed"],
+            "ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        return {"changed": len(changed), "removed": len(removed)}
+
+    def watch(self, interval: float, stop: threading.Event) -> None:
+        while not stop.wait(interval):
+            try:
+                counts = self.refresh()
+            except Exception as exc:  # keep watching; the next poll tries again
+                print(f"✗ Reload failed: {exc}")
+                continue
+            if counts["changed"] or counts["removed"]:
+                print(f"↻ Reloaded {counts['changed']} changed, {counts['removed']} removed file(s) ({self.last_reload['ms']} ms)")
+
+    # -- queries -------------------------------------------------------------
+
+    def component(self, component_id: str, component_type: Optional[str] = None) -> Optional[Component]:
+        component = self.components.get(component_id)
+        if component is None or (component_type and component["type"] != component_type):
+            return None
+        return component
+
+    def abilities(self, class_name: str, level: int, subclass: Optional[str]) -> List[Dict[str, Any]]:
+        tables = self.availability
+        if tables is None:
+            raise LookupError(f"no simplified class abilities in {self.abilities_dir}")
+        if class_name not in tables["classes"]:
+            raise LookupError(f"unknown class {class_name!r}; known: {', '.join(tables['classes'])}")
+        components = self.components
+        result = []
+        for ability_id in available(tables, class_name, level, subclass):
+            component = components.get(ability_id)
+            result.append({
+                "id": ability_id,
+                "name": component["name"] if component else None,
+                "level": component["data"].get("level") if component else None,
+            })
+        return result
+
+    def features(self, class_name: str, level: Optional[int], options_only: bool) -> List[Dict[str, Any]]:
+        result = []
+        for component in self.class_features.get(class_name, []):
+            data = component["data"]
+            feature_level = data.get("level") if isinstance(data.get("level"), int) else 1
+            if level is not None and feature_level > level:
+                continue
+            if options_only and not data.get("options"):
+                continue
+            result.append({
+                "id": component["id"],
+                "name": component["name"],
+                "type": component["type"],
+                "level": feature_level,
+                "options": data.get("options") or [],
+            })
+        return result
+
+    def search_records(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        with self.lock:
+            doc_ids = self.search.search(query)
+            docs = self.search.docs
+            return [
+                {"id": docs[d]["id"], "name": docs[d]["name"], "file": docs[d]["key"]}
+                for d in doc_ids[:limit]
+            ]
+
+
+# -----------------------------------------------------------------------------
+# HTTP
+# -----------------------------------------------------------------------------
+
+class Latencies:
+    def __init__(self) -> None:
+        self.samples: Dict[str, Deque[float]] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        samples = self.samples.get(endpoint)
+        if samples is None:
+            samples = self.samples.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW))
+        samples.append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            values = list(samples)
+            result[endpoint] = {
+                "requests": len(values),
+                "p50_us": round(percentile(values, 0.50) * 1e6, 1),
+                "p99_us": round(percentile(values, 0.99) * 1e6, 1),
+            }
+        return result
+
+
+class CompendiumServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], data: WarmData, verbose: bool = False):
+        super().__init__(address, CompendiumHandler)
+        self.data = data
+        self.latencies = Latencies()
+        self.verbose = verbose
+
+
+class CompendiumHandler(BaseHTTPRequestHandler):
+    server: CompendiumServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this every
+    # keep-alive response waits for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _answer(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, Any]:
+        data = self.server.data
+
+        def param(name: str) -> Optional[str]:
+            values = query.get(name)
+            return values[0] if values else None
+
+        parts = [unquote(part) for part in path.split("/") if part]
+        if len(parts) == 2 and parts[0] in ("component", "ability"):
+            component = data.component(parts[1], "ability" if parts[0] == "ability" else None)
+            return (200, component) if component else (404, {"error": f"no {parts[0]} {parts[1]!r}"})
+        if parts == ["abilities"]:
+            class_name, level = param("class"), param("level")
+            if not class_name or not level or not level.isdigit() or int(level) < 1:
+                return 400, {"error": "need class and a level of at least 1, e.g. /abilities?class=fury&level=5"}
+            try:
+                return 200, data.abilities(class_name.lower(), int(level), param("subclass"))
+            except LookupError as exc:
+                return 404, {"error": str(exc)}
+        if parts == ["features"]:
+            class_name, level = param("class"), param("level")
+            if not class_name or (level is not None and not level.isdigit()):
+                return 400, {"error": "need class, e.g. /features?class=conduit&level=4&options=1"}
+            return 200, data.features(class_name.lower(), int(level) if level else None, param("options") in ("1", "true"))
+        if parts == ["search"]:
+            limit = param("limit") or "20"
+            return 200, data.search_records(param("q") or "", int(limit) if limit.isdigit() else 20)
+        if parts == ["stats"]:
+            return 200, {
+                "components": len(data.components),
+                "classes_with_features": len(data.class_features),
+                "search_documents": len(data.search.docs),
+                "load_ms": round(data.load_seconds * 1000, 1),
+                "reloads": data.reloads,
+                "last_reload": data.last_reload,
+                "latency": self.server.latencies.summary(),
+            }
+        return 404, {"error": f"unknown endpoint {path}"}
+
+    def do_GET(self) -> None:
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        status, payload = self._answer(url.path, parse_qs(url.query))
+        self._send(status, payload)
+        endpoint = "/" + (url.path.strip("/").split("/", 1)[0] or "")
+        self.server.latencies.record(endpoint, time.perf_counter() - started)
+
+
+# -----------------------------------------------------------------------------
+# CLI
+# -----------------------------------------------------------------------------
+
+def start(data: WarmData, host: str, port: int, poll: float, verbose: bool = False) -> Tuple[CompendiumServer, threading.Event]:
+    server = CompendiumServer((host, port), data, verbose)
+    stop = threading.Event()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    if poll > 0:
+        threading.Thread(target=data.watch, args=(poll, stop), daemon=True).start()
+    return server, stop
+
+
+def bench(data: WarmData, requests: int) -> None:
+    server, stop = start(data, "127.0.0.1", 0, poll=1.0)
+    host, port = server.server_address[:2]
+    ability_ids = [c["id"] for c in data.components.values() if c["type"] == "ability"][:200]
+    classes = sorted(data.availability["classes"]) if data.availability else []
+    feature_classes = sorted(data.class_features)
+    paths = []
+    for i in range(requests):
+        kind = i % 4
+        if kind == 0 and ability_ids:
+            paths.append(f"/ability/{quote(ability_ids[i % len(ability_ids)])}")
+        elif kind == 1 and classes:
+            paths.append(f"/abilities?class={classes[i % len(classes)]}&level={i % 10 + 1}")
+        elif kind == 2 and feature_classes:
+            paths.append(f"/features?class={feature_classes[i % len(feature_classes)]}&options=1")
+        else:
+            paths.append(f"/search?q={quote(['fire', 'conditions:restrained', 'class:fury level:5'][i % 3])}&limit=10")
+
+    # One keep-alive connection, like a tool issuing queries in a loop
+    connection = http.client.HTTPConnection(host, port)
+    round_trips: Dict[str, List[float]] = {}
+    for path in paths:
+        started = time.perf_counter()
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        endpoint = "/" + path.split("?")[0].strip("/").split("/")[0]
+        round_trips.setdefault(endpoint, []).append(time.perf_counter() - started)
+    connection.close()
+    stop.set()
+    server.shutdown()
+
+    handler = server.latencies.summary()
+    print(f"{'endpoint':<12} {'requests':>9} {'handler p50':>12} {'handler p99':>12} {'round trip p99':>15}")
+    for endpoint, samples in sorted(round_trips.items()):
+        stats = handler.get(endpoint, {})
+        print(
+            f"{endpoint:<12} {len(samples):>9} {stats.get('p50_us', 0):>10.1f}µs {stats.get('p99_us', 0):>10.1f}µs "
+            f"{percentile(samples, 0.99) * 1e6:>13.1f}µs"
+        )
+    print(f"\nCold load of the same data: {data.load_seconds * 1000:.0f} ms")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Warm-cache HTTP server for compendium and app data lookups.")
+    parser.add_argument("--app-dir", type=Path, default=APP_DIR, help="Flutter app folder (with pubspec.yaml).")
+    parser.add_argument("--compendium-dir", type=Path, default=COMPENDIUM_DIR, help="Compendium Abilities folder.")
+    parser.add_argument("--index-file", type=Path, default=INDEX_FILE, help="Persistent search index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Serve lookups on localhost.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--poll", type=float, default=1.0, help="Seconds between checks for changed files (0 to disable).")
+    serve.add_argument("-v", "--verbose", action="store_true", help="Log every request.")
+
+    bench_parser = sub.add_parser("bench", help="Measure lookup latency against an in-process server.")
+    bench_parser.add_argument("--requests", type=int, default=2000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    data = WarmData(args.app_dir, args.compendium_dir, args.index_file)
+    print(
+        f"✓ Loaded {len(data.components)} components, {len(data.search.docs)} search documents "
+        f"in {data.load_seconds * 1000:.0f} ms"
+    )
+    if args.command == "bench":
+        bench(data, args.requests)
+        return
+
+    server, stop = start(data, args.host, args.port, args.poll, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.shutdown()
+        for endpoint, stats in server.latencies.summary().items():
+            print(f"  {endpoint:<12} {stats['requests']:>7} requests, p50 {stats['p50_us']:.0f} µs, p99 {stats['p99_us']:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
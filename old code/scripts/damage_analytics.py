@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Vectorized damage analytics over the compendium abilities.
+
+Every ability is parsed with ``transform_ability`` (so damage comes from the
+same ``parse_tier_text`` the converters use), and each power roll tier becomes
+one row of a set of NumPy columns:
+
+    ability, class, subclass, level, cost, tier, base_damage, bonus_mask
+
+Summaries are computed on the columns as a whole:
+
+    by_level       mean damage and damage per resource point, by level and tier
+    outliers       abilities whose damage is far from the level/tier norm
+    tier_scaling   tier 2 / tier 1 and tier 3 / tier 1 damage ratios per class
+
+NumPy is only needed by this script; install it with ``pip install numpy``.
+
+Usage:
+    python damage_analytics.py                          # print the summaries
+    python damage_analytics.py --format json > balance.json
+    python damage_analytics.py --format csv --output balance/
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reported by main()
+    np = None
+
+from add_subclass_to_abilities import ABILITY_TO_SUBCLASS
+from extract_class_abilities import transform_ability
+
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPENDIUM_DIR = ROOT / "data_unused" / "compendium" / "Abilities"
+# Bit per characteristic, by the letter used in tier texts ("5 + M damage")
+CHARACTERISTIC_BITS = {"M": 1, "A": 2, "R": 4, "I": 8, "P": 16}
+NUMPY_MISSING = "NumPy is required for damage analytics. Install it with: pip install numpy"
+
+
+@dataclass
+class DamageTable:
+    """Column-oriented power roll tiers. Categorical columns index into the name lists."""
+
+    ability_names: List[str]
+    ability_characteristics: List[str]
+    class_names: List[str]
+    subclass_names: List[str]
+    ability: "np.ndarray"      # int32, index into ability_names
+    class_id: "np.ndarray"     # int16, index into class_names
+    subclass_id: "np.ndarray"  # int16, index into subclass_names ("" = none)
+    level: "np.ndarray"        # int16, -1 when unknown
+    cost: "np.ndarray"         # int16, 0 for signature abilities
+    tier: "np.ndarray"         # int8, 1..3
+    base_damage: "np.ndarray"  # float64, nan when the tier deals no damage
+    bonus_mask: "np.ndarray"   # int8, characteristics added to the damage (CHARACTERISTIC_BITS)
+
+    def __len__(self) -> int:
+        return len(self.tier)
+
+
+def characteristic_mask(text: Optional[str]) -> int:
+    """Bit mask for "M/A damage" or "Might or Agility" style characteristic lists."""
+    if not text:
+        return 0
+    mask = 0
+    for word in text.replace("/", " ").replace(",", " ").split():
+        bit = CHARACTERISTIC_BITS.get(word[:1].upper()) if word.lower() not in ("or", "damage") else None
+        if bit:
+            mask |= bit
+    return mask
+
+
+def _category(names: List[str], lookup: Dict[str, int], value: str) -> int:
+    index = lookup.get(value)
+    if index is None:
+        index = lookup[value] = len(names)
+        names.append(value)
+    return index
+
+
+def load_damage_table(source_dir: Path = COMPENDIUM_DIR) -> DamageTable:
+    if np is None:
+        raise RuntimeError(NUMPY_MISSING)
+
+    ability_names: List[str] = []
+    characteristics: List[str] = []
+    class_names: List[str] = []
+    subclass_names: List[str] = [""]
+    class_lookup: Dict[str, int] = {}
+    subclass_lookup: Dict[str, int] = {"": 0}
+    columns: Dict[str, List] = {key: [] for key in ("ability", "class", "subclass", "level", "cost", "tier", "damage", "bonus")}
+
+    for path in sorted(source_dir.rglob("*.json")):
+        with path.open("r", encoding="utf-8") as handle:
+            record = transform_ability(path, json.load(handle))
+        if record.power_roll is None:
+            continue
+        ability = len(ability_names)
+        ability_names.append(record.name or record.id)
+        characteristics.append(record.power_roll.characteristics or "")
+        class_id = _category(class_names, class_lookup, path.relative_to(source_dir).parts[0])
+        subclass_id = _category(subclass_names, subclass_lookup, ABILITY_TO_SUBCLASS.get(record.name or "") or "")
+        level = record.level if isinstance(record.level, int) else -1
+        cost = record.costs.amount if record.costs and isinstance(record.costs.amount, int) else 0
+
+        # A power roll without tier text has no tiers; its rows count as no damage
+        tiers = record.power_roll.tiers
+        tier_details = (tiers.low, tiers.mid, tiers.high) if tiers is not None else (None, None, None)
+        for tier, details in enumerate(tier_details, start=1):
+            damage = details.base_damage_value if details is not None else None
+            columns["ability"].append(ability)
+            columns["class"].append(class_id)
+            columns["subclass"].append(subclass_id)
+            columns["level"].append(level)
+            columns["cost"].append(cost)
+            columns["tier"].append(tier)
+            columns["damage"].append(np.nan if damage is None else damage)
+            columns["bonus"].append(characteristic_mask(details.characteristic_damage_options) if details else 0)
+
+    return DamageTable(
+        ability_names=ability_names,
+        ability_characteristics=characteristics,
+        class_names=class_names,
+        subclass_names=subclass_names,
+        ability=np.asarray(columns["ability"], dtype=np.int32),
+        class_id=np.asarray(columns["class"], dtype=np.int16),
+        subclass_id=np.asarray(columns["subclass"], dtype=np.int16),
+        level=np.asarray(columns["level"], dtype=np.int16),
+        cost=np.asarray(columns["cost"], dtype=np.int16),
+        tier=np.asarray(columns["tier"], dtype=np.int8),
+        base_damage=np.asarray(columns["damage"], dtype=np.float64),
+        bonus_mask=np.asarray(columns["bonus"], dtype=np.int8),
+    )
+
+
+# -----------------------------------------------------------------------------
+# Summaries
+# -----------------------------------------------------------------------------
+
+def _group_means(keys: "np.ndarray", values: "np.ndarray", size: int):
+    counts = np.bincount(keys, minlength=size)
+    sums = np.bincount(keys, weights=values, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return counts, sums / counts
+
+
+def damage_by_level(table: DamageTable) -> List[Dict[str, Any]]:
+    """Mean damage and damage per resource point for every level and tier."""
+    damaging = ~np.isnan(table.base_damage) & (table.level >= 0)
+    levels = table.level[damaging].astype(np.int64)
+    tiers = table.tier[damaging].astype(np.int64)
+    damage = table.base_damage[damaging]
+    cost = table.cost[damaging].astype(np.float64)
+
+    key = levels * 3 + (tiers - 1)
+    size = int(key.max()) + 1 if key.size else 0
+    counts, mean_damage = _group_means(key, damage, size)
+
+    paid = cost > 0
+    paid_counts, mean_per_point = _group_means(key[paid], damage[paid] / cost[paid], size)
+    _, mean_cost = _group_means(key[paid], cost[paid], size)
+    free_counts, mean_free = _group_means(key[~paid], damage[~paid], size)
+
+    rows = []
+    for group in np.flatnonzero(counts):
+        rows.append({
+            "level": int(group // 3),
+            "tier": int(group % 3) + 1,
+            "rows": int(counts[group]),
+            "mean_damage": round(float(mean_damage[group]), 2),
+            "paid_abilities": int(paid_counts[group]),
+            "mean_cost": round(float(mean_cost[group]), 2) if paid_counts[group] else None,
+            "damage_per_point": round(float(mean_per_point[group]), 2) if paid_counts[group] else None,
+            "signature_mean_damage": round(float(mean_free[group]), 2) if free_counts[group] else None,
+        })
+    return rows
+
+
+def damage_outliers(table: DamageTable, threshold: float = 2.0, min_group: int = 5) -> List[Dict[str, Any]]:
+    """Rows whose damage is ``threshold`` standard deviations from their level/tier group."""
+    damaging = np.flatnonzero(~np.isnan(table.base_damage) & (table.level >= 0))
+    damage = table.base_damage[damaging]
+    key = table.level[damaging].astype(np.int64) * 3 + (table.tier[damaging].astype(np.int64) - 1)
+    size = int(key.max()) + 1 if key.size else 0
+
+    counts, means = _group_means(key, damage, size)
+    _, mean_squares = _group_means(key, damage * damage, size)
+    std = np.sqrt(np.maximum(mean_squares - means * means, 0.0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (damage - means[key]) / std[key]
+    flagged = (counts[key] >= min_group) & (std[key] > 0) & (np.abs(z) >= threshold)
+
+    rows = []
+    for position in np.flatnonzero(flagged)[np.argsort(-np.abs(z[flagged]), kind="stable")]:
+        row = damaging[position]
+        rows.append({
+            "class": table.class_names[table.class_id[row]],
+            "subclass": table.subclass_names[table.subclass_id[row]] or None,
+            "ability": table.ability_names[table.ability[row]],
+            "level": int(table.level[row]),
+            "cost": int(table.cost[row]),
+            "tier": int(table.tier[row]),
+            "damage": float(table.base_damage[row]),
+            "group_mean": round(float(means[key[position]]), 2),
+            "z": round(float(z[position]), 2),
+        })
+    return rows
+
+
+def tier_scaling(table: DamageTable) -> List[Dict[str, Any]]:
+    """Tier 2 and tier 3 damage relative to tier 1, per class and overall."""
+    matrix = np.full((len(table.ability_names), 3), np.nan)
+    matrix[table.ability, table.tier - 1] = table.base_damage
+    ability_class = np.zeros(len(table.ability_names), dtype=np.int16)
+    ability_class[table.ability] = table.class_id
+
+    valid = (matrix[:, 0] > 0) & ~np.isnan(matrix[:, 1]) & ~np.isnan(matrix[:, 2])
+    ratios = matrix[valid, 1:] / matrix[valid, :1]
+    classes = ability_class[valid]
+
+    def summary(name: str, selected: "np.ndarray") -> Dict[str, Any]:
+        if not selected.shape[0]:
+            return {"class": name, "abilities": 0}
+        return {
+            "class": name,
+            "abilities": int(selected.shape[0]),
+            "t2_over_t1_mean": round(float(selected[:, 0].mean()), 3),
+            "t2_over_t1_median": round(float(np.median(selected[:, 0])), 3),
+            "t3_over_t1_mean": round(float(selected[:, 1].mean()), 3),
+            "t3_over_t1_median": round(float(np.median(selected[:, 1])), 3),
+            "t3_over_t1_min": round(float(selected[:, 1].min()), 3),
+            "t3_over_t1_max": round(float(selected[:, 1].max()), 3),
+        }
+
+    rows = [summary(name, ratios[classes == index]) for index, name in enumerate(table.class_names)]
+    rows = [row for row in rows if row["abilities"]]
+    rows.append(summary("(all)", ratios))
+    return rows
+
+
+# -----------------------------------------------------------------------------
+# Output
+# -----------------------------------------------------------------------------
+
+def _print_table(title: str, rows: List[Dict[str, Any]], limit: Optional[int] = None) -> None:
+    print(f"\n{title}")
+    if not rows:
+        print("  (none)")
+        return
+    headers = list(rows[0])
+    shown = rows if limit is None else rows[:limit]
+    cells = [["" if row.get(h) is None else str(row.get(h)) for h in headers] for row in shown]
+    widths = [max(len(h), *(len(line[i]) for line in cells)) for i, h in enumerate(headers)]
+    print("  " + "  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  " + "  ".join("-" * w for w in widths))
+    for line in cells:
+        print("  " + "  ".join(value.ljust(w) for value, w in zip(line, widths)))
+    if limit is not None and len(rows) > limit:
+        print(f"  ... {len(rows) - limit} more")
+
+
+def _write_csv(path: Path, rows: List[Dict[str, Any]]) -> None:
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        if not rows:
+            return
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Damage balance summaries over the compendium abilities.")
+    parser.add_argument("--source-dir", type=Path, default=COMPENDIUM_DIR, help="Compendium Abilities folder.")
+    parser.add_argument("--format", choices=("text", "json", "csv"), default="text")
+    parser.add_argument("--output", type=Path, help="Output file (json) or folder (csv).")
+    parser.add_argument("--threshold", type=float, default=2.0, help="Outlier z-score threshold.")
+    parser.add_argument("--limit", type=int, default=25, help="Outlier rows to print in text mode.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if np is None:
+        print(NUMPY_MISSING, file=sys.stderr)
+        sys.exit(2)
+    if args.format == "csv" and args.output is None:
+        print("--format csv needs --output FOLDER", file=sys.stderr)
+        sys.exit(2)
+
+    started = time.perf_counter()
+    table = load_damage_table(args.source_dir)
+    loaded = time.perf_counter()
+    summaries = {
+        "by_level": damage_by_level(table),
+        "outliers": damage_outliers(table, args.threshold),
+        "tier_scaling": tier_scaling(table),
+    }
+    finished = time.perf_counter()
+
+    if args.format == "json":
+        text = json.dumps(summaries, indent=2, ensure_ascii=False)
+        if args.output:
+            args.output.write_text(text + "\n", encoding="utf-8")
+        else:
+            print(text)
+    elif args.format == "csv":
+        args.output.mkdir(parents=True, exist_ok=True)
+        for name, rows in summaries.items():
+            _write_csv(args.output / f"{name}.csv", rows)
+        print(f"Wrote {', '.join(f'{name}.csv' for name in summaries)} to {args.output}")
+    else:
+        _print_table("Damage by level and tier", summaries["by_level"])
+        _print_table(f"Outliers (|z| >= {args.threshold})", summaries["outliers"], args.limit)
+        _print_table("Tier scaling", summaries["tier_scaling"])
+
+    print(
+        f"\n{len(table.ability_names)} abilities, {len(table)} tier rows; "
+        f"loaded in {(loaded - started) * 1000:.0f} ms, analysed in {(finished - loaded) * 1000:.1f} ms",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
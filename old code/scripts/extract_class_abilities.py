@@ -4,22 +4,39 @@ Convert compendium ability JSON files into the standardized class ability schema
 
 Reads every JSON file within data/compendium/Abilities and writes a transformed
 version into data/abilities/class_abilities_new, preserving the relative
-directory structure.
+directory structure. Either side can also be a zip or tar archive (see
+archive_io.py).
+
+The distance and tier parsing regexes are written so that their running time
+stays linear in the length of the text (possessive quantifiers, atomic groups
+and digit-run anchors instead of overlapping optional groups); regex_fuzz.py
+checks this on adversarial input. Each ability is still converted under a
+CPU time budget, and one that exceeds it is quarantined and reported instead
+of stalling the run; the script then exits with status 1, since its output is
+incomplete.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import queue
 import re
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from archive_io import Sink, Source, open_sink, open_source
 
 
 ROOT = Path(__file__).resolve().parent.parent
-SOURCE_DIR = ROOT / "data" / "compendium" / "Abilities"
-TARGET_DIR = ROOT / "data" / "abilities" / "class_abilities_new"
+SOURCE_DIR = ROOT / "data_unused" / "compendium" / "Abilities"
+TARGET_DIR = ROOT.parent / "hero_smith" / "build" / "class_abilities_new"
 
 
 DAMAGE_TYPES = [
@@ -68,8 +85,65 @@ AREA_LABELS = {
     "wall": "Wall",
 }
 
-
-@dataclass
+# Default CPU time budget for converting one ability, in seconds. A normal
+# ability takes well under a millisecond; this only catches runaway parses.
+REGEX_BUDGET = 1.0
+
+_MELEE_OR_RANGED = re.compile(r"melee\s*+\d*+\s*+or\s*+ranged")
+_MELEE_RANGE = re.compile(r"melee\s*+(\d+)")
+_RANGED_RANGE = re.compile(r"ranged\s*+(\d+)")
+# (?<!\d) only lets a match start at the beginning of a digit run, which is
+# where the leftmost match starts anyway, without retrying every suffix of it
+_LINE_SIZE = re.compile(r"(?<!\d)(\d++)\s*+x\s*+(\d++)\s*+line")
+_AREA_SIZE = {label: re.compile(r"(?<!\d)(\d++)\s*+" + key) for key, label in AREA_LABELS.items()}
+_WITHIN = re.compile(r"within\s++(\d+)")
+_BASE_DAMAGE = re.compile(r"\s*+(\d+)")
+# "+ M damage", "+ M, A, or R holy damage". The letters are one atomic group and
+# the text before "damage" a single class, so a "+ M" with no "damage" after it
+# fails in one pass instead of retrying every way of splitting the text.
+_CHARACTERISTIC_DAMAGE = re.compile(
+    r"\+\s*+((?>[MARIP](?:\s*+,\s*+[MARIP])*+(?:\s*+,?\s*+or\s*+[MARIP])?))[a-z\s]*damage",
+    re.IGNORECASE,
+)
+_POTENCY = re.compile(r"([MARIP])\s*+<\s*+(WEAK|AVERAGE|STRONG)", re.IGNORECASE)
+
+
+class RegexTimeout(Exception):
+    """Raised when parsing one ability takes longer than its time budget."""
+
+
+@contextmanager
+def regex_budget(seconds: Optional[float]) -> Iterator[None]:
+    """Raise ``RegexTimeout`` if the block uses more than ``seconds`` of CPU time.
+
+    Uses the SIGPROF interval timer, which counts CPU time of the process
+    rather than wall time, so a loaded machine does not quarantine healthy
+    abilities; the signal also interrupts a running regex match. Where that
+    is not available (Windows, threads other than the main one) or
+    ``seconds`` is falsy, the block runs without a budget.
+    """
+    if (
+        not seconds
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+        or signal.getitimer(signal.ITIMER_PROF)[0]
+    ):
+        yield
+        return
+
+    def _expired(signum, frame) -> None:
+        raise RegexTimeout(f"parsing used more than {seconds * 1000:.0f} ms of CPU time")
+
+    previous = signal.signal(signal.SIGPROF, _expired)
+    signal.setitimer(signal.ITIMER_PROF, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+
+@dataclass(slots=True, frozen=True)
 class TierDetails:
     base_damage_value: Optional[int]
     characteristic_damage_options: Optional[str]
@@ -87,6 +161,95 @@ class TierDetails:
         }
 
 
+@dataclass(slots=True, frozen=True)
+class PowerRollTiers:
+    low: Optional[TierDetails]
+    mid: Optional[TierDetails]
+    high: Optional[TierDetails]
+
+    def to_dict(self) -> Dict[str, Optional[Dict[str, Optional[str]]]]:
+        return {
+            "low": self.low.to_dict() if self.low else None,
+            "mid": self.mid.to_dict() if self.mid else None,
+            "high": self.high.to_dict() if self.high else None,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class PowerRoll:
+    characteristics: Optional[str]
+    tiers: Optional[PowerRollTiers]
+    label: str = "Power roll"
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "label": self.label,
+            "characteristics": self.characteristics,
+            "tiers": self.tiers.to_dict() if self.tiers else None,
+        }
+
+
+@dataclass(slots=True)
+class RangeDetails:
+    distance: Optional[str]
+    area: Optional[str]
+    range_value: Optional[object]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "distance": self.distance,
+            "area": self.area,
+            "range_value": self.range_value,
+        }
+
+
+@dataclass(slots=True)
+class AbilityCost:
+    resource: Optional[str]
+    amount: Optional[int]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"resource": self.resource, "amount": self.amount}
+
+
+@dataclass(slots=True)
+class AbilityRecord:
+    """A transformed ability. Nested values stay as records until ``to_dict``."""
+
+    id: str
+    name: Optional[str]
+    level: Optional[int]
+    costs: Optional[AbilityCost]
+    story_text: Optional[str]
+    keywords: List[str]
+    action_type: Optional[str]
+    trigger_text: Optional[str]
+    range: RangeDetails
+    targets: Optional[str]
+    power_roll: Optional[PowerRoll]
+    effect: Optional[str]
+    special_effect: Optional[str]
+    type: str = "ability"
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "type": self.type,
+            "id": self.id,
+            "name": self.name,
+            "level": self.level,
+            "costs": self.costs.to_dict() if self.costs else None,
+            "story_text": self.story_text,
+            "keywords": list(self.keywords),
+            "action_type": self.action_type,
+            "trigger_text": self.trigger_text,
+            "range": self.range.to_dict(),
+            "targets": self.targets,
+            "power_roll": self.power_roll.to_dict() if self.power_roll else None,
+            "effect": self.effect,
+            "special_effect": self.special_effect,
+        }
+
+
 def slugify(value: str) -> str:
     slug = re.sub(r"[^0-9a-z]+", "_", value.lower())
     slug = re.sub(r"_+", "_", slug)
@@ -108,9 +271,9 @@ def normalise_action_type(data: Dict) -> Optional[str]:
     return candidates[0].strip() if candidates[0] else None
 
 
-def parse_range(distance: Optional[str]) -> Dict[str, Optional[str]]:
+def parse_range(distance: Optional[str]) -> RangeDetails:
     if not distance:
-        return {"distance": None, "area": None, "range_value": None}
+        return RangeDetails(distance=None, area=None, range_value=None)
 
     original = distance.strip()
     lower = original.lower()
@@ -118,7 +281,7 @@ def parse_range(distance: Optional[str]) -> Dict[str, Optional[str]]:
     area: Optional[str] = None
     range_value: Optional[str] = None
 
-    melee_or_ranged_match = re.match(r"melee\s*\d*\s*or\s*ranged", lower)
+    melee_or_ranged_match = _MELEE_OR_RANGED.match(lower)
     if lower.startswith("melee or ranged") or melee_or_ranged_match:
         distance_type = "Melee or Ranged"
     elif lower.startswith("melee"):
@@ -131,18 +294,18 @@ def parse_range(distance: Optional[str]) -> Dict[str, Optional[str]]:
         distance_type = "Special"
 
     if distance_type == "Melee or Ranged":
-        melee_match = re.search(r"melee\s*(\d+)", lower)
-        ranged_match = re.search(r"ranged\s*(\d+)", lower)
+        melee_match = _MELEE_RANGE.search(lower)
+        ranged_match = _RANGED_RANGE.search(lower)
         if melee_match and ranged_match:
             range_value = f"Melee {melee_match.group(1)} or Ranged {ranged_match.group(1)}"
         else:
             range_value = original
     elif distance_type == "Melee":
-        melee_match = re.search(r"melee\s*(\d+)", lower)
+        melee_match = _MELEE_RANGE.search(lower)
         if melee_match:
             range_value = int(melee_match.group(1))
     elif distance_type == "Ranged":
-        ranged_match = re.search(r"ranged\s*(\d+)", lower)
+        ranged_match = _RANGED_RANGE.search(lower)
         if ranged_match:
             range_value = int(ranged_match.group(1))
     elif distance_type == "Self":
@@ -161,16 +324,16 @@ def parse_range(distance: Optional[str]) -> Dict[str, Optional[str]]:
         if not area:
             return None
         if area == "Line":
-            match = re.search(r"(\d+)\s*x\s*(\d+)\s*line", lower)
+            match = _LINE_SIZE.search(lower)
             if match:
                 return f"{match.group(1)} x {match.group(2)}"
-        match = re.search(r"(\d+)\s*" + area.lower(), lower)
+        match = _AREA_SIZE[area].search(lower)
         if match:
             return match.group(1)
         return None
 
     area_size = _extract_area_size()
-    within_match = re.search(r"within\s+(\d+)", lower)
+    within_match = _WITHIN.search(lower)
 
     if area:
         area_range_parts: List[str] = []
@@ -187,11 +350,7 @@ def parse_range(distance: Optional[str]) -> Dict[str, Optional[str]]:
     if isinstance(range_value, str):
         range_value = range_value.strip()
 
-    return {
-        "distance": distance_type,
-        "area": area,
-        "range_value": range_value,
-    }
+    return RangeDetails(distance=distance_type, area=area, range_value=range_value)
 
 
 def _format_condition_phrase(text: str) -> str:
@@ -206,10 +365,202 @@ def _format_condition_phrase(text: str) -> str:
     return re.sub(r"^[a-z]+", _replace, text, count=1)
 
 
+# -----------------------------------------------------------------------------
+# Parse caches
+#
+# Tier texts repeat across the corpus with only their numbers changing
+# ("4 + M damage; push 2" / "7 + M damage; push 3"). Every tier string is
+# reduced to a shape with its digit runs abstracted out. When a shape comes up
+# a second time it is parsed once with unique sentinel numbers in place of the
+# real ones, which yields a template; that template is checked against the
+# real parse of the first string of the shape and then used for every later
+# string of that shape by putting its own numbers back in, without running
+# any of the parsing regexes. Exact repeats are served straight from the text
+# cache, and equal results and their strings are interned so they share one
+# object.
+#
+# The caches live as long as the process, which for the compendium server is
+# indefinitely, so each holds at most PARSE_CACHE_LIMIT entries and drops its
+# oldest entry to make room for a new one.
+# -----------------------------------------------------------------------------
+
+_DIGIT_RUN = re.compile(r"\d+")
+_SENTINEL_BASE = 7_000_000_000
+_MISSING = object()
+_UNCACHEABLE = object()
+
+# A template field is either a constant or a tuple mixing literal text and
+# indexes into the numbers of the string being instantiated.
+_TemplateField = Union[None, str, Tuple[Union[str, int], ...]]
+
+_TIER_TEXT_CACHE: Dict[str, Optional[TierDetails]] = {}
+_TIER_SHAPE_CACHE: Dict[str, object] = {}
+_TIER_INTERN: Dict[TierDetails, TierDetails] = {}
+_POWER_ROLL_CACHE: Dict[Tuple[str, Optional[str], Optional[str], Optional[str]], PowerRoll] = {}
+_CACHE_STATS = {"exact_hits": 0, "shape_hits": 0, "misses": 0, "uncacheable": 0}
+# Entries per cache; the whole compendium needs a few thousand
+PARSE_CACHE_LIMIT = 50_000
+
+
+def _remember(cache: Dict, key: Any, value: Any) -> None:
+    """Store ``value`` under ``key``, evicting the oldest entry once ``cache`` is full."""
+    if key not in cache and len(cache) >= PARSE_CACHE_LIMIT:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+class _TierTemplate:
+    __slots__ = ("base_index", "fields")
+
+    def __init__(self, base_index: Optional[int], fields: Tuple[_TemplateField, ...]):
+        self.base_index = base_index
+        self.fields = fields
+
+    @classmethod
+    def from_sentinel_parse(cls, parsed: TierDetails, count: int) -> Optional["_TierTemplate"]:
+        def to_index(digits: str) -> Optional[int]:
+            index = int(digits) - _SENTINEL_BASE
+            return index if 0 <= index < count and len(digits) == len(str(_SENTINEL_BASE)) else None
+
+        base_index = None
+        if parsed.base_damage_value is not None:
+            base_index = to_index(str(parsed.base_damage_value))
+            if base_index is None:
+                return None
+
+        fields: List[_TemplateField] = []
+        for value in (
+            parsed.characteristic_damage_options,
+            parsed.damage_types,
+            parsed.potencies,
+            parsed.conditions,
+        ):
+            if value is None or not _DIGIT_RUN.search(value):
+                fields.append(value)
+                continue
+            parts: List[Union[str, int]] = []
+            last = 0
+            for match in _DIGIT_RUN.finditer(value):
+                if match.start() > last:
+                    parts.append(value[last:match.start()])
+                number_index = to_index(match.group(0))
+                if number_index is None:
+                    return None
+                parts.append(number_index)
+                last = match.end()
+            if last < len(value):
+                parts.append(value[last:])
+            fields.append(tuple(parts))
+        return cls(base_index, tuple(fields))
+
+    def instantiate(self, numbers: List[str]) -> TierDetails:
+        values: List[Optional[str]] = []
+        for field in self.fields:
+            if isinstance(field, tuple):
+                values.append("".join(numbers[part] if isinstance(part, int) else part for part in field))
+            else:
+                values.append(field)
+        return TierDetails(
+            base_damage_value=int(numbers[self.base_index]) if self.base_index is not None else None,
+            characteristic_damage_options=values[0],
+            damage_types=values[1],
+            potencies=values[2],
+            conditions=values[3],
+        )
+
+
+def _intern_tier(tier: Optional[TierDetails]) -> Optional[TierDetails]:
+    if tier is None:
+        return None
+    shared = _TIER_INTERN.get(tier)
+    if shared is not None:
+        return shared
+    tier = TierDetails(
+        base_damage_value=tier.base_damage_value,
+        characteristic_damage_options=_intern_str(tier.characteristic_damage_options),
+        damage_types=_intern_str(tier.damage_types),
+        potencies=_intern_str(tier.potencies),
+        conditions=_intern_str(tier.conditions),
+    )
+    _remember(_TIER_INTERN, tier, tier)
+    return tier
+
+
+def _intern_str(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+def parse_cache_stats() -> Dict[str, int]:
+    stats = dict(_CACHE_STATS)
+    stats["texts"] = len(_TIER_TEXT_CACHE)
+    stats["shapes"] = len(_TIER_SHAPE_CACHE)
+    stats["distinct_tiers"] = len(_TIER_INTERN)
+    stats["power_rolls"] = len(_POWER_ROLL_CACHE)
+    return stats
+
+
+def clear_parse_caches() -> None:
+    _TIER_TEXT_CACHE.clear()
+    _TIER_SHAPE_CACHE.clear()
+    _TIER_INTERN.clear()
+    _POWER_ROLL_CACHE.clear()
+    for key in _CACHE_STATS:
+        _CACHE_STATS[key] = 0
+
+
 def parse_tier_text(text: Optional[str]) -> Optional[TierDetails]:
     if not text:
         return None
 
+    cached = _TIER_TEXT_CACHE.get(text, _MISSING)
+    if cached is not _MISSING:
+        _CACHE_STATS["exact_hits"] += 1
+        return cached
+
+    numbers = _DIGIT_RUN.findall(text)
+    shape = _DIGIT_RUN.sub("#", text)
+    template = _TIER_SHAPE_CACHE.get(shape, _MISSING)
+
+    if template is _MISSING:
+        # First string of this shape: parse it and keep it as the example the
+        # template will be checked against once the shape comes up again.
+        _CACHE_STATS["misses"] += 1
+        result = _parse_tier_text_uncached(text)
+        _remember(_TIER_SHAPE_CACHE, shape, (numbers, result) if result is not None else _UNCACHEABLE)
+    elif template is _UNCACHEABLE:
+        _CACHE_STATS["uncacheable"] += 1
+        result = _parse_tier_text_uncached(text)
+    elif isinstance(template, tuple):
+        example_numbers, example_result = template
+        counter = iter(range(len(numbers)))
+        sentinel_text = _DIGIT_RUN.sub(lambda _: str(_SENTINEL_BASE + next(counter)), text)
+        sentinel_parse = _parse_tier_text_uncached(sentinel_text)
+        candidate = (
+            _TierTemplate.from_sentinel_parse(sentinel_parse, len(numbers))
+            if sentinel_parse is not None
+            else None
+        )
+        if candidate is not None and candidate.instantiate(example_numbers) == example_result:
+            _CACHE_STATS["misses"] += 1
+            _remember(_TIER_SHAPE_CACHE, shape, candidate)
+            result = candidate.instantiate(numbers)
+        else:
+            _CACHE_STATS["uncacheable"] += 1
+            _remember(_TIER_SHAPE_CACHE, shape, _UNCACHEABLE)
+            result = _parse_tier_text_uncached(text)
+    else:
+        _CACHE_STATS["shape_hits"] += 1
+        result = template.instantiate(numbers)
+
+    result = _intern_tier(result)
+    _remember(_TIER_TEXT_CACHE, text, result)
+    return result
+
+
+def _parse_tier_text_uncached(text: Optional[str]) -> Optional[TierDetails]:
+    if not text:
+        return None
+
     working = text.strip()
     if not working:
         return None
@@ -221,16 +572,12 @@ def parse_tier_text(text: Optional[str]) -> Optional[TierDetails]:
     potencies: Optional[str] = None
     condition_phrases: List[str] = []
 
-    base_match = re.match(r"\s*(\d+)", remaining)
+    base_match = _BASE_DAMAGE.match(remaining)
     if base_match:
         base_damage_value = int(base_match.group(1))
         remaining = remaining[base_match.end():]
 
-    char_pattern = re.compile(
-        r"\+\s*([MARIP](?:\s*,\s*[MARIP])*(?:\s*,?\s*or\s*[MARIP])?)\s*(?:[a-z\s]+)?damage",
-        re.IGNORECASE,
-    )
-    char_match = char_pattern.search(remaining)
+    char_match = _CHARACTERISTIC_DAMAGE.search(remaining)
     if char_match:
         letters_segment = re.sub(r"\bor\b", "", char_match.group(1), flags=re.IGNORECASE)
         letters = re.findall(r"[MARIP]", letters_segment, flags=re.IGNORECASE)
@@ -240,7 +587,7 @@ def parse_tier_text(text: Optional[str]) -> Optional[TierDetails]:
                 characteristic_damage_options = f"{letters[0]} damage"
             else:
                 characteristic_damage_options = "/".join(letters) + " damage"
-        remaining = char_pattern.sub("", remaining, count=1)
+        remaining = _CHARACTERISTIC_DAMAGE.sub("", remaining, count=1)
 
     found_damage_types: List[str] = []
     for dtype in DAMAGE_TYPES:
@@ -260,11 +607,10 @@ def parse_tier_text(text: Optional[str]) -> Optional[TierDetails]:
                 order.append(token)
         damage_types = "/".join(order)
 
-    pot_pattern = re.compile(r"([MARIP])\s*<\s*(WEAK|AVERAGE|STRONG)", re.IGNORECASE)
-    pot_match = pot_pattern.search(remaining)
+    pot_match = _POTENCY.search(remaining)
     if pot_match:
         potencies = f"{pot_match.group(1).upper()} < {pot_match.group(2).upper()}"
-        remaining = pot_pattern.sub("", remaining, count=1)
+        remaining = _POTENCY.sub("", remaining, count=1)
 
     for cond in CONDITION_KEYWORDS:
         cond_pattern = re.compile(r"\b" + cond + r"(?:\s*\(save ends\))?", re.IGNORECASE)
@@ -302,36 +648,32 @@ def parse_tier_text(text: Optional[str]) -> Optional[TierDetails]:
     )
 
 
-def parse_power_roll(effects: Iterable[Dict]) -> Optional[Dict[str, object]]:
+def parse_power_roll(effects: Iterable[Dict]) -> Optional[PowerRoll]:
     for effect in effects:
         roll = effect.get("roll")
         if not roll:
             continue
+        key = (roll, effect.get("tier1"), effect.get("tier2"), effect.get("tier3"))
+        cached = _POWER_ROLL_CACHE.get(key)
+        if cached is not None:
+            return cached
+
         characteristic_segment = roll.split("+", 1)[-1].strip()
         characteristic_segment = characteristic_segment.replace("Power Roll", "").strip()
         characteristic_segment = re.sub(r"^(\+|\band\b)\s*", "", characteristic_segment, flags=re.IGNORECASE)
         characteristics = re.sub(r"\s+", " ", characteristic_segment).strip()
 
-        tiers = {
-            "low": parse_tier_text(effect.get("tier1")),
-            "mid": parse_tier_text(effect.get("tier2")),
-            "high": parse_tier_text(effect.get("tier3")),
-        }
-
-        tier_payload = {}
-        any_data = False
-        for key, tier in tiers.items():
-            if tier is None:
-                tier_payload[key] = None
-            else:
-                any_data = True
-                tier_payload[key] = tier.to_dict()
-
-        return {
-            "label": "Power roll",
-            "characteristics": characteristics or None,
-            "tiers": tier_payload if any_data else None,
-        }
+        low = parse_tier_text(key[1])
+        mid = parse_tier_text(key[2])
+        high = parse_tier_text(key[3])
+        any_data = low is not None or mid is not None or high is not None
+
+        power_roll = PowerRoll(
+            characteristics=_intern_str(characteristics or None),
+            tiers=PowerRollTiers(low=low, mid=mid, high=high) if any_data else None,
+        )
+        _remember(_POWER_ROLL_CACHE, key, power_roll)
+        return power_roll
     return None
 
 
@@ -388,7 +730,7 @@ def normalise_keywords(value) -> List[str]:
     return keywords
 
 
-def transform_ability(source_path: Path, data: Dict) -> Dict[str, object]:
+def transform_ability(source_path: Path, data: Dict) -> AbilityRecord:
     metadata = data.get("metadata", {})
 
     action_type = normalise_action_type(data)
@@ -408,7 +750,7 @@ def transform_ability(source_path: Path, data: Dict) -> Dict[str, object]:
             if cost_resource is None:
                 cost_resource = cost_match.group(2)
     costs = (
-        {"resource": cost_resource, "amount": cost_amount}
+        AbilityCost(resource=cost_resource, amount=cost_amount)
         if cost_amount is not None or cost_resource is not None
         else None
     )
@@ -416,68 +758,280 @@ def transform_ability(source_path: Path, data: Dict) -> Dict[str, object]:
     id_source = data.get("name") or metadata.get("file_basename") or source_path.stem
     ability_id = slugify(id_source)
 
-    transformed = {
-        "type": "ability",
-        "id": ability_id,
-        "name": data.get("name"),
-        "level": metadata.get("level"),
-        "costs": costs,
-        "story_text": data.get("flavor"),
-        "keywords": keywords,
-        "action_type": action_type,
-        "trigger_text": data.get("trigger"),
-        "range": range_data,
-        "targets": normalise_targets(metadata.get("target") or data.get("target")),
-        "power_roll": power_roll,
-        "effect": effects_payload["effect"],
-        "special_effect": effects_payload["special_effect"],
-    }
-
-    return transformed
-
-
-def convert_files(overwrite: bool = True) -> int:
-    if not SOURCE_DIR.exists():
-        raise FileNotFoundError(f"Source directory not found: {SOURCE_DIR}")
-
-    files = sorted(SOURCE_DIR.rglob("*.json"))
-    if not files:
-        return 0
-
-    for file_path in files:
-        relative_path = file_path.relative_to(SOURCE_DIR)
-        target_path = TARGET_DIR / relative_path
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with file_path.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-
-        transformed = transform_ability(file_path, data)
-
-        if target_path.exists() and not overwrite:
-            continue
+    return AbilityRecord(
+        id=ability_id,
+        name=data.get("name"),
+        level=metadata.get("level"),
+        costs=costs,
+        story_text=data.get("flavor"),
+        keywords=keywords,
+        action_type=action_type,
+        trigger_text=data.get("trigger"),
+        range=range_data,
+        targets=normalise_targets(metadata.get("target") or data.get("target")),
+        power_roll=power_roll,
+        effect=effects_payload["effect"],
+        special_effect=effects_payload["special_effect"],
+    )
 
-        with target_path.open("w", encoding="utf-8") as handle:
-            json.dump(transformed, handle, indent=2, ensure_ascii=True)
-            handle.write("\n")
 
+class StageStats:
+    """Throughput and input queue depth of one pipeline stage."""
+
+    __slots__ = ("name", "workers", "items", "busy_seconds", "depth_total", "depth_samples", "max_depth", "_lock")
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.depth_total = 0
+        self.depth_samples = 0
+        self.max_depth = 0
+        self._lock = threading.Lock()
+
+    def record(self, busy_seconds: float, queue_depth: int) -> None:
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += busy_seconds
+            self.depth_total += queue_depth
+            self.depth_samples += 1
+            self.max_depth = max(self.max_depth, queue_depth)
+
+    @property
+    def mean_depth(self) -> float:
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+
+
+class PipelineStats:
+    """Per-stage statistics collected by ``convert_files``."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageStats] = {}
+        self.wall_seconds = 0.0
+        # (file, reason) for abilities skipped because parsing ran over budget
+        self.quarantined: List[Tuple[str, str]] = []
+
+    def stage(self, name: str, workers: int) -> StageStats:
+        self.stages[name] = StageStats(name, workers)
+        return self.stages[name]
+
+    def report(self) -> str:
+        lines = [f"{'stage':<10} {'workers':>7} {'items':>6} {'items/s':>9} {'busy':>8} {'in-queue avg':>12} {'in-queue max':>12}"]
+        for stage in self.stages.values():
+            rate = stage.items / self.wall_seconds if self.wall_seconds else 0.0
+            lines.append(
+                f"{stage.name:<10} {stage.workers:>7} {stage.items:>6} {rate:>9.1f} "
+                f"{stage.busy_seconds:>7.3f}s {stage.mean_depth:>12.1f} {stage.max_depth:>12}"
+            )
+        lines.append(f"wall time {self.wall_seconds:.3f}s")
+        return "\n".join(lines)
+
+
+_DONE = object()
+
+
+def _put(target: "queue.Queue", item: object, stop: threading.Event) -> bool:
+    """Blocking put that gives up once the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def convert_files(
+    overwrite: bool = True,
+    source_dir: Path = SOURCE_DIR,
+    target_dir: Path = TARGET_DIR,
+    readers: int = 4,
+    writers: int = 4,
+    queue_size: int = 64,
+    stats: Optional[PipelineStats] = None,
+    budget: Optional[float] = REGEX_BUDGET,
+) -> int:
+    """Convert every compendium ability file under ``source_dir`` into ``target_dir``.
+
+    Both may be folders or archives; an archive target is written when the
+    conversion finishes and holds exactly the files folder mode would write,
+    including, without ``overwrite``, the members it already had.
+
+    Files go through three stages connected by bounded queues: a pool of
+    reader threads loads the raw text, the calling thread parses and
+    transforms it, and a pool of writer threads writes the results. Disk I/O
+    overlaps with the CPU-bound transform, and the bounded queues keep a fast
+    stage from running arbitrarily far ahead of a slow one.
+
+    Each ability is transformed under a ``budget`` of seconds; files that run
+    over it are not written and are listed in ``stats.quarantined``.
+    """
+    with open_source(source_dir) as source:
+        files = source.files(".json")
+        if not files:
+            return 0
+        # Without overwrite, files already in an archive target count as existing
+        with open_sink(target_dir, keep_existing=not overwrite) as sink:
+            _run_pipeline(source, sink, files, overwrite, readers, writers, queue_size, stats, budget)
     return len(files)
 
 
+def _run_pipeline(
+    source: Source,
+    sink: Sink,
+    files: List[str],
+    overwrite: bool,
+    readers: int,
+    writers: int,
+    queue_size: int,
+    stats: Optional[PipelineStats],
+    budget: Optional[float] = REGEX_BUDGET,
+) -> None:
+
+    stats = stats if stats is not None else PipelineStats()
+    read_stats = stats.stage("read", readers)
+    transform_stats = stats.stage("transform", 1)
+    write_stats = stats.stage("write", writers)
+
+    paths: "queue.Queue" = queue.Queue()
+    for name in files:
+        paths.put(name)
+    read_queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    write_queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def read_worker() -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    name = paths.get_nowait()
+                except queue.Empty:
+                    break
+                started = time.perf_counter()
+                text = source.read_text(name)
+                read_stats.record(time.perf_counter() - started, paths.qsize())
+                if not _put(read_queue, (name, text), stop):
+                    return
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+        finally:
+            _put(read_queue, _DONE, stop)
+
+    def write_worker() -> None:
+        # Writers keep draining the queue after a failure so that the final
+        # sentinels can always be delivered.
+        while True:
+            item = write_queue.get()
+            if item is _DONE:
+                return
+            if stop.is_set():
+                continue
+            depth = write_queue.qsize()
+            started = time.perf_counter()
+            name, text = item
+            try:
+                sink.write_text(name, text)
+            except BaseException as exc:
+                errors.append(exc)
+                stop.set()
+                continue
+            write_stats.record(time.perf_counter() - started, depth)
+
+    reader_threads = [threading.Thread(target=read_worker, daemon=True) for _ in range(max(1, readers))]
+    writer_threads = [threading.Thread(target=write_worker, daemon=True) for _ in range(max(1, writers))]
+    wall_start = time.perf_counter()
+    for thread in reader_threads + writer_threads:
+        thread.start()
+
+    try:
+        finished_readers = 0
+        while finished_readers < len(reader_threads) and not stop.is_set():
+            try:
+                item = read_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                finished_readers += 1
+                continue
+            depth = read_queue.qsize()
+            started = time.perf_counter()
+            name, text = item
+            try:
+                with regex_budget(budget):
+                    transformed = transform_ability(Path(name), json.loads(text))
+            except RegexTimeout as exc:
+                stats.quarantined.append((name, str(exc)))
+                transform_stats.record(time.perf_counter() - started, depth)
+                continue
+            if overwrite or not sink.exists(name):
+                payload = json.dumps(transformed.to_dict(), indent=2, ensure_ascii=True) + "\n"
+                transform_stats.record(time.perf_counter() - started, depth)
+                _put(write_queue, (name, payload), stop)
+            else:
+                transform_stats.record(time.perf_counter() - started, depth)
+    except BaseException as exc:
+        errors.append(exc)
+        stop.set()
+    finally:
+        for _ in writer_threads:
+            write_queue.put(_DONE)
+        for thread in reader_threads + writer_threads:
+            thread.join()
+        stats.wall_seconds = time.perf_counter() - wall_start
+
+    if errors:
+        raise errors[0]
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Convert compendium abilities to class ability schema.")
+    parser.add_argument("--source-dir", type=Path, default=SOURCE_DIR, help="Compendium Abilities folder or archive.")
+    parser.add_argument("--target-dir", type=Path, default=TARGET_DIR, help="Folder or archive (.zip, .tar, .tar.gz) for the converted files.")
     parser.add_argument(
         "--no-overwrite",
         action="store_true",
         help="Do not overwrite existing files in the destination directory.",
     )
+    parser.add_argument("--readers", type=int, default=4, help="Number of reader threads.")
+    parser.add_argument("--writers", type=int, default=4, help="Number of writer threads.")
+    parser.add_argument("--queue-size", type=int, default=64, help="Capacity of the queues between stages.")
+    parser.add_argument("--stats", action="store_true", help="Print per-stage throughput and queue depth.")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=REGEX_BUDGET * 1000,
+        help="CPU time budget for parsing one ability; slower files are quarantined and the exit status is 1 (0 to disable).",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    count = convert_files(overwrite=not args.no_overwrite)
-    print(f"Converted {count} ability files from {SOURCE_DIR} into {TARGET_DIR}")
+    stats = PipelineStats()
+    try:
+        count = convert_files(
+            overwrite=not args.no_overwrite,
+            source_dir=args.source_dir,
+            target_dir=args.target_dir,
+            readers=args.readers,
+            writers=args.writers,
+            queue_size=args.queue_size,
+            stats=stats,
+            budget=args.budget_ms / 1000,
+        )
+    except FileNotFoundError as exc:
+        print(f"✗ {exc}")
+        sys.exit(1)
+    print(f"Converted {count - len(stats.quarantined)} ability files from {args.source_dir} into {args.target_dir}")
+    for name, reason in stats.quarantined:
+        print(f"✗ Quarantined {name}: {reason}")
+    if args.stats:
+        print(stats.report())
+    if stats.quarantined:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,72 @@
+import argparse
 import json
 import re
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
-
-# Define the compendium and output paths
-COMPENDIUM_PATH = Path("hero_smith/data_unused/compendium/Abilities")
-OUTPUT_PATH = Path("hero_smith/data/abilities/class_abilities_simplified")
-
-# Ensure output directory exists
-OUTPUT_PATH.mkdir(parents=True, exist_ok=True)
+from typing import Dict, List, Any, Optional, Tuple
+
+from archive_io import Source, open_sink, open_source
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+COMPENDIUM_PATH = REPO_ROOT / "old code" / "data_unused" / "compendium" / "Abilities"
+OUTPUT_PATH = REPO_ROOT / "hero_smith" / "data" / "abilities" / "class_abilities_simplified"
+
+
+@dataclass(slots=True)
+class TierEffects:
+    """Tier texts of one power roll entry; empty tiers are left out when serialized."""
+
+    tier1: Optional[str] = None
+    tier2: Optional[str] = None
+    tier3: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, str]:
+        tiers = {"tier1": self.tier1, "tier2": self.tier2, "tier3": self.tier3}
+        return {key: value for key, value in tiers.items() if value}
+
+
+@dataclass(slots=True)
+class SimplifiedAbility:
+    """A simplified ability record, kept compact until it is written out."""
+
+    id: str
+    name: str
+    level: int
+    resource: str
+    resource_value: int
+    story_text: str
+    keywords: str
+    action_type: str
+    trigger_text: str
+    distance: str
+    targets: str
+    special_effect: str
+    power_roll: str = ""
+    tier_effects: List[TierEffects] = field(default_factory=list)
+    effect: str = ""
+    type: str = "ability"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the simplified JSON schema, preserving field order."""
+        return {
+            "type": self.type,
+            "id": self.id,
+            "name": self.name,
+            "level": self.level,
+            "resource": self.resource,
+            "resource_value": self.resource_value,
+            "story_text": self.story_text,
+            "keywords": self.keywords,
+            "action_type": self.action_type,
+            "trigger_text": self.trigger_text,
+            "distance": self.distance,
+            "targets": self.targets,
+            "power_roll": self.power_roll,
+            "tier_effects": [tiers.to_dict() for tiers in self.tier_effects],
+            "effect": self.effect,
+            "special_effect": self.special_effect,
+        }
 
 
 def extract_level_from_folder(folder_name: str) -> int:
@@ -91,57 +149,53 @@ def format_keywords(keywords: List[str]) -> str:
     return "/".join(keywords)
 
 
-def convert_ability(ability_data: Dict[str, Any], fallback_level: int) -> Dict[str, Any]:
+def convert_ability(ability_data: Dict[str, Any], fallback_level: int) -> SimplifiedAbility:
     """Convert a compendium ability record to the simplified format."""
 
     metadata = ability_data.get("metadata", {})
     level = normalize_level(metadata.get("level"), fallback_level)
     resource_name, resource_value = resolve_resource_fields(ability_data, metadata)
 
-    simplified = {
-        "type": "ability",
-        "id": metadata.get("item_id", ""),
-        "name": ability_data.get("name", ""),
-        "level": level,
-        "resource": resource_name,
-        "resource_value": resource_value,
-        "story_text": ability_data.get("flavor", ""),
-        "keywords": format_keywords(ability_data.get("keywords", [])),
-        "action_type": ability_data.get("usage", "").lower(),
-        "trigger_text": ability_data.get("trigger", ""),
-        "distance": ability_data.get("distance", ""),
-        "targets": ability_data.get("target", ""),
-        "power_roll": "",
-        "tier_effects": [],
-        "effect": "",
-        "special_effect": ability_data.get("special", "")
-    }
+    simplified = SimplifiedAbility(
+        id=metadata.get("item_id", ""),
+        name=ability_data.get("name", ""),
+        level=level,
+        resource=resource_name,
+        resource_value=resource_value,
+        story_text=ability_data.get("flavor", ""),
+        keywords=format_keywords(ability_data.get("keywords", [])),
+        action_type=ability_data.get("usage", "").lower(),
+        trigger_text=ability_data.get("trigger", ""),
+        distance=ability_data.get("distance", ""),
+        targets=ability_data.get("target", ""),
+        special_effect=ability_data.get("special", ""),
+    )
 
     effects = ability_data.get("effects", [])
     collected_effect_texts: List[str] = []
 
     for effect_entry in effects:
         if "roll" in effect_entry:
-            simplified["power_roll"] = effect_entry.get("roll", "")
+            simplified.power_roll = effect_entry.get("roll", "")
 
-        tier_entry = {
-            key: value
-            for key, value in effect_entry.items()
-            if key.startswith("tier") and value
-        }
-        if tier_entry:
-            simplified["tier_effects"].append(tier_entry)
+        tier_entry = TierEffects(
+            tier1=effect_entry.get("tier1"),
+            tier2=effect_entry.get("tier2"),
+            tier3=effect_entry.get("tier3"),
+        )
+        if tier_entry.tier1 or tier_entry.tier2 or tier_entry.tier3:
+            simplified.tier_effects.append(tier_entry)
 
         if "effect" in effect_entry and effect_entry.get("effect"):
             collected_effect_texts.append(effect_entry["effect"])
 
     if collected_effect_texts:
-        simplified["effect"] = "\n\n".join(collected_effect_texts)
+        simplified.effect = "\n\n".join(collected_effect_texts)
 
     return simplified
 
 
-def process_class_folder(class_name: str, class_path: Path) -> List[Dict[str, Any]]:
+def process_class_folder(class_name: str, source: Source, class_folder: str) -> List[SimplifiedAbility]:
     """Process all abilities for a given class"""
     abilities = []
     
@@ -149,59 +203,93 @@ def process_class_folder(class_name: str, class_path: Path) -> List[Dict[str, An
     if class_name == "Common":
         action_folders = ["Main Actions", "Maneuvers", "Move Actions"]
         for action_folder in action_folders:
-            action_path = class_path / action_folder
-            if action_path.exists():
-                for json_file in action_path.glob("*.json"):
-                    try:
-                        with open(json_file, 'r', encoding='utf-8') as f:
-                            ability_data = json.load(f)
-                            simplified = convert_ability(ability_data, 1)  # Common abilities are level 1
-                            abilities.append(simplified)
-                            print(f"  ✓ Converted {json_file.name}")
-                    except Exception as e:
-                        print(f"  ✗ Error processing {json_file}: {e}")
+            action_path = f"{class_folder}/{action_folder}"
+            for file_name in source.listdir(action_path)[1]:
+                if not file_name.endswith(".json"):
+                    continue
+                try:
+                    ability_data = json.loads(source.read_text(f"{action_path}/{file_name}"))
+                    simplified = convert_ability(ability_data, 1)  # Common abilities are level 1
+                    abilities.append(simplified)
+                    print(f"  ✓ Converted {file_name}")
+                except Exception as e:
+                    print(f"  ✗ Error processing {action_path}/{file_name}: {e}")
     else:
         # Handle class abilities (organized by level)
-        for level_folder in class_path.iterdir():
-            if level_folder.is_dir():
-                level = extract_level_from_folder(level_folder.name)
-                
-                for json_file in level_folder.glob("*.json"):
-                    try:
-                        with open(json_file, 'r', encoding='utf-8') as f:
-                            ability_data = json.load(f)
-                            simplified = convert_ability(ability_data, level)
-                            abilities.append(simplified)
-                            print(f"  ✓ Converted {json_file.name} (Level {level})")
-                    except Exception as e:
-                        print(f"  ✗ Error processing {json_file}: {e}")
+        for level_folder in source.listdir(class_folder)[0]:
+            level = extract_level_from_folder(level_folder)
+            level_path = f"{class_folder}/{level_folder}"
+            
+            for file_name in source.listdir(level_path)[1]:
+                if not file_name.endswith(".json"):
+                    continue
+                try:
+                    ability_data = json.loads(source.read_text(f"{level_path}/{file_name}"))
+                    simplified = convert_ability(ability_data, level)
+                    abilities.append(simplified)
+                    print(f"  ✓ Converted {file_name} (Level {level})")
+                except Exception as e:
+                    print(f"  ✗ Error processing {level_path}/{file_name}: {e}")
     
     return abilities
 
 
-def main():
-    """Main conversion script"""
-    print("Starting ability conversion from compendium to simplified format...")
-    print(f"Reading from: {COMPENDIUM_PATH}")
-    print(f"Writing to: {OUTPUT_PATH}\n")
-    
-    # Process each class folder
-    for class_folder in COMPENDIUM_PATH.iterdir():
-        if class_folder.is_dir():
-            class_name = class_folder.name
+def write_simplified(compendium_dir: Path, output_dir: Path, compact: bool = False) -> int:
+    """Write one <class>_abilities file per class folder; returns the number of files written.
+
+    Either path can be a folder or an archive (see archive_io.py).
+    """
+    written = 0
+    with open_source(compendium_dir) as source, open_sink(output_dir) as sink:
+        # Process each class folder
+        for class_name in source.listdir()[0]:
             print(f"Processing {class_name}...")
             
-            abilities = process_class_folder(class_name, class_folder)
+            abilities = process_class_folder(class_name, source, class_name)
             
             if abilities:
                 # Write to output file
-                output_file = OUTPUT_PATH / f"{class_name.lower()}_abilities.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(abilities, f, indent=2, ensure_ascii=False)
+                output_name = f"{class_name.lower()}_abilities.json"
+                records = [ability.to_dict() for ability in abilities]
+                if compact:
+                    text = json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+                else:
+                    text = json.dumps(records, indent=2, ensure_ascii=False)
+                sink.write_text(output_name, text)
+                written += 1
                 
-                print(f"✓ Wrote {len(abilities)} abilities to {output_file.name}\n")
+                print(f"✓ Wrote {len(abilities)} abilities to {output_name}\n")
             else:
                 print(f"⚠ No abilities found for {class_name}\n")
+    return written
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate simplified class ability files from the compendium.")
+    parser.add_argument("--compendium-dir", type=Path, default=COMPENDIUM_PATH, help="Compendium Abilities folder or archive.")
+    parser.add_argument(
+        "--output-dir", type=Path, default=OUTPUT_PATH, help="Folder or archive for the <class>_abilities files."
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write minified JSON (same file names, loadable by the app) instead of pretty-printed JSON.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main conversion script"""
+    args = parse_args()
+    print("Starting ability conversion from compendium to simplified format...")
+    print(f"Reading from: {args.compendium_dir}")
+    print(f"Writing to: {args.output_dir}\n")
+
+    try:
+        write_simplified(args.compendium_dir, args.output_dir, args.compact)
+    except FileNotFoundError as exc:
+        print(f"✗ {exc}")
+        sys.exit(1)
     
     print("Conversion complete!")
 
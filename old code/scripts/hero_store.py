@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Columnar store for bulk queries over many hero exports.
+
+Hero exports keep ``values`` as a list of ``{"key", "value"|"text_value"}``
+pairs and ``entries`` as a list of dicts, which is fine for one hero and slow
+for a hundred thousand. ``ingest`` reads hero JSON files and ``HERO:`` codes
+(the same inputs validate_heroes.py accepts) into a folder of NumPy arrays:
+
+    manifest.json                 row counts and column types
+    values/<key>.npy              one column per value key, one row per hero
+                                  int32 (missing = INT_MISSING), float64 (missing = NaN)
+                                  or int32 codes into values/<key>.json (missing = -1)
+    heroes/name.npy, source.npy   dictionary-encoded hero name and input label
+    entries/<column>.npy          normalized entries table, one row per entry:
+                                  hero (row in the value columns), entry_type,
+                                  entry_id, source_type, source_id, gained_by
+    <column>.json                 string dictionary of a dictionary-encoded column
+
+Queries open the arrays memory-mapped, so only the columns a query touches
+are read, and run as whole-column NumPy operations.
+
+NumPy is only needed by this script; install it with ``pip install numpy``.
+
+Usage:
+    python hero_store.py ingest                                      # test heroes into ./hero_store
+    python hero_store.py --store /tmp/heroes ingest ../test_heroes/ --replicate 10000   # 120k heroes
+    python hero_store.py levels                                      # level distribution by class
+    python hero_store.py top kit --limit 5                           # most-picked kits
+    python hero_store.py stats stats.might                           # per-class mean/min/max
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import shutil
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from damage_analytics import np
+from validate_heroes import HEROES_DIR, decode_hero_code, iter_tasks
+
+
+STORE_DIR = Path(__file__).resolve().parent / "hero_store"
+NUMPY_MISSING = "NumPy is required for the hero store. Install it with: pip install numpy"
+ENTRY_COLUMNS = ("entry_type", "entry_id", "source_type", "source_id", "gained_by")
+INT_MISSING = -(2 ** 31)
+# Text columns are dictionary-encoded; -1 is a missing value
+TEXT_MISSING = -1
+
+
+class StringDictionary:
+    """Maps strings to dense int codes in order of first appearance."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self, values: Optional[List[str]] = None):
+        self.values: List[str] = list(values or [])
+        self.codes: Dict[str, int] = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return TEXT_MISSING
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code_of(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+
+# -----------------------------------------------------------------------------
+# Ingest
+# -----------------------------------------------------------------------------
+
+def _column_name(key: str) -> str:
+    """File name for a value key: other characters become ``~XX`` per UTF-8 byte.
+
+    ``~`` is never kept as itself, so distinct keys get distinct names
+    (``a/b`` is ``a~2Fb``, ``a_b`` stays ``a_b``).
+    """
+    return re.sub(
+        r"[^0-9A-Za-z._-]",
+        lambda match: "".join(f"~{byte:02X}" for byte in match.group().encode("utf-8")),
+        key,
+    )
+
+
+def _save_column(store: Path, name: str, column: "np.ndarray", dictionary: Optional[StringDictionary] = None) -> None:
+    np.save(store / f"{name}.npy", column)
+    if dictionary is not None:
+        with (store / f"{name}.json").open("w", encoding="utf-8") as handle:
+            json.dump(dictionary.values, handle, ensure_ascii=False)
+
+
+class HeroStoreWriter:
+    """Accumulates heroes row by row in typed arrays, then writes the columns."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.values: Dict[str, List[Any]] = {}
+        self.names = StringDictionary()
+        self.sources = StringDictionary()
+        self.name_codes = array("i")
+        self.source_codes = array("i")
+        self.entry_dicts = {column: StringDictionary() for column in ENTRY_COLUMNS}
+        self.entry_hero = array("i")
+        self.entry_columns = {column: array("i") for column in ENTRY_COLUMNS}
+
+    def add(self, hero: Dict[str, Any], source: str) -> None:
+        row = self.rows
+        self.rows += 1
+        self.name_codes.append(self.names.encode((hero.get("hero") or {}).get("name")))
+        self.source_codes.append(self.sources.encode(source))
+        for item in hero.get("values") or []:
+            if not isinstance(item, dict) or not isinstance(item.get("key"), str):
+                continue
+            value = item.get("value")
+            if value is None:
+                value = item.get("text_value")
+            column = self.values.get(item["key"])
+            if column is None:
+                column = self.values[item["key"]] = []
+            # Columns grow lazily; heroes without the key get None. A key
+            # listed twice for one hero keeps its last value.
+            if len(column) > row:
+                column[row] = value
+                continue
+            if len(column) < row:
+                column.extend([None] * (row - len(column)))
+            column.append(value)
+        for entry in hero.get("entries") or []:
+            if not isinstance(entry, dict):
+                continue
+            self.entry_hero.append(row)
+            for column in ENTRY_COLUMNS:
+                value = entry.get(column)
+                self.entry_columns[column].append(self.entry_dicts[column].encode(None if value is None else str(value)))
+
+    def _value_column(self, values: List[Any]) -> Tuple[str, "np.ndarray", Optional[StringDictionary]]:
+        values = values + [None] * (self.rows - len(values))
+        present = [value for value in values if value is not None]
+        if all(isinstance(value, int) and not isinstance(value, bool) and INT_MISSING < value < 2 ** 31 for value in present):
+            return "int32", np.array([INT_MISSING if value is None else value for value in values], dtype=np.int32), None
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+            return "float64", np.array([np.nan if value is None else value for value in values], dtype=np.float64), None
+        dictionary = StringDictionary()
+        codes = [
+            dictionary.encode(None if value is None else value if isinstance(value, str) else json.dumps(value))
+            for value in values
+        ]
+        return "text", np.array(codes, dtype=np.int32), dictionary
+
+    def write(self, store: Path) -> Dict[str, Any]:
+        """Write the store folder, replacing any previous one as a whole.
+
+        Everything is written to a staging folder next to ``store`` first, so
+        a failed write leaves the previous store untouched.
+        """
+        staging = store.with_name(f".{store.name}.staging")
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            manifest = self._write_columns(staging)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        if store.exists():
+            previous = store.with_name(f".{store.name}.previous")
+            shutil.rmtree(previous, ignore_errors=True)
+            store.rename(previous)
+            staging.rename(store)
+            shutil.rmtree(previous)
+        else:
+            staging.rename(store)
+        return manifest
+
+    def _write_columns(self, store: Path) -> Dict[str, Any]:
+        for folder in ("values", "heroes", "entries"):
+            (store / folder).mkdir(parents=True)
+        manifest: Dict[str, Any] = {"heroes": self.rows, "entries": len(self.entry_hero), "values": {}}
+        # Case-insensitive file systems would still fold "Might" into "might"
+        names: Dict[str, str] = {}
+        for key in sorted(self.values):
+            kind, column, dictionary = self._value_column(self.values[key])
+            name = f"values/{_column_name(key)}"
+            if name.lower() in names:
+                raise ValueError(f"Value keys {names[name.lower()]!r} and {key!r} map to the same column file")
+            names[name.lower()] = key
+            _save_column(store, name, column, dictionary)
+            manifest["values"][key] = {"column": name, "type": kind}
+
+        _save_column(store, "heroes/name", np.frombuffer(self.name_codes, dtype=np.int32), self.names)
+        _save_column(store, "heroes/source", np.frombuffer(self.source_codes, dtype=np.int32), self.sources)
+        _save_column(store, "entries/hero", np.frombuffer(self.entry_hero, dtype=np.int32))
+        for column in ENTRY_COLUMNS:
+            _save_column(store, f"entries/{column}", np.frombuffer(self.entry_columns[column], dtype=np.int32), self.entry_dicts[column])
+
+        with (store / "manifest.json").open("w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2)
+        return manifest
+
+
+def iter_heroes(inputs: List[str]) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    for label, kind, payload in iter_tasks(inputs):
+        try:
+            if kind == "file":
+                with open(payload, "r", encoding="utf-8") as handle:
+                    hero = json.load(handle)
+            else:
+                hero = decode_hero_code(payload)
+        except (OSError, ValueError, EOFError) as exc:
+            print(f"⚠ Skipping {label}: {exc}", file=sys.stderr)
+            continue
+        if isinstance(hero, dict):
+            yield label, hero
+
+
+# -----------------------------------------------------------------------------
+# Queries
+# -----------------------------------------------------------------------------
+
+class HeroStore:
+    """Read side: columns are memory-mapped and dictionaries loaded on first use."""
+
+    def __init__(self, root: Path):
+        manifest_path = root / "manifest.json"
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No hero store in {root}; run 'hero_store.py ingest' first")
+        with manifest_path.open("r", encoding="utf-8") as handle:
+            self.manifest = json.load(handle)
+        self.root = root
+        self._columns: Dict[str, "np.ndarray"] = {}
+        self._dictionaries: Dict[str, StringDictionary] = {}
+
+    def column(self, name: str) -> "np.ndarray":
+        if name not in self._columns:
+            self._columns[name] = np.load(self.root / f"{name}.npy", mmap_mode="r")
+        return self._columns[name]
+
+    def dictionary(self, name: str) -> StringDictionary:
+        if name not in self._dictionaries:
+            with (self.root / f"{name}.json").open("r", encoding="utf-8") as handle:
+                self._dictionaries[name] = StringDictionary(json.load(handle))
+        return self._dictionaries[name]
+
+    def value(self, key: str) -> Tuple[str, "np.ndarray"]:
+        info = self.manifest["values"].get(key)
+        if info is None:
+            raise ValueError(f"Unknown value key {key!r}; known keys: {', '.join(sorted(self.manifest['values']))}")
+        return info["type"], self.column(info["column"])
+
+    def entries(self, column: str) -> "np.ndarray":
+        return self.column(f"entries/{column}")
+
+    def entry_code(self, column: str, value: str) -> int:
+        code = self.dictionary(f"entries/{column}").code_of(value)
+        return -2 if code is None else code
+
+    def hero_entry(self, entry_type: str) -> "np.ndarray":
+        """Per hero, the entry_id code of its first entry of ``entry_type`` (-1 if none)."""
+        mask = self.entries("entry_type") == self.entry_code("entry_type", entry_type)
+        result = np.full(self.manifest["heroes"], TEXT_MISSING, dtype=np.int32)
+        heroes = self.entries("hero")[mask]
+        ids = self.entries("entry_id")[mask]
+        # Index of each hero's first matching entry, so every target row is
+        # assigned exactly once
+        unique_heroes, first = np.unique(heroes, return_index=True)
+        result[unique_heroes] = ids[first]
+        return result
+
+    def entry_name(self, code: int) -> str:
+        return self.dictionary("entries/entry_id").values[code] if code >= 0 else "(none)"
+
+
+def _present_codes(codes: "np.ndarray") -> "np.ndarray":
+    """Distinct codes (including -1 for none) in ascending order.
+
+    Codes are dense, so a bincount is much cheaper than np.unique's general path.
+    """
+    return np.flatnonzero(np.bincount(codes + 1)) - 1
+
+
+def level_by_class(store: HeroStore) -> Tuple[List[str], List[int], "np.ndarray"]:
+    """Class names, levels and a (classes, levels) count matrix."""
+    classes = store.hero_entry("class")
+    _, levels = store.value("basics.level")
+    valid = levels != INT_MISSING
+    classes = classes[valid] + 1
+    levels = levels[valid]
+    if not levels.size:
+        return [], [], np.zeros((0, 0), dtype=np.int64)
+    low = int(levels.min())
+    width = int(levels.max()) - low + 1
+    counts = np.bincount(classes.astype(np.int64) * width + (levels - low), minlength=(int(classes.max()) + 1) * width)
+    counts = counts.reshape(-1, width)
+    rows = np.flatnonzero(counts.sum(axis=1))
+    columns = np.flatnonzero(counts.sum(axis=0))
+    return (
+        [store.entry_name(int(code) - 1) for code in rows],
+        [low + int(column) for column in columns],
+        counts[np.ix_(rows, columns)],
+    )
+
+
+def top_entries(store: HeroStore, entry_type: str, limit: int) -> List[Tuple[str, int, int]]:
+    """Most common entry ids of a type, with entry count and number of distinct heroes."""
+    mask = store.entries("entry_type") == store.entry_code("entry_type", entry_type)
+    ids = store.entries("entry_id")[mask]
+    if not ids.size:
+        return []
+    counts = np.bincount(ids)
+    # A hero can hold the same entry twice; count each hero once as well. Entries are
+    # stored hero by hero, so the pair keys are nearly sorted and a stable sort is cheap.
+    pairs = np.sort(store.entries("hero")[mask].astype(np.int64) * len(counts) + ids, kind="stable")
+    pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    heroes = np.bincount(pairs % len(counts), minlength=len(counts))
+    order = np.argsort(-counts, kind="stable")[:limit]
+    return [(store.entry_name(int(code)), int(counts[code]), int(heroes[code])) for code in order if counts[code]]
+
+
+def stats_by_class(store: HeroStore, key: str) -> List[Tuple[str, int, float, float, float]]:
+    kind, column = store.value(key)
+    if kind == "text":
+        raise ValueError(f"{key} is a text column")
+    values = np.asarray(column, dtype=np.float64)
+    valid = ~np.isnan(values) if kind == "float64" else np.asarray(column) != INT_MISSING
+    classes = store.hero_entry("class")
+    rows = []
+    for code in _present_codes(classes[valid]):
+        selected = values[valid & (classes == code)]
+        rows.append((store.entry_name(int(code)), int(selected.size), float(selected.mean()), float(selected.min()), float(selected.max())))
+    return rows
+
+
+# -----------------------------------------------------------------------------
+# CLI
+# -----------------------------------------------------------------------------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Columnar store and aggregate queries for hero exports.")
+    parser.add_argument("--store", type=Path, default=STORE_DIR, help="Store folder.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="Build the store from hero files and HERO: codes.")
+    ingest.add_argument("inputs", nargs="*", help="Hero JSON files, HERO: code files, folders or '-' (default: test heroes).")
+    ingest.add_argument("--replicate", type=int, default=1, help="Add every hero this many times (for load testing).")
+
+    sub.add_parser("levels", help="Level distribution by class.")
+
+    top = sub.add_parser("top", help="Most-picked entries of a type (kit, perk, title, ...).")
+    top.add_argument("entry_type")
+    top.add_argument("--limit", type=int, default=10)
+
+    stats = sub.add_parser("stats", help="Mean, min and max of a numeric value key by class.")
+    stats.add_argument("key")
+
+    sub.add_parser("info", help="Row counts and columns.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if np is None:
+        print(NUMPY_MISSING, file=sys.stderr)
+        sys.exit(2)
+
+    if args.command == "ingest":
+        started = time.perf_counter()
+        writer = HeroStoreWriter()
+        for label, hero in iter_heroes(args.inputs or [str(HEROES_DIR)]):
+            for copy in range(max(1, args.replicate)):
+                writer.add(hero, label if copy == 0 else f"{label}#{copy + 1}")
+        parsed = time.perf_counter()
+        manifest = writer.write(args.store)
+        size = sum(path.stat().st_size for path in args.store.rglob("*") if path.is_file())
+        print(
+            f"✓ {manifest['heroes']:,} heroes, {manifest['entries']:,} entries, {len(manifest['values'])} value columns "
+            f"into {args.store} ({size / 1024 / 1024:.1f} MiB); read {(parsed - started) * 1000:.0f} ms, "
+            f"write {(time.perf_counter() - parsed) * 1000:.0f} ms"
+        )
+        return
+
+    try:
+        started = time.perf_counter()
+        store = HeroStore(args.store)
+        opened = time.perf_counter()
+        if args.command == "levels":
+            names, levels, counts = level_by_class(store)
+            finished = time.perf_counter()
+            print(f"{'Class':<24}" + "".join(f"{level:>8}" for level in levels) + f"{'Total':>10}")
+            for name, row in zip(names, counts):
+                print(f"{name:<24}" + "".join(f"{int(count):>8,}" for count in row) + f"{int(row.sum()):>10,}")
+        elif args.command == "top":
+            rows = top_entries(store, args.entry_type, args.limit)
+            finished = time.perf_counter()
+            if not rows:
+                print(f"No entries of type {args.entry_type!r}")
+            for name, count, heroes in rows:
+                print(f"{name:<40} {count:>10,} picks {heroes:>10,} heroes")
+        elif args.command == "stats":
+            rows = stats_by_class(store, args.key)
+            finished = time.perf_counter()
+            print(f"{'Class':<24} {'Heroes':>10} {'Mean':>8} {'Min':>6} {'Max':>6}")
+            for name, count, mean, low, high in rows:
+                print(f"{name:<24} {count:>10,} {mean:>8.2f} {low:>6.0f} {high:>6.0f}")
+        else:
+            finished = time.perf_counter()
+            manifest = store.manifest
+            print(f"{manifest['heroes']:,} heroes, {manifest['entries']:,} entries")
+            for key, info in sorted(manifest["values"].items()):
+                print(f"  {key:<28} {info['type']}")
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"✗ {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"\nopen {(opened - started) * 1000:.1f} ms, query {(finished - opened) * 1000:.1f} ms "
+        f"over {store.manifest['heroes']:,} heroes",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Incremental reading and writing of large top-level JSON arrays.
+
+The aggregated ability and feature files are single JSON arrays. Loading them
+with ``json.load`` keeps the whole corpus in memory before the first record can
+be looked at. ``iter_json_array`` instead decodes one element at a time from a
+bounded buffer, and ``JsonArrayWriter`` writes elements as they are produced,
+byte-for-byte identical to ``json.dump(items, handle, indent=2)``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, Optional, TextIO, Union
+
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayError(ValueError):
+    """Raised when the streamed document is not a well-formed top-level array."""
+
+
+def iter_json_array(source: Union[str, Path, TextIO], chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one by one.
+
+    ``source`` may be a path or an open text handle. Only the element being
+    decoded (plus at most one read chunk) is held in memory.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "r", encoding="utf-8") as handle:
+            yield from iter_json_array(handle, chunk_size)
+        return
+
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = source.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_token() -> Optional[str]:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return None
+
+    if next_token() != "[":
+        raise JsonArrayError("expected a top-level JSON array")
+    pos += 1
+
+    if next_token() == "]":
+        pos += 1
+    else:
+        while True:
+            if next_token() is None:
+                raise JsonArrayError("unexpected end of input inside array")
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if fill():
+                        continue
+                    raise
+                # A value that runs to the end of the buffer (e.g. a number)
+                # may continue in the next chunk, so decode it again with more input.
+                if end == len(buffer) and fill():
+                    continue
+                break
+            pos = end
+            yield value
+
+            token = next_token()
+            if token == ",":
+                pos += 1
+            elif token == "]":
+                pos += 1
+                break
+            else:
+                raise JsonArrayError(f"expected ',' or ']' but found {token!r}")
+
+    if next_token() is not None:
+        raise JsonArrayError("unexpected data after the top-level array")
+
+
+class JsonArrayWriter:
+    """Write a top-level JSON array one element at a time.
+
+    When given a path the output goes to a temporary file in the same directory
+    and replaces the target only when the writer is closed without an error, so
+    a file can be rewritten while it is being streamed from.
+    """
+
+    def __init__(self, target: Union[str, Path, TextIO], indent: Optional[int] = 2, ensure_ascii: bool = False):
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.count = 0
+        self._finished = False
+        self._target_path: Optional[Path] = None
+        self._temp_path: Optional[Path] = None
+
+        if isinstance(target, (str, Path)):
+            self._target_path = Path(target)
+            fd, temp_name = tempfile.mkstemp(
+                prefix=f".{self._target_path.name}.", suffix=".tmp", dir=self._target_path.parent
+            )
+            self._temp_path = Path(temp_name)
+            self._handle: TextIO = os.fdopen(fd, "w", encoding="utf-8")
+        else:
+            self._handle = target
+
+        self._handle.write("[")
+
+    def write(self, item: Any) -> None:
+        if self.indent is None:
+            separator = ", " if self.count else ""
+            self._handle.write(separator + json.dumps(item, ensure_ascii=self.ensure_ascii))
+        else:
+            separator = "," if self.count else ""
+            pad = " " * self.indent
+            text = json.dumps(item, indent=self.indent, ensure_ascii=self.ensure_ascii)
+            self._handle.write(separator + "\n" + pad + text.replace("\n", "\n" + pad))
+        self.count += 1
+
+    def close(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        if self.count and self.indent is not None:
+            self._handle.write("\n")
+        self._handle.write("]")
+        if self._temp_path is not None:
+            self._handle.close()
+            if self._target_path.exists():
+                os.chmod(self._temp_path, self._target_path.stat().st_mode & 0o777)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(self._temp_path, 0o666 & ~umask)
+            os.replace(self._temp_path, self._target_path)
+
+    def abort(self) -> None:
+        """Discard a path-backed output without touching the target file."""
+        if self._finished:
+            return
+        self._finished = True
+        if self._temp_path is not None:
+            self._handle.close()
+            self._temp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "JsonArrayWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Migrate exported heroes to the current ``format_version``.
+
+Each format change registers a function that turns a hero of version N into
+version N + 1 by editing its ``values`` and ``entries``:
+
+    @migration(4)
+    def _v4_rename_wealth(hero):
+        rename_value_key(hero, "score.wealth", "score.treasure")
+        rename_entries(hero, "perk", {"old_perk_id": "new_perk_id"})
+        return hero
+
+Registering the migration from ``FORMAT_VERSION`` is what bumps the format;
+heroes are then walked through every step from their own version to the
+target. Hero JSON files are rewritten; ``HERO:`` code files (like
+test_heroes/import_codes/*.txt) keep their comment lines and get each code
+re-encoded with generate_hero_code. Heroes that are already current are left
+byte-for-byte untouched.
+
+Files are migrated in parallel worker processes, streamed to the pool
+through a bounded window, and code files are processed line by line, so
+memory stays flat however large the archive is. Output is written next to a
+temporary file and moved into place, so an interrupted run never leaves a
+half-written hero.
+
+Usage:
+    python migrate_heroes.py exports/ --dry-run            # what would change
+    python migrate_heroes.py exports/ --output migrated/ -j 8
+    python migrate_heroes.py exports/ --in-place
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from validate_heroes import CODE_PREFIX, HEROES_DIR, decode_hero_code
+
+sys.path.insert(0, str(HEROES_DIR))
+from generate_import_codes import generate_hero_code  # noqa: E402
+
+
+# Version written by the current exporter; the first version migrations start from
+FORMAT_VERSION = 4
+
+Hero = Dict[str, Any]
+Migration = Callable[[Hero], Hero]
+# (label, hero name, from version, status, message); status is current, migrated or failed
+Outcome = Tuple[str, str, Optional[int], str, str]
+Task = Tuple[str, Optional[str], int, bool]
+
+MIGRATIONS: Dict[int, Migration] = {}
+
+
+def migration(from_version: int) -> Callable[[Migration], Migration]:
+    """Register ``function`` as the vN -> vN+1 migration for ``from_version``."""
+
+    def register(function: Migration) -> Migration:
+        if from_version in MIGRATIONS:
+            raise ValueError(f"Migration from v{from_version} is already registered ({MIGRATIONS[from_version].__name__})")
+        MIGRATIONS[from_version] = function
+        return function
+
+    return register
+
+
+def current_version() -> int:
+    """FORMAT_VERSION plus one for every registered migration at or above it."""
+    version = FORMAT_VERSION
+    while version in MIGRATIONS:
+        version += 1
+    return version
+
+
+# -----------------------------------------------------------------------------
+# Helpers for writing migrations
+# -----------------------------------------------------------------------------
+
+def rename_value_key(hero: Hero, old: str, new: str) -> int:
+    """Rename a ``values`` key; returns the number of values changed."""
+    changed = 0
+    for item in hero.get("values") or []:
+        if isinstance(item, dict) and item.get("key") == old:
+            item["key"] = new
+            changed += 1
+    return changed
+
+
+def rename_entries(hero: Hero, entry_type: Optional[str], ids: Dict[str, str], new_type: Optional[str] = None) -> int:
+    """Map ``entry_id`` (and optionally ``entry_type``) of matching entries; ``None`` matches any type."""
+    changed = 0
+    for entry in hero.get("entries") or []:
+        if not isinstance(entry, dict) or (entry_type is not None and entry.get("entry_type") != entry_type):
+            continue
+        if entry.get("entry_id") in ids:
+            entry["entry_id"] = ids[entry["entry_id"]]
+            changed += 1
+        if new_type is not None and entry.get("entry_type") != new_type:
+            entry["entry_type"] = new_type
+            changed += 1
+    return changed
+
+
+# -----------------------------------------------------------------------------
+# Engine
+# -----------------------------------------------------------------------------
+
+def migrate_hero(hero: Hero, target: int) -> Tuple[Hero, Optional[int]]:
+    """Walk ``hero`` up to ``target``; returns the hero and its original version."""
+    version = hero.get("format_version")
+    if not isinstance(version, int):
+        raise ValueError("no integer format_version")
+    if version > target:
+        raise ValueError(f"format_version {version} is newer than the target v{target}")
+    original = version
+    while version < target:
+        step = MIGRATIONS.get(version)
+        if step is None:
+            raise ValueError(f"no migration registered from v{version}")
+        hero = step(hero)
+        version += 1
+        hero["format_version"] = version
+    return hero, original
+
+
+def _replace_atomically(temp: Path, destination: Path) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp, destination)
+
+
+def _migrate_json(source: Path, destination: Optional[Path], target: int, dry_run: bool) -> List[Outcome]:
+    label = str(source)
+    try:
+        with source.open("r", encoding="utf-8") as handle:
+            hero = json.load(handle)
+        if not isinstance(hero, dict):
+            raise ValueError("hero export is not a JSON object")
+        name = (hero.get("hero") or {}).get("name") or ""
+        hero, original = migrate_hero(hero, target)
+    except Exception as exc:  # a broken export or migration fails this hero only
+        return [(label, "", None, "failed", f"{type(exc).__name__}: {exc}")]
+
+    status = "current" if original == target else "migrated"
+    if not dry_run and destination is not None:
+        temp = destination.with_name(destination.name + ".tmp")
+        try:
+            if status == "current":
+                if destination.resolve() != source.resolve():
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    destination.write_bytes(source.read_bytes())
+            else:
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                with temp.open("w", encoding="utf-8") as handle:
+                    json.dump(hero, handle, indent=2, ensure_ascii=False)
+                    handle.write("\n")
+                _replace_atomically(temp, destination)
+        except OSError as exc:
+            return [(label, name, original, "failed", str(exc))]
+        finally:
+            temp.unlink(missing_ok=True)
+    return [(label, name, original, status, "")]
+
+
+def _migrate_codes(source: Path, destination: Optional[Path], target: int, dry_run: bool) -> List[Outcome]:
+    outcomes: List[Outcome] = []
+    write = not dry_run and destination is not None
+    temp = destination.with_name(destination.name + ".tmp") if write else None
+    try:
+        out = None
+        if write:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            out = temp.open("w", encoding="utf-8", newline="")
+        try:
+            with source.open("r", encoding="utf-8", newline="") as handle:
+                for number, line in enumerate(handle, start=1):
+                    stripped = line.strip()
+                    if stripped.startswith(CODE_PREFIX):
+                        label = f"{source}:{number}"
+                        try:
+                            hero = decode_hero_code(stripped)
+                            if not isinstance(hero, dict):
+                                raise ValueError("hero export is not a JSON object")
+                            name = (hero.get("hero") or {}).get("name") or ""
+                            hero, original = migrate_hero(hero, target)
+                        except Exception as exc:  # a broken code or migration fails this hero only
+                            outcomes.append((label, "", None, "failed", f"{type(exc).__name__}: {exc}"))
+                        else:
+                            if original != target:
+                                ending = line[len(line.rstrip("\r\n")):]
+                                line = line[: len(line) - len(line.lstrip())] + generate_hero_code(hero) + ending
+                                outcomes.append((label, name, original, "migrated", ""))
+                            else:
+                                outcomes.append((label, name, original, "current", ""))
+                    if out is not None:
+                        out.write(line)
+        finally:
+            if out is not None:
+                out.close()
+        # Failed codes are copied through unchanged, so the file is always complete
+        if write and (
+            any(status == "migrated" for _, _, _, status, _ in outcomes) or destination.resolve() != source.resolve()
+        ):
+            _replace_atomically(temp, destination)
+    except (OSError, UnicodeDecodeError) as exc:
+        # The file could not be read or written in full; leave the destination alone
+        outcomes.append((str(source), "", None, "failed", str(exc)))
+    finally:
+        if temp is not None:
+            temp.unlink(missing_ok=True)
+    return outcomes
+
+
+def migrate_file(task: Task) -> List[Outcome]:
+    """Migrate one ``(source, destination, target, dry_run)`` file in a worker."""
+    source, destination, target, dry_run = task
+    source_path = Path(source)
+    destination_path = Path(destination) if destination else None
+    if source_path.suffix == ".txt":
+        return _migrate_codes(source_path, destination_path, target, dry_run)
+    return _migrate_json(source_path, destination_path, target, dry_run)
+
+
+def migrate_batch(tasks: List[Task]) -> List[Outcome]:
+    return [outcome for task in tasks for outcome in migrate_file(task)]
+
+
+def iter_file_tasks(inputs: List[Path], output: Optional[Path], target: int, dry_run: bool) -> Iterator[Task]:
+    """One task per hero file; with ``output`` each input's tree is mirrored below it."""
+    for item in inputs:
+        if item.is_dir():
+            root = item
+            files = sorted(p for p in item.rglob("*") if p.suffix in (".json", ".txt") and p.is_file())
+        else:
+            root = item.parent
+            files = [item]
+        for file in files:
+            if output is None:
+                destination = file
+            else:
+                destination = output / file.relative_to(root)
+            yield str(file), str(destination), target, dry_run
+
+
+def _batches(tasks: Iterator[Task], size: int) -> Iterator[List[Task]]:
+    batch: List[Task] = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run(tasks: Iterator[Task], jobs: int, batch_size: int = 16) -> Iterator[Outcome]:
+    if jobs <= 1:
+        for task in tasks:
+            yield from migrate_file(task)
+        return
+
+    # Only a few batches per worker are in flight, so files are listed and
+    # read as results come back rather than all up front.
+    window = jobs * 4
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: Set[Future] = set()
+        for batch in _batches(tasks, batch_size):
+            pending.add(executor.submit(migrate_batch, batch))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in pending:
+            yield from future.result()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Migrate hero exports and HERO: codes to the current format_version.")
+    parser.add_argument("inputs", nargs="*", type=Path, help="Hero JSON files, HERO: code files or folders (default: test heroes).")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--output", type=Path, help="Write migrated copies here, mirroring each input folder.")
+    target.add_argument("--in-place", action="store_true", help="Rewrite the inputs.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be migrated.")
+    parser.add_argument("--to", type=int, default=None, help="Target format_version (default: current).")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--batch-size", type=int, default=16, help="Files sent to a worker at a time.")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print the summary.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    target = current_version() if args.to is None else args.to
+    if not args.dry_run and args.output is None and not args.in_place:
+        print("Pass --output DIR, --in-place or --dry-run", file=sys.stderr)
+        sys.exit(2)
+    inputs = args.inputs or [HEROES_DIR]
+    output = None if args.in_place else args.output
+
+    started = time.perf_counter()
+    steps: Dict[Tuple[int, int], int] = {}
+    counts = {"current": 0, "migrated": 0, "failed": 0}
+    for label, name, original, status, message in run(iter_file_tasks(inputs, output, target, args.dry_run), args.jobs, args.batch_size):
+        counts[status] += 1
+        if status == "migrated":
+            steps[(original, target)] = steps.get((original, target), 0) + 1
+            if not args.quiet:
+                print(f"✓ {label}" + (f" ({name})" if name else "") + f": v{original} -> v{target}")
+        elif status == "failed":
+            print(f"✗ {label}: {message}")
+    elapsed = time.perf_counter() - started
+
+    heroes = sum(counts.values())
+    rate = heroes / elapsed if elapsed else 0.0
+    verb = "would be migrated" if args.dry_run else "migrated"
+    print(
+        f"\n{heroes} hero(es): {counts['migrated']} {verb}, {counts['current']} already v{target}, "
+        f"{counts['failed']} failed; {elapsed * 1000:.0f} ms ({rate:,.0f} heroes/s, {args.jobs} job(s))"
+    )
+    for (original, final), count in sorted(steps.items()):
+        path = " -> ".join(f"v{version}" for version in range(original, final + 1))
+        print(f"  {path}: {count}")
+    if not MIGRATIONS:
+        print(f"⚠ No migrations registered; v{FORMAT_VERSION} is the only supported format")
+    if counts["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate abilities, features and options across the data files.
+
+Every named record is turned into a set of word shingles (runs of three
+words from its name and text fields). Records whose shingle sets have a high
+Jaccard similarity are near duplicates: copies with a changed cost, reworded
+effects, kit abilities pasted into class files and so on.
+
+Comparing every pair is quadratic, so each record gets a MinHash signature:
+for each of ``SIGNATURE_SIZE`` hash functions, the minimum hash over its
+shingles. Two signatures agree in a position with probability equal to the
+Jaccard similarity. The hash functions are the 64-bit words of one
+SHAKE-128 digest per shingle, so a signature is an element-wise minimum
+that runs in C. Signatures are cut into bands, and only records that share a
+whole band land in the same bucket and become candidates. Candidates are then
+scored exactly on their shingle sets. With the default 20 bands of 5 rows a
+pair at similarity 0.8 is found with probability 0.9996, while dissimilar
+pairs are almost never compared.
+
+A record is any JSON object with a ``name`` that sits in a list, at any depth
+(top-level abilities, feature options, title benefits, class level features).
+Nested named records are left out of their parent's text so that a feature
+and its options are not reported as duplicates of each other.
+
+Usage:
+    python near_duplicates.py                          # app data and data_unused
+    python near_duplicates.py ../../hero_smith/data --threshold 0.9
+    python near_duplicates.py --exact                  # also run the quadratic scan and report recall
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import struct
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, List, Set, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_INPUTS = [
+    REPO_ROOT / "hero_smith" / "data",
+    REPO_ROOT / "old code" / "data_unused" / "abilities.json",
+    REPO_ROOT / "old code" / "data_unused" / "kit_abilities.json",
+    REPO_ROOT / "old code" / "data_unused" / "class_abilities",
+]
+# Fields that identify a record rather than describe it
+SKIP_KEYS = {"id", "type", "componentId", "classId", "abilityId", "featureId", "entry_id", "metadata"}
+
+SHINGLE_WORDS = 3
+SIGNATURE_SIZE = 100
+BANDS = 20
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(slots=True)
+class Record:
+    label: str
+    name: str
+    shingles: FrozenSet[str]
+
+
+# -----------------------------------------------------------------------------
+# Records and shingles
+# -----------------------------------------------------------------------------
+
+def _is_record_list(value: Any) -> bool:
+    return isinstance(value, list) and any(isinstance(item, dict) and isinstance(item.get("name"), str) for item in value)
+
+
+def _record_text(record: Dict[str, Any], out: List[str]) -> None:
+    for key, value in record.items():
+        if key in SKIP_KEYS or _is_record_list(value):
+            continue
+        if isinstance(value, str):
+            out.append(value)
+        elif isinstance(value, dict):
+            _record_text(value, out)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, str):
+                    out.append(item)
+                elif isinstance(item, dict):
+                    _record_text(item, out)
+
+
+def iter_records(node: Any, label: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Named records in ``node`` with a readable label for each."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from iter_records(value, f"{label}.{key}" if label else key)
+    elif isinstance(node, list):
+        for position, item in enumerate(node):
+            if isinstance(item, dict) and isinstance(item.get("name"), str):
+                key = item.get("id") or item["name"]
+                item_label = f"{label}[{key}]" if label else f"[{key}]"
+                yield item_label, item
+                for field, value in item.items():
+                    if field not in SKIP_KEYS:
+                        yield from iter_records(value, f"{item_label}.{field}")
+            else:
+                yield from iter_records(item, f"{label}[{position}]" if label else f"[{position}]")
+
+
+def shingles_of(text: str) -> FrozenSet[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return frozenset([" ".join(words)] if words else [])
+    return frozenset(" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1))
+
+
+def _input_files(inputs: List[Path]) -> List[Path]:
+    files: List[Path] = []
+    for path in inputs:
+        files.extend(sorted(path.rglob("*.json")) if path.is_dir() else [path])
+    return files
+
+
+def load_records(inputs: List[Path], min_words: int) -> Tuple[List[Record], int]:
+    """Records with at least ``min_words`` words of text; also returns how many were too short."""
+    records: List[Record] = []
+    short = 0
+    for path in _input_files(inputs):
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        try:
+            source = path.resolve().relative_to(REPO_ROOT).as_posix()
+        except ValueError:
+            source = str(path)
+        for label, item in iter_records(data, ""):
+            parts: List[str] = []
+            _record_text(item, parts)
+            text = " ".join(parts)
+            if len(_WORD.findall(text)) < min_words:
+                short += 1
+                continue
+            records.append(Record(f"{source}:{label}", item["name"], shingles_of(text)))
+    return records, short
+
+
+# -----------------------------------------------------------------------------
+# MinHash and LSH
+# -----------------------------------------------------------------------------
+
+def signature(shingles: FrozenSet[str], size: int = SIGNATURE_SIZE) -> Tuple[int, ...]:
+    unpack = struct.Struct(f"<{size}Q").unpack
+    # Hash function k of a shingle is the k-th word of its digest; stable across runs, unlike hash()
+    hashes = [unpack(hashlib.shake_128(gram.encode("utf-8")).digest(8 * size)) for gram in shingles]
+    return tuple(map(min, zip(*hashes)))
+
+
+def lsh_candidates(signatures: List[Tuple[int, ...]], bands: int) -> Set[Tuple[int, int]]:
+    rows = len(signatures[0]) // bands if signatures else 0
+    candidates: Set[Tuple[int, int]] = set()
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], List[int]] = defaultdict(list)
+        start = band * rows
+        for index, sig in enumerate(signatures):
+            buckets[sig[start:start + rows]].append(index)
+        for members in buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+    return candidates
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def estimated_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def near_duplicates(
+    records: List[Record],
+    threshold: float,
+    bands: int = BANDS,
+    signature_size: int = SIGNATURE_SIZE,
+) -> Tuple[List[Tuple[float, float, int, int]], Dict[str, float]]:
+    """Pairs ``(jaccard, minhash estimate, i, j)`` at or above ``threshold`` and stage timings."""
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    signatures = [signature(record.shingles, signature_size) for record in records]
+    timings["minhash"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    candidates = lsh_candidates(signatures, bands)
+    timings["lsh"] = time.perf_counter() - started
+    timings["candidates"] = len(candidates)
+
+    started = time.perf_counter()
+    pairs = []
+    for i, j in candidates:
+        score = jaccard(records[i].shingles, records[j].shingles)
+        if score >= threshold:
+            pairs.append((score, estimated_similarity(signatures[i], signatures[j]), i, j))
+    pairs.sort(key=lambda pair: (-pair[0], records[pair[2]].label, records[pair[3]].label))
+    timings["score"] = time.perf_counter() - started
+    return pairs, timings
+
+
+def exact_pairs(records: List[Record], threshold: float) -> Set[Tuple[int, int]]:
+    """The quadratic scan LSH replaces; only for measuring recall."""
+    found = set()
+    for i in range(len(records)):
+        for j in range(i + 1, len(records)):
+            if jaccard(records[i].shingles, records[j].shingles) >= threshold:
+                found.add((i, j))
+    return found
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Find near-duplicate records with MinHash and LSH.")
+    parser.add_argument("inputs", nargs="*", type=Path, help="JSON files or folders (default: app data and data_unused).")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Minimum Jaccard similarity to report.")
+    parser.add_argument("--bands", type=int, default=BANDS, help="LSH bands; more bands find less similar pairs.")
+    parser.add_argument("--signature-size", type=int, default=SIGNATURE_SIZE, help="MinHash functions per record.")
+    parser.add_argument("--min-words", type=int, default=8, help="Skip records with less text than this.")
+    parser.add_argument("--cross-file", action="store_true", help="Only report pairs from different files.")
+    parser.add_argument("--limit", type=int, default=50, help="Pairs to print (0 for all).")
+    parser.add_argument("--json", action="store_true", help="Print the pairs as JSON.")
+    parser.add_argument("--exact", action="store_true", help="Also run the quadratic comparison and report recall.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.signature_size % args.bands:
+        print("--signature-size must be a multiple of --bands", file=sys.stderr)
+        sys.exit(2)
+
+    started = time.perf_counter()
+    records, short = load_records(args.inputs or DEFAULT_INPUTS, args.min_words)
+    load_seconds = time.perf_counter() - started
+    pairs, timings = near_duplicates(records, args.threshold, args.bands, args.signature_size)
+
+    def source(index: int) -> str:
+        return records[index].label.split(":", 1)[0]
+
+    if args.cross_file:
+        pairs = [pair for pair in pairs if source(pair[2]) != source(pair[3])]
+
+    if args.json:
+        print(json.dumps([
+            {
+                "similarity": round(score, 4),
+                "estimate": round(estimate, 4),
+                "first": records[i].label,
+                "second": records[j].label,
+            }
+            for score, estimate, i, j in pairs
+        ], indent=2, ensure_ascii=False))
+    else:
+        shown = pairs if args.limit <= 0 else pairs[: args.limit]
+        for score, estimate, i, j in shown:
+            print(f"{score:.3f} (est {estimate:.2f})  {records[i].name}")
+            print(f"      {records[i].label}\n      {records[j].label}")
+        if len(shown) < len(pairs):
+            print(f"... {len(pairs) - len(shown)} more pair(s), use --limit 0 to show all")
+
+    total_pairs = len(records) * (len(records) - 1) // 2
+    summary = (
+        f"\n{len(records)} records ({short} too short), {total_pairs:,} possible pairs, "
+        f"{int(timings['candidates']):,} LSH candidates, {len(pairs)} pair(s) >= {args.threshold}\n"
+        f"load {load_seconds * 1000:.0f} ms, minhash {timings['minhash'] * 1000:.0f} ms, "
+        f"lsh {timings['lsh'] * 1000:.0f} ms, scoring {timings['score'] * 1000:.0f} ms"
+    )
+    print(summary, file=sys.stderr if args.json else sys.stdout)
+
+    if args.exact:
+        started = time.perf_counter()
+        expected = exact_pairs(records, args.threshold)
+        if args.cross_file:
+            expected = {(i, j) for i, j in expected if source(i) != source(j)}
+        exact_seconds = time.perf_counter() - started
+        found = {(i, j) for _, _, i, j in pairs}
+        recall = len(found & expected) / len(expected) if expected else 1.0
+        print(
+            f"Quadratic scan: {len(expected)} pair(s) in {exact_seconds * 1000:.0f} ms; LSH recall {recall:.1%}",
+            file=sys.stderr if args.json else sys.stdout,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+End-to-end performance harness for the data pipeline at growing content sizes.
+
+A scaled copy of the inputs is synthesized in a temporary folder for each
+scale: every compendium ability file, class feature and test hero appears
+``scale`` times. Each pipeline stage then runs as its own process against that
+copy, the way build.py runs it:
+
+    convert          extract_class_abilities.py (convert_files)
+    simplify         generate_simplified_abilities.py
+    add_subclass     add_subclass_to_abilities.py
+    check_features   check_feature_option_duplicates.py
+    check_conduit    check_conduit_option_duplicates.py
+    import_codes     generate_import_codes.py
+
+Wall time, peak RSS (from wait4) and input files per second are recorded per
+stage and compared with perf_baseline.json. A stage fails when it is slower
+or uses more memory than the baseline by more than the configured percentage
+and floor. The scaling column is the exponent of time against content size
+between two scales: 1.0 is linear, and a stage well above that is a cliff
+that a bigger expansion will hit first.
+
+Usage:
+    python perf_harness.py                                 # 1x, 10x and 100x against the baseline
+    python perf_harness.py --scales 1 10 --repeats 3       # quicker run, best of three
+    python perf_harness.py --update-baseline --repeats 3   # record this machine's numbers
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+OLD_CODE_DIR = SCRIPTS_DIR.parent
+REPO_ROOT = OLD_CODE_DIR.parent
+COMPENDIUM_DIR = OLD_CODE_DIR / "data_unused" / "compendium" / "Abilities"
+FEATURES_DIR = REPO_ROOT / "hero_smith" / "data" / "features" / "class_features"
+HEROES_DIR = OLD_CODE_DIR / "test_heroes"
+BASELINE_FILE = SCRIPTS_DIR / "perf_baseline.json"
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_THRESHOLDS = {
+    "max_slowdown_pct": 50.0,
+    "slowdown_floor_ms": 150.0,
+    "max_rss_growth_pct": 25.0,
+    "rss_floor_kb": 8192,
+}
+# Time growing faster than this power of the content size is flagged
+CLIFF_EXPONENT = 1.2
+
+
+@dataclass
+class Stage:
+    name: str
+    command: Callable[[Path], List[str]]
+    inputs: str  # key into the counts returned by synthesize()
+
+
+STAGES: List[Stage] = [
+    Stage(
+        "convert",
+        lambda work: [
+            str(SCRIPTS_DIR / "extract_class_abilities.py"),
+            "--source-dir", str(work / "compendium"),
+            "--target-dir", str(work / "class_abilities_new"),
+        ],
+        "ability_files",
+    ),
+    Stage(
+        "simplify",
+        lambda work: [
+            str(SCRIPTS_DIR / "generate_simplified_abilities.py"),
+            "--compendium-dir", str(work / "compendium"),
+            "--output-dir", str(work / "simplified"),
+        ],
+        "ability_files",
+    ),
+    Stage(
+        "add_subclass",
+        lambda work: [str(SCRIPTS_DIR / "add_subclass_to_abilities.py"), "--abilities-dir", str(work / "simplified")],
+        "class_files",
+    ),
+    Stage(
+        "check_features",
+        lambda work: [str(SCRIPTS_DIR / "check_feature_option_duplicates.py"), str(work / "class_features")],
+        "feature_files",
+    ),
+    Stage(
+        "check_conduit",
+        lambda work: [
+            str(SCRIPTS_DIR / "check_conduit_option_duplicates.py"),
+            str(work / "class_features" / "conduit_features.json"),
+        ],
+        "conduit_files",
+    ),
+    Stage(
+        "import_codes",
+        lambda work: [
+            str(HEROES_DIR / "generate_import_codes.py"),
+            "--heroes-dir", str(work / "heroes"),
+            "--output-dir", str(work / "import_codes"),
+        ],
+        "hero_files",
+    ),
+]
+
+
+# -----------------------------------------------------------------------------
+# Synthetic corpus
+# -----------------------------------------------------------------------------
+
+def synthesize(work: Path, scale: int) -> Dict[str, int]:
+    """Write a copy of the inputs with every record ``scale`` times into ``work``; returns input counts."""
+    counts = {"ability_files": 0, "class_files": 0, "features": 0, "feature_files": 0, "conduit_files": 1, "hero_files": 0}
+    # generate_simplified_abilities writes one file per class folder
+    counts["class_files"] = sum(1 for path in COMPENDIUM_DIR.iterdir() if path.is_dir())
+
+    # Ability files are copied verbatim under new file names, so every copy
+    # costs the stages exactly as much as the original
+    for source in sorted(COMPENDIUM_DIR.rglob("*.json")):
+        folder = work / "compendium" / source.parent.relative_to(COMPENDIUM_DIR)
+        folder.mkdir(parents=True, exist_ok=True)
+        for copy in range(scale):
+            name = source.name if copy == 0 else f"{source.stem} {copy + 1}{source.suffix}"
+            shutil.copyfile(source, folder / name)
+            counts["ability_files"] += 1
+
+    features_out = work / "class_features"
+    features_out.mkdir(parents=True, exist_ok=True)
+    for source in sorted(FEATURES_DIR.glob("*_features.json")):
+        with source.open("r", encoding="utf-8") as handle:
+            entries = json.load(handle)
+        scaled = []
+        for copy in range(scale):
+            for entry in entries:
+                if copy and isinstance(entry, dict) and entry.get("id"):
+                    entry = {**entry, "id": f"{entry['id']}_{copy + 1}"}
+                scaled.append(entry)
+        with (features_out / source.name).open("w", encoding="utf-8") as handle:
+            json.dump(scaled, handle, indent=2, ensure_ascii=False)
+        counts["features"] += len(scaled)
+        counts["feature_files"] += 1
+
+    heroes_out = work / "heroes"
+    heroes_out.mkdir(parents=True, exist_ok=True)
+    for source in sorted(HEROES_DIR.glob("hero_*.json")):
+        for copy in range(scale):
+            name = source.name if copy == 0 else f"{source.stem}_{copy + 1}{source.suffix}"
+            shutil.copyfile(source, heroes_out / name)
+            counts["hero_files"] += 1
+    return counts
+
+
+# -----------------------------------------------------------------------------
+# Running stages
+# -----------------------------------------------------------------------------
+
+def run_stage(stage: Stage, work: Path, counts: Dict[str, int]) -> Dict[str, Any]:
+    log_path = work / f"{stage.name}.log"
+    with log_path.open("wb") as log:
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable, *stage.command(work)], cwd=work, stdout=log, stderr=subprocess.STDOUT)
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            peak_rss_kb: Optional[int] = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        else:
+            process.wait()
+            peak_rss_kb = None
+        wall = time.perf_counter() - started
+    files = counts[stage.inputs]
+    result: Dict[str, Any] = {
+        "wall_s": round(wall, 4),
+        "peak_rss_kb": peak_rss_kb,
+        "files": files,
+        "files_per_s": round(files / wall, 1) if wall else 0.0,
+    }
+    if process.returncode != 0:
+        tail = log_path.read_text(encoding="utf-8", errors="replace").strip().splitlines()[-5:]
+        result["error"] = f"exit code {process.returncode}: " + " | ".join(tail)
+    return result
+
+
+def run_scale(scale: int, root: Path, repeats: int = 1) -> Dict[str, Dict[str, Any]]:
+    work = root / f"x{scale}"
+    started = time.perf_counter()
+    # A child's peak RSS starts from this process's peak when it is started,
+    # so synthesizing (and counting) the inputs happens in a worker to keep
+    # this process small and the per-stage figures honest
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        counts = executor.submit(synthesize, work, scale).result()
+    print(
+        f"\n{scale}x: {counts['ability_files']:,} ability files, {counts['features']:,} features, "
+        f"{counts['hero_files']:,} heroes (synthesized in {time.perf_counter() - started:.1f} s)"
+    )
+    results = {}
+    for stage in STAGES:
+        # Stages overwrite their outputs, so repeats run on the same tree; the fastest run is kept
+        runs = [run_stage(stage, work, counts) for _ in range(max(1, repeats))]
+        failed = [run for run in runs if "error" in run]
+        results[stage.name] = failed[0] if failed else min(runs, key=lambda run: run["wall_s"])
+    return results
+
+
+# -----------------------------------------------------------------------------
+# Baseline
+# -----------------------------------------------------------------------------
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {"thresholds": dict(DEFAULT_THRESHOLDS), "results": {}}
+    with path.open("r", encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    thresholds.update(baseline.get("thresholds", {}))
+    baseline["thresholds"] = thresholds
+    baseline.setdefault("results", {})
+    return baseline
+
+
+def save_baseline(path: Path, baseline: Dict[str, Any], results: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+    stored = dict(baseline.get("results", {}))
+    stored.update(results)
+    payload = {
+        "thresholds": baseline["thresholds"],
+        "machine": f"{platform.system()} {platform.machine()}, Python {platform.python_version()}, {os.cpu_count()} CPU(s)",
+        "results": {scale: stored[scale] for scale in sorted(stored, key=int)},
+    }
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+
+
+def compare(
+    scale: str,
+    stage: str,
+    current: Dict[str, Any],
+    previous: Optional[Dict[str, Any]],
+    thresholds: Dict[str, Any],
+) -> List[str]:
+    if "error" in current:
+        return [f"{scale}x {stage} failed: {current['error']}"]
+    if not previous:
+        return []
+    problems = []
+    wall, old_wall = current["wall_s"] * 1000, previous["wall_s"] * 1000
+    if wall - old_wall > thresholds["slowdown_floor_ms"] and wall > old_wall * (1 + thresholds["max_slowdown_pct"] / 100):
+        problems.append(f"{scale}x {stage}: {wall:.0f} ms vs baseline {old_wall:.0f} ms (+{(wall / old_wall - 1) * 100:.0f}%)")
+    rss, old_rss = current.get("peak_rss_kb"), previous.get("peak_rss_kb")
+    if rss and old_rss and rss - old_rss > thresholds["rss_floor_kb"] and rss > old_rss * (1 + thresholds["max_rss_growth_pct"] / 100):
+        problems.append(f"{scale}x {stage}: peak RSS {rss / 1024:.0f} MiB vs baseline {old_rss / 1024:.0f} MiB")
+    return problems
+
+
+def _delta(current: float, previous: Optional[float]) -> str:
+    if not previous:
+        return ""
+    return f"{(current / previous - 1) * 100:+.0f}%"
+
+
+def print_report(results: Dict[str, Dict[str, Dict[str, Any]]], baseline: Dict[str, Any]) -> None:
+    scales = sorted(results, key=int)
+    print(
+        f"\n{'Stage':<15} {'Scale':>5} {'Files':>8} {'Wall':>9} {'vs base':>8} "
+        f"{'Peak RSS':>10} {'vs base':>8} {'Files/s':>9} {'Scaling':>8}"
+    )
+    print("-" * 88)
+    for stage in STAGES:
+        previous_scale = None
+        for scale in scales:
+            row = results[scale][stage.name]
+            old = baseline["results"].get(scale, {}).get(stage.name, {})
+            scaling = ""
+            if previous_scale is not None and "error" not in row:
+                before = results[previous_scale][stage.name]
+                if before.get("wall_s") and "error" not in before:
+                    exponent = math.log(row["wall_s"] / before["wall_s"]) / math.log(int(scale) / int(previous_scale))
+                    scaling = f"{exponent:.2f}" + (" ⚠" if exponent > CLIFF_EXPONENT else "")
+            rss = row.get("peak_rss_kb")
+            print(
+                f"{stage.name:<15} {scale + 'x':>5} {row['files']:>8,} {row['wall_s'] * 1000:>7.0f}ms "
+                f"{_delta(row['wall_s'], old.get('wall_s')):>8} "
+                f"{(f'{rss / 1024:.0f} MiB' if rss else 'n/a'):>10} {_delta(rss or 0, old.get('peak_rss_kb')) if rss else '':>8} "
+                f"{row['files_per_s']:>9,.0f} {scaling:>8}"
+            )
+            previous_scale = scale
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the data pipeline on scaled copies of the content.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Content multipliers to run.")
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per stage; the fastest is kept.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Baseline JSON file.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--keep", type=Path, help="Keep the synthesized trees and stage logs in this folder.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    baseline = load_baseline(args.baseline)
+    root = args.keep or Path(tempfile.mkdtemp(prefix="perf_harness_"))
+    root.mkdir(parents=True, exist_ok=True)
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    try:
+        for scale in args.scales:
+            results[str(scale)] = run_scale(scale, root, args.repeats)
+            # Each scale can be hundreds of MB; drop it before building the next
+            if args.keep is None:
+                shutil.rmtree(root / f"x{scale}", ignore_errors=True)
+    finally:
+        if args.keep is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print_report(results, baseline)
+
+    problems = [
+        problem
+        for scale, stages in results.items()
+        for stage, row in stages.items()
+        for problem in compare(scale, stage, row, baseline["results"].get(scale, {}).get(stage), baseline["thresholds"])
+    ]
+    if args.update_baseline:
+        failed = [problem for problem in problems if "failed" in problem]
+        if failed:
+            print("\n✗ Not updating the baseline, stages failed:\n  " + "\n  ".join(failed))
+            sys.exit(1)
+        save_baseline(args.baseline, baseline, results)
+        print(f"\n✓ Baseline written to {args.baseline}")
+        return
+    if problems:
+        print(f"\n✗ {len(problems)} regression(s):")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    compared = sum(1 for scale in results if scale in baseline["results"])
+    print(f"\n✓ No regressions ({compared} of {len(results)} scale(s) had a baseline)")
+
+
+if __name__ == "__main__":
+    main()
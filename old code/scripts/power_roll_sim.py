@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo power roll simulator for every ability and test hero pair.
+
+A power roll is 2d10 plus a characteristic. The total picks the tier:
+
+    11 or lower   tier 1
+    12 to 16      tier 2
+    17 or higher  tier 3   (a natural 19 or 20 is always tier 3)
+
+The tier probabilities only depend on the modifier, so each distinct modifier
+in the hero/ability pairs (usually -1 to +5) is sampled once, in NumPy batches.
+Every pair then takes its tier distribution by indexing into that small table,
+and its damage distribution is base damage plus the characteristic bonus for
+each tier. Abilities come from the compendium through damage_analytics, heroes
+from old code/test_heroes/hero_*.json.
+
+The exact probabilities of the 100 dice outcomes are computed alongside, so
+the report shows the sampling error next to the throughput.
+
+Usage:
+    python power_roll_sim.py                        # 10^6 rolls per modifier
+    python power_roll_sim.py --rolls 10000000 --own-class
+    python power_roll_sim.py --format csv --output pairs.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from damage_analytics import CHARACTERISTIC_BITS, NUMPY_MISSING, characteristic_mask, load_damage_table, np
+
+ROOT = Path(__file__).resolve().parent.parent
+HEROES_DIR = ROOT / "test_heroes"
+STATS = ("might", "agility", "reason", "intuition", "presence")
+STAT_BITS = [CHARACTERISTIC_BITS[name[0].upper()] for name in STATS]
+# Abilities every hero can use alongside their own class
+SHARED_CLASSES = ("Common", "Kits")
+
+TIER2_MIN = 12
+TIER3_MIN = 17
+CRITICAL_NATURAL = 19
+
+
+def tier_of(natural: "np.ndarray", modifier: int) -> "np.ndarray":
+    total = natural + modifier
+    tier = np.where(total >= TIER3_MIN, 3, np.where(total >= TIER2_MIN, 2, 1))
+    return np.where(natural >= CRITICAL_NATURAL, 3, tier).astype(np.int8)
+
+
+def simulate_tiers(modifiers: List[int], rolls: int, batch: int, seed: int) -> "np.ndarray":
+    """Sampled (len(modifiers), 3) tier probabilities."""
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((len(modifiers), 3), dtype=np.int64)
+    for row, modifier in enumerate(modifiers):
+        remaining = rolls
+        while remaining:
+            size = min(batch, remaining)
+            dice = rng.integers(1, 11, size=(2, size), dtype=np.int8)
+            natural = dice[0] + dice[1]
+            counts[row] += np.bincount(tier_of(natural, modifier), minlength=4)[1:]
+            remaining -= size
+    return counts / rolls
+
+
+def exact_tiers(modifiers: List[int]) -> "np.ndarray":
+    faces = np.arange(1, 11, dtype=np.int8)
+    natural = (faces[:, None] + faces[None, :]).ravel()
+    return np.stack([np.bincount(tier_of(natural, m), minlength=4)[1:] / natural.size for m in modifiers])
+
+
+def load_heroes(heroes_dir: Path) -> List[Dict[str, Any]]:
+    heroes = []
+    for path in sorted(heroes_dir.glob("hero_*.json")):
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        values = {entry.get("key"): entry.get("value") for entry in data.get("values", [])}
+        class_id = next(
+            (entry["entry_id"] for entry in data.get("entries", []) if entry.get("entry_type") == "class"),
+            "",
+        )
+        heroes.append({
+            "name": data.get("hero", {}).get("name") or path.stem,
+            "class": class_id.removeprefix("class_"),
+            "stats": [int(values.get(f"stats.{stat}") or 0) for stat in STATS],
+        })
+    return heroes
+
+
+def best_characteristic(stats: List[int], mask: int) -> int:
+    """The hero's best score among the characteristics in ``mask`` (0 if none apply)."""
+    options = [value for value, bit in zip(stats, STAT_BITS) if mask & bit]
+    return max(options) if options else 0
+
+
+def build_pairs(table, heroes: List[Dict[str, Any]], own_class: bool) -> Dict[str, "np.ndarray"]:
+    """Hero/ability pair columns: indexes, roll modifier and (pairs, 3) tier damage."""
+    ability_count = len(table.ability_names)
+    damage = np.full((ability_count, 3), np.nan)
+    damage[table.ability, table.tier - 1] = table.base_damage
+    bonus_mask = np.zeros((ability_count, 3), dtype=np.int8)
+    bonus_mask[table.ability, table.tier - 1] = table.bonus_mask
+    ability_class = np.zeros(ability_count, dtype=np.int16)
+    ability_class[table.ability] = table.class_id
+    roll_mask = [characteristic_mask(text) for text in table.ability_characteristics]
+
+    hero_index, ability_index, modifiers, bonuses = [], [], [], []
+    for h, hero in enumerate(heroes):
+        allowed = None
+        if own_class:
+            allowed = {
+                index for index, name in enumerate(table.class_names)
+                if name.lower() == hero["class"] or name in SHARED_CLASSES
+            }
+        for a in range(ability_count):
+            if allowed is not None and ability_class[a] not in allowed:
+                continue
+            hero_index.append(h)
+            ability_index.append(a)
+            modifiers.append(best_characteristic(hero["stats"], roll_mask[a]))
+            bonuses.append([best_characteristic(hero["stats"], int(mask)) if mask else 0 for mask in bonus_mask[a]])
+
+    abilities = np.asarray(ability_index, dtype=np.int32)
+    return {
+        "hero": np.asarray(hero_index, dtype=np.int32),
+        "ability": abilities,
+        "modifier": np.asarray(modifiers, dtype=np.int16),
+        "damage": damage[abilities] + np.asarray(bonuses, dtype=np.float64).reshape(-1, 3),
+    }
+
+
+def damage_distribution(pairs: Dict[str, "np.ndarray"], modifiers: List[int], probabilities: "np.ndarray"):
+    """Per pair tier probabilities, expected damage and its standard deviation."""
+    row = np.searchsorted(np.asarray(modifiers), pairs["modifier"])
+    tier_p = probabilities[row]
+    # A tier without damage (utility tiers) contributes 0 damage
+    damage = np.nan_to_num(pairs["damage"], nan=0.0)
+    mean = (tier_p * damage).sum(axis=1)
+    variance = (tier_p * damage * damage).sum(axis=1) - mean * mean
+    return tier_p, mean, np.sqrt(np.maximum(variance, 0.0))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Simulate power rolls for every ability and test hero.")
+    parser.add_argument("--rolls", type=int, default=1_000_000, help="Rolls sampled per distinct modifier.")
+    parser.add_argument("--batch", type=int, default=1_000_000, help="Rolls drawn per NumPy call.")
+    parser.add_argument("--seed", type=int, default=20, help="Random seed.")
+    parser.add_argument("--heroes-dir", type=Path, default=HEROES_DIR)
+    parser.add_argument("--own-class", action="store_true", help="Only pair heroes with their class (plus common and kit) abilities.")
+    parser.add_argument("--format", choices=("text", "json", "csv"), default="text")
+    parser.add_argument("--output", type=Path, help="Write pair rows to this file (json/csv).")
+    parser.add_argument("--top", type=int, default=3, help="Best abilities to show per hero in text mode.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if np is None:
+        print(NUMPY_MISSING, file=sys.stderr)
+        sys.exit(2)
+
+    started = time.perf_counter()
+    table = load_damage_table()
+    heroes = load_heroes(args.heroes_dir)
+    if not heroes:
+        print(f"No hero_*.json files in {args.heroes_dir}", file=sys.stderr)
+        sys.exit(2)
+    pairs = build_pairs(table, heroes, args.own_class)
+    modifiers = sorted({int(m) for m in pairs["modifier"]})
+    loaded = time.perf_counter()
+
+    probabilities = simulate_tiers(modifiers, args.rolls, args.batch, args.seed)
+    simulated = time.perf_counter()
+    tier_p, mean, std = damage_distribution(pairs, modifiers, probabilities)
+    finished = time.perf_counter()
+
+    rows: List[Dict[str, Any]] = [
+        {
+            "hero": heroes[h]["name"],
+            "ability": table.ability_names[a],
+            "modifier": int(m),
+            "p_tier1": round(float(p[0]), 5),
+            "p_tier2": round(float(p[1]), 5),
+            "p_tier3": round(float(p[2]), 5),
+            "expected_damage": round(float(e), 3),
+            "damage_std": round(float(s), 3),
+        }
+        for h, a, m, p, e, s in zip(pairs["hero"], pairs["ability"], pairs["modifier"], tier_p, mean, std)
+    ]
+
+    if args.format == "json":
+        text = json.dumps(rows, indent=2, ensure_ascii=False)
+        if args.output:
+            args.output.write_text(text + "\n", encoding="utf-8")
+        else:
+            print(text)
+    elif args.format == "csv":
+        handle = args.output.open("w", encoding="utf-8", newline="") if args.output else sys.stdout
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+        if args.output:
+            handle.close()
+    else:
+        exact = exact_tiers(modifiers)
+        print(f"{'Modifier':>8} {'P(t1)':>8} {'P(t2)':>8} {'P(t3)':>8} {'max error':>10}")
+        for modifier, sampled, truth in zip(modifiers, probabilities, exact):
+            print(
+                f"{modifier:>+8} {sampled[0]:>8.4f} {sampled[1]:>8.4f} {sampled[2]:>8.4f} "
+                f"{np.abs(sampled - truth).max():>10.5f}"
+            )
+        by_hero: Dict[str, List[Tuple[float, str]]] = {}
+        for row in rows:
+            by_hero.setdefault(row["hero"], []).append((row["expected_damage"], row["ability"]))
+        print()
+        for name, entries in by_hero.items():
+            entries.sort(reverse=True)
+            best = ", ".join(f"{ability} ({value:.1f})" for value, ability in entries[: args.top])
+            average = sum(value for value, _ in entries) / len(entries)
+            print(f"{name:<28} {len(entries):>4} abilities, mean {average:5.2f}  best: {best}")
+
+    total_rolls = len(modifiers) * args.rolls
+    sim_seconds = simulated - loaded
+    print(
+        f"\n{len(heroes)} heroes x {len(table.ability_names)} abilities = {len(rows)} pairs, "
+        f"{len(modifiers)} distinct modifiers. Load {(loaded - started) * 1000:.0f} ms, "
+        f"sampling {total_rolls:,} rolls in {sim_seconds:.2f} s ({total_rolls / sim_seconds / 1e6:.0f} M rolls/s), "
+        f"pair distributions in {(finished - simulated) * 1000:.1f} ms",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
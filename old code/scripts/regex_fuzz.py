@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Fuzz the ability text regexes of extract_class_abilities.py for catastrophic backtracking.
+
+Each pattern is fed adversarial strings of growing length: long runs of the
+characters its quantifiers overlap on (spaces, digits, letters), many
+almost-matches ("+ M, A, R, ..." with no "damage" after it) and real tier and
+distance strings from the compendium with a slice repeated over and over.
+For every pattern and input family the worst time at each length is
+measured, and the growth between lengths is fitted as an exponent:
+about 1 for a linear pattern, 2 or more once the engine starts retrying every
+split of the input. A pattern fails when the exponent is above
+``--max-exponent`` or a call runs over the per-call budget; failing inputs
+can be saved with ``--save-failures`` to reproduce them.
+
+The end-to-end parse_range and tier parsing functions are fuzzed the same
+way, so regexes that are built inline there are covered too.
+
+Usage:
+    python regex_fuzz.py
+    python regex_fuzz.py --sizes 2000 8000 32000 --budget-ms 500
+    python regex_fuzz.py --save-failures /tmp/regex_failures.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import extract_class_abilities as extract
+from archive_io import COMPENDIUM_DIR
+
+
+# (input family, generator(size, rng)) pairs per target
+Family = Tuple[str, Callable[[int, random.Random], str]]
+
+
+def _repeat(unit: str, size: int, prefix: str = "", suffix: str = "") -> str:
+    return prefix + unit * max(1, size // max(1, len(unit))) + suffix
+
+
+def _mutate(samples: List[str]) -> Callable[[int, random.Random], str]:
+    """A real string with one random slice of it repeated up to ``size``."""
+
+    def generate(size: int, rng: random.Random) -> str:
+        text = rng.choice(samples)
+        start = rng.randrange(len(text))
+        end = rng.randrange(start + 1, len(text) + 1)
+        return text[:start] + _repeat(text[start:end], size) + text[end:]
+
+    return generate
+
+
+TIER_FAMILIES: List[Family] = [
+    ("spaces after +M", lambda n, rng: _repeat(" ", n, "4 + M", "x")),
+    ("words, no damage", lambda n, rng: _repeat("fire ", n, "4 + M ", "!")),
+    ("letters list, no damage", lambda n, rng: _repeat(", A", n, "4 + M", " x")),
+    ("or-chain, no damage", lambda n, rng: _repeat(" or R", n, "4 + M", ";")),
+    ("many + starts", lambda n, rng: _repeat("+ M ", n)),
+    ("digit run", lambda n, rng: _repeat("7", n)),
+    ("potency spaces", lambda n, rng: _repeat(" ", n, "M", "< WEEK")),
+    ("condition spaces", lambda n, rng: _repeat(" ", n, "slowed", "(save")),
+]
+DISTANCE_FAMILIES: List[Family] = [
+    ("melee spaces", lambda n, rng: _repeat(" ", n, "melee", "x")),
+    ("melee spaced digits", lambda n, rng: _repeat(" 1 ", n, "melee", "or")),
+    ("digit run, no x", lambda n, rng: _repeat("1", n, "", " y line")),
+    ("digit run, no area", lambda n, rng: _repeat("3", n, "", " burs")),
+    ("x chain, no line", lambda n, rng: _repeat("1 x ", n)),
+    ("within spaces", lambda n, rng: _repeat(" ", n, "within", "x")),
+]
+
+
+def load_samples(compendium_dir: Path) -> Tuple[List[str], List[str]]:
+    """Distinct tier texts and distances from the compendium abilities."""
+    tiers: Dict[str, None] = {}
+    distances: Dict[str, None] = {}
+    for path in sorted(compendium_dir.rglob("*.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        distance = (data.get("metadata") or {}).get("distance") or data.get("distance")
+        if isinstance(distance, str) and distance.strip():
+            distances[distance] = None
+        for effect in data.get("effects") or []:
+            for key in ("tier1", "tier2", "tier3"):
+                if isinstance(effect.get(key), str) and effect[key].strip():
+                    tiers[effect[key]] = None
+    return list(tiers), list(distances)
+
+
+def targets(tier_samples: List[str], distance_samples: List[str]) -> Iterator[Tuple[str, Callable[[str], object], List[Family]]]:
+    tier_families = TIER_FAMILIES + ([("mutated tier text", _mutate(tier_samples))] if tier_samples else [])
+    distance_families = DISTANCE_FAMILIES + (
+        [("mutated distance", _mutate([d.lower() for d in distance_samples]))] if distance_samples else []
+    )
+    yield "_CHARACTERISTIC_DAMAGE", extract._CHARACTERISTIC_DAMAGE.search, tier_families
+    yield "_POTENCY", extract._POTENCY.search, tier_families
+    yield "_BASE_DAMAGE", extract._BASE_DAMAGE.match, tier_families
+    yield "_MELEE_OR_RANGED", extract._MELEE_OR_RANGED.match, distance_families
+    yield "_MELEE_RANGE", extract._MELEE_RANGE.search, distance_families
+    yield "_LINE_SIZE", extract._LINE_SIZE.search, distance_families
+    for label, pattern in extract._AREA_SIZE.items():
+        yield f"_AREA_SIZE[{label}]", pattern.search, distance_families
+    yield "_WITHIN", extract._WITHIN.search, distance_families
+    yield "tier text parse", extract._parse_tier_text_uncached, tier_families
+    yield "parse_range", extract.parse_range, distance_families
+
+
+def time_call(function: Callable[[str], object], text: str, repeats: int, budget: float) -> Optional[float]:
+    """Best time of ``repeats`` calls, or None if a call ran over ``budget``."""
+    best = math.inf
+    for _ in range(repeats):
+        started = time.perf_counter()
+        try:
+            with extract.regex_budget(budget):
+                function(text)
+        except extract.RegexTimeout:
+            return None
+        except ValueError:
+            # Only the time matters here; e.g. int() refuses a 30k-digit damage value
+            pass
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def growth_exponent(sizes: List[int], seconds: List[float]) -> float:
+    """Least-squares slope of log(time) against log(size)."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-9)) for value in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fuzz ability text regexes for superlinear backtracking.")
+    parser.add_argument("--compendium-dir", type=Path, default=COMPENDIUM_DIR, help="Compendium Abilities folder for real samples.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 8000, 32000], help="Input lengths to time.")
+    parser.add_argument("--samples", type=int, default=5, help="Random inputs per family and size (worst one counts).")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed calls per input (best one counts).")
+    parser.add_argument("--max-exponent", type=float, default=1.5, help="Fail above this growth exponent.")
+    parser.add_argument("--noise-floor-ms", type=float, default=2.0, help="Pass if the largest input stays under this.")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Per-call budget; slower inputs are quarantined.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for mutated inputs.")
+    parser.add_argument("--save-failures", type=Path, help="Write quarantined and failing inputs here as JSON.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    sizes = sorted(args.sizes)
+    budget = args.budget_ms / 1000
+    rng = random.Random(args.seed)
+    tier_samples, distance_samples = load_samples(args.compendium_dir) if args.compendium_dir.exists() else ([], [])
+
+    failures: List[Dict[str, object]] = []
+    checked = 0
+    started = time.perf_counter()
+    print(f"{'pattern':<24} {'input family':<24} " + "".join(f"{size:>10,}" for size in sizes) + f"{'exp':>7}")
+    for name, function, families in targets(tier_samples, distance_samples):
+        for family, generate in families:
+            checked += 1
+            worst: List[float] = []
+            quarantined: Optional[str] = None
+            slowest = ""
+            for size in sizes:
+                size_worst = 0.0
+                for _ in range(args.samples):
+                    text = generate(size, rng)
+                    seconds = time_call(function, text, args.repeats, budget)
+                    if seconds is None:
+                        quarantined = text
+                        break
+                    if seconds >= size_worst:
+                        size_worst, slowest = seconds, text
+                if quarantined is not None:
+                    break
+                worst.append(size_worst)
+
+            cells = "".join(f"{value * 1000:>8.2f}ms" for value in worst)
+            if quarantined is not None:
+                cells += f"{'over budget':>{10 * (len(sizes) - len(worst)) + 2}}"
+                print(f"✗ {name:<22} {family:<24} {cells}")
+                failures.append({"pattern": name, "family": family, "reason": "over budget", "input": quarantined})
+                continue
+            exponent = growth_exponent(sizes, worst)
+            ok = exponent <= args.max_exponent or worst[-1] * 1000 < args.noise_floor_ms
+            print(f"{'✓' if ok else '✗'} {name:<22} {family:<24} {cells}{exponent:>7.2f}")
+            if not ok:
+                failures.append({"pattern": name, "family": family, "reason": f"exponent {exponent:.2f}", "input": slowest})
+
+    elapsed = time.perf_counter() - started
+    print(f"\n{checked} pattern/input combinations, {len(failures)} failing, {elapsed:.1f}s")
+    if args.save_failures and failures:
+        args.save_failures.write_text(json.dumps(failures, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Failing inputs written to {args.save_failures}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
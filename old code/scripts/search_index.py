@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Persistent inverted-index search over the ability compendium and app data.
+
+Indexes every compendium ability (data_unused/compendium/Abilities) and every
+record with an id under hero_smith/data. Each document is split into fields:
+
+    name, keywords, conditions, damage_types, effect, trigger,
+    distance, area, class, level, type, source
+
+Structured fields come from the same parsers the converters use:
+``parse_tier_text`` provides conditions and damage types for every power roll
+tier, and ``parse_range`` provides the distance type and area. The distance
+field also keeps the raw distance text and range value, so "within 10" finds
+"3 cube within 10".
+
+The index is stored next to this script as plain data and updated
+incrementally: only files whose size, modification time and content hash
+changed are re-indexed.
+
+Query syntax:
+    restrained slowed            both terms, in any field
+    conditions:restrained        term restricted to one field
+    "within 10"                  phrase
+    -prone / NOT prone           exclude
+    fire OR cold                 either group matches
+    class:fury level:5 damage_types:fire
+
+Usage:
+    python search_index.py build [--rebuild]
+    python search_index.py query 'conditions:restrained "within 10"'
+    python search_index.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import pickle
+import re
+import shlex
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from extract_class_abilities import parse_range, parse_tier_text, transform_ability
+
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPENDIUM_DIR = ROOT / "data_unused" / "compendium" / "Abilities"
+APP_DATA_DIR = ROOT.parent / "hero_smith" / "data"
+INDEX_FILE = Path(__file__).resolve().parent / ".search_index.pickle"
+INDEX_VERSION = 2
+
+FIELDS = (
+    "name",
+    "keywords",
+    "conditions",
+    "damage_types",
+    "effect",
+    "trigger",
+    "distance",
+    "area",
+    "class",
+    "level",
+    "type",
+    "source",
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _lines(*values: Any) -> str:
+    """Non-empty values one per line; phrases never match across lines."""
+    return "\n".join(str(value) for value in values if value not in (None, ""))
+
+
+def contains_phrase(text: str, terms: List[str]) -> bool:
+    """True if ``terms`` appear as consecutive tokens within one line of ``text``."""
+    width = len(terms)
+    for line in text.split("\n"):
+        tokens = tokenize(line)
+        if any(tokens[start:start + width] == terms for start in range(len(tokens) - width + 1)):
+            return True
+    return False
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "\n".join(_text(item) for item in value)
+    if isinstance(value, dict):
+        return "\n".join(_text(item) for item in value.values())
+    return str(value)
+
+
+# -----------------------------------------------------------------------------
+# Documents
+# -----------------------------------------------------------------------------
+
+def _tier_fields(tier_texts: Iterable[str]) -> Tuple[str, str]:
+    conditions: List[str] = []
+    damage_types: List[str] = []
+    for text in tier_texts:
+        tier = parse_tier_text(text)
+        if tier is None:
+            continue
+        if tier.conditions:
+            conditions.append(tier.conditions)
+        if tier.damage_types:
+            damage_types.append(tier.damage_types.replace("/", " "))
+    return "\n".join(conditions), " ".join(damage_types)
+
+
+def compendium_documents(path: Path, root: Path) -> List[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    record = transform_ability(path, data)
+    tier_texts = [
+        effect.get(key)
+        for effect in data.get("effects", [])
+        for key in ("tier1", "tier2", "tier3")
+        if effect.get(key)
+    ]
+    conditions, damage_types = _tier_fields(tier_texts)
+    relative = path.relative_to(root)
+    raw_distance = (data.get("metadata") or {}).get("distance") or data.get("distance")
+    fields = {
+        "name": record.name or "",
+        "keywords": " ".join(record.keywords),
+        "conditions": conditions,
+        "damage_types": damage_types,
+        "effect": "\n".join(_text(part) for part in (record.effect, record.special_effect, tier_texts) if part),
+        "trigger": record.trigger_text or "",
+        "distance": _lines(record.range.distance, raw_distance, record.range.range_value),
+        "area": record.range.area or "",
+        "class": relative.parts[0] if len(relative.parts) > 1 else "",
+        "level": str(record.level) if record.level is not None else "",
+        "type": "ability",
+        "source": "compendium",
+    }
+    return [{"id": record.id, "name": record.name or record.id, "fields": fields}]
+
+
+def data_documents(path: Path, root: Path) -> List[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        decoded = json.load(handle)
+    items = decoded if isinstance(decoded, list) else [decoded]
+    relative = path.relative_to(root)
+    documents = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("id"), str):
+            continue
+        tier_texts = [
+            value
+            for entry in item.get("tier_effects") or []
+            if isinstance(entry, dict)
+            for value in entry.values()
+            if isinstance(value, str)
+        ]
+        conditions, damage_types = _tier_fields(tier_texts)
+        range_details = parse_range(item["distance"]) if isinstance(item.get("distance"), str) else None
+        keywords = item.get("keywords")
+        if isinstance(keywords, str):
+            keywords = keywords.replace("/", " ")
+        class_name = item.get("class") or (
+            relative.name.split("_")[0] if "class_abilities" in relative.parent.name else ""
+        )
+        fields = {
+            "name": _text(item.get("name")),
+            "keywords": _text(keywords),
+            "conditions": conditions,
+            "damage_types": damage_types,
+            "effect": "\n".join(
+                _text(item.get(key))
+                for key in ("effect", "special_effect", "description", "benefit")
+                if item.get(key)
+            ) + ("\n" + "\n".join(tier_texts) if tier_texts else ""),
+            "trigger": _text(item.get("trigger_text") or item.get("trigger")),
+            "distance": _lines(
+                range_details.distance, item["distance"], range_details.range_value
+            ) if range_details else "",
+            "area": (range_details.area or "") if range_details else "",
+            "class": _text(class_name),
+            "level": _text(item.get("level")),
+            "type": "ability" if "abilities" in relative.parts else _text(item.get("type")),
+            "source": relative.parts[0],
+        }
+        documents.append({"id": item["id"], "name": fields["name"] or item["id"], "fields": fields})
+    return documents
+
+
+# -----------------------------------------------------------------------------
+# Index
+# -----------------------------------------------------------------------------
+
+class SearchIndex:
+    """Field-scoped inverted index with per-file incremental updates."""
+
+    def __init__(self) -> None:
+        self.version = INDEX_VERSION
+        # field -> term -> doc ids
+        self.postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in FIELDS}
+        self.docs: Dict[int, Dict[str, Any]] = {}
+        # source key -> [size, mtime_ns, sha256, doc ids]
+        self.files: Dict[str, List[Any]] = {}
+        self.next_doc = 0
+
+    # -- persistence ---------------------------------------------------------
+
+    # Only builtin containers are pickled, never the class itself, so the file
+    # loads the same whether this module runs as a script or is imported.
+
+    @classmethod
+    def load(cls, path: Path = INDEX_FILE) -> "SearchIndex":
+        index = cls()
+        if path.exists():
+            try:
+                with path.open("rb") as handle:
+                    state = pickle.load(handle)
+            except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+                return index
+            if isinstance(state, dict) and state.get("version") == INDEX_VERSION:
+                index.postings = state["postings"]
+                index.docs = state["docs"]
+                index.files = state["files"]
+                index.next_doc = state["next_doc"]
+        return index
+
+    def save(self, path: Path = INDEX_FILE) -> None:
+        state = {
+            "version": self.version,
+            "postings": self.postings,
+            "docs": self.docs,
+            "files": self.files,
+            "next_doc": self.next_doc,
+        }
+        temp = path.with_name(path.name + ".tmp")
+        with temp.open("wb") as handle:
+            pickle.dump(state, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        temp.replace(path)
+
+    # -- updates -------------------------------------------------------------
+
+    def _add(self, document: Dict[str, Any]) -> int:
+        doc_id = self.next_doc
+        self.next_doc += 1
+        self.docs[doc_id] = document
+        for field, text in document["fields"].items():
+            field_postings = self.postings[field]
+            for term in set(tokenize(text)):
+                field_postings.setdefault(term, set()).add(doc_id)
+        return doc_id
+
+    def _remove(self, doc_id: int) -> None:
+        document = self.docs.pop(doc_id, None)
+        if document is None:
+            return
+        for field, text in document["fields"].items():
+            field_postings = self.postings[field]
+            for term in set(tokenize(text)):
+                holders = field_postings.get(term)
+                if holders is not None:
+                    holders.discard(doc_id)
+                    if not holders:
+                        del field_postings[term]
+
+    def update(self, sources: Iterable[Tuple[str, Path, Path, Any]]) -> Dict[str, int]:
+        """Re-index changed files and drop removed ones.
+
+        ``sources`` yields ``(key, path, root, loader)`` for every file that
+        should be indexed. A file the loader fails on is reported, counted as
+        failed and indexed with no documents; it is retried once it changes.
+        """
+        counts = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0, "failed": 0, "documents": 0}
+        seen: Set[str] = set()
+        for key, path, root, loader in sources:
+            seen.add(key)
+            stat = path.stat()
+            entry = self.files.get(key)
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                counts["unchanged"] += 1
+                continue
+            raw = path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if entry and entry[2] == digest:
+                entry[0], entry[1] = stat.st_size, stat.st_mtime_ns
+                counts["unchanged"] += 1
+                continue
+
+            if entry:
+                for doc_id in entry[3]:
+                    self._remove(doc_id)
+                counts["changed"] += 1
+            else:
+                counts["added"] += 1
+            try:
+                documents = loader(path, root)
+            except Exception as exc:  # one bad record must not abort the update
+                print(f"  Skipping {key}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                counts["failed"] += 1
+                documents = []
+            doc_ids = []
+            for document in documents:
+                document["key"] = key
+                doc_ids.append(self._add(document))
+            counts["documents"] += len(doc_ids)
+            self.files[key] = [stat.st_size, stat.st_mtime_ns, digest, doc_ids]
+
+        for key in set(self.files) - seen:
+            for doc_id in self.files.pop(key)[3]:
+                self._remove(doc_id)
+            counts["removed"] += 1
+        return counts
+
+    # -- queries -------------------------------------------------------------
+
+    def _term_docs(self, field: Optional[str], term: str) -> Set[int]:
+        if field is not None:
+            return self.postings.get(field, {}).get(term, set())
+        result: Set[int] = set()
+        for field_postings in self.postings.values():
+            holders = field_postings.get(term)
+            if holders:
+                result |= holders
+        return result
+
+    def _clause_docs(self, field: Optional[str], text: str) -> Set[int]:
+        terms = tokenize(text)
+        if not terms:
+            return set()
+        candidates: Optional[Set[int]] = None
+        for term in sorted(terms, key=lambda t: len(self._term_docs(field, t))):
+            holders = self._term_docs(field, term)
+            candidates = set(holders) if candidates is None else candidates & holders
+            if not candidates:
+                return set()
+        if len(terms) > 1:
+            # Phrase: verify the terms are adjacent in the stored field text
+            fields = [field] if field else list(FIELDS)
+            candidates = {
+                doc_id
+                for doc_id in candidates
+                if any(contains_phrase(self.docs[doc_id]["fields"].get(f, ""), terms) for f in fields)
+            }
+        return candidates or set()
+
+    def search(self, query: str) -> List[int]:
+        groups = parse_query(query)
+        matches: Set[int] = set()
+        for clauses in groups:
+            # A clause with no searchable terms ("(", '"', "class:") matches
+            # nothing and constrains nothing, so it is dropped; a group left
+            # with no clauses matches nothing rather than everything.
+            clauses = [clause for clause in clauses if tokenize(clause[2])]
+            if not clauses:
+                continue
+            positives = [clause for clause in clauses if not clause[0]]
+            negatives = [clause for clause in clauses if clause[0]]
+            if positives:
+                group: Optional[Set[int]] = None
+                for _, field, text in positives:
+                    docs = self._clause_docs(field, text)
+                    group = docs if group is None else group & docs
+                    if not group:
+                        break
+                group = group or set()
+            else:
+                group = set(self.docs)
+            for _, field, text in negatives:
+                if not group:
+                    break
+                group = group - self._clause_docs(field, text)
+            matches |= group
+        return sorted(matches, key=lambda doc_id: (self.docs[doc_id]["name"].lower(), doc_id))
+
+
+Clause = Tuple[bool, Optional[str], str]
+
+
+def parse_query(query: str) -> List[List[Clause]]:
+    """Parse a query into OR-ed groups of ``(negated, field, text)`` clauses."""
+    try:
+        tokens = shlex.split(query)
+    except ValueError:
+        tokens = query.split()
+
+    groups: List[List[Clause]] = [[]]
+    negate_next = False
+    for token in tokens:
+        if token == "OR":
+            if groups[-1]:
+                groups.append([])
+            continue
+        if token == "NOT":
+            negate_next = True
+            continue
+        negated = negate_next
+        negate_next = False
+        if token.startswith("-") and len(token) > 1:
+            negated = True
+            token = token[1:]
+        field: Optional[str] = None
+        if ":" in token:
+            prefix, rest = token.split(":", 1)
+            if prefix in FIELDS:
+                field, token = prefix, rest
+        groups[-1].append((negated, field, token))
+    return [group for group in groups if group]
+
+
+def iter_sources(compendium_dir: Path, data_dir: Path) -> Iterator[Tuple[str, Path, Path, Any]]:
+    if compendium_dir.exists():
+        for path in sorted(compendium_dir.rglob("*.json")):
+            yield f"compendium/{path.relative_to(compendium_dir).as_posix()}", path, compendium_dir, compendium_documents
+    if data_dir.exists():
+        for path in sorted(data_dir.rglob("*.json")):
+            yield f"data/{path.relative_to(data_dir).as_posix()}", path, data_dir, data_documents
+
+
+def open_index(
+    compendium_dir: Path = COMPENDIUM_DIR,
+    data_dir: Path = APP_DATA_DIR,
+    index_file: Path = INDEX_FILE,
+    rebuild: bool = False,
+) -> Tuple[SearchIndex, Dict[str, int], float]:
+    """Load the stored index, bring it up to date and save it if anything changed."""
+    started = time.perf_counter()
+    index = SearchIndex() if rebuild else SearchIndex.load(index_file)
+    counts = index.update(iter_sources(compendium_dir, data_dir))
+    if counts["added"] or counts["changed"] or counts["removed"] or rebuild:
+        index.save(index_file)
+    return index, counts, time.perf_counter() - started
+
+
+# -----------------------------------------------------------------------------
+# CLI
+# -----------------------------------------------------------------------------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search abilities and data records.")
+    parser.add_argument("--compendium-dir", type=Path, default=COMPENDIUM_DIR)
+    parser.add_argument("--data-dir", type=Path, default=APP_DATA_DIR)
+    parser.add_argument("--index-file", type=Path, default=INDEX_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Create or update the index.")
+    build.add_argument("--rebuild", action="store_true", help="Discard the stored index first.")
+
+    query = sub.add_parser("query", help="Run a query.")
+    query.add_argument("query", help="Query string, e.g. 'conditions:restrained \"within 10\"'.")
+    query.add_argument("--limit", type=int, default=20, help="Maximum results to print.")
+    query.add_argument("--no-update", action="store_true", help="Use the stored index as is.")
+    query.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    sub.add_parser("stats", help="Show index statistics.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.command == "query" and args.no_update:
+        started = time.perf_counter()
+        index = SearchIndex.load(args.index_file)
+        counts, update_seconds = None, time.perf_counter() - started
+    else:
+        index, counts, update_seconds = open_index(
+            args.compendium_dir,
+            args.data_dir,
+            args.index_file,
+            rebuild=getattr(args, "rebuild", False),
+        )
+
+    if args.command == "build":
+        print(
+            f"Indexed {len(index.docs)} documents from {len(index.files)} files in {update_seconds * 1000:.1f} ms "
+            f"({counts['added']} added, {counts['changed']} changed, {counts['removed']} removed, "
+            f"{counts['unchanged']} unchanged, {counts['failed']} failed)"
+        )
+        return
+
+    if args.command == "stats":
+        terms = sum(len(field_postings) for field_postings in index.postings.values())
+        size = args.index_file.stat().st_size if args.index_file.exists() else 0
+        print(f"{len(index.docs)} documents, {len(index.files)} files, {terms} terms, {size / 1024:.1f} KiB on disk")
+        for field in FIELDS:
+            print(f"  {field:<13} {len(index.postings[field]):>6} terms")
+        return
+
+    started = time.perf_counter()
+    results = index.search(args.query)
+    query_seconds = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(
+            [{"id": index.docs[d]["id"], "name": index.docs[d]["name"], "file": index.docs[d]["key"]} for d in results[: args.limit]],
+            indent=2,
+            ensure_ascii=False,
+        ))
+    else:
+        for doc_id in results[: args.limit]:
+            document = index.docs[doc_id]
+            print(f"{document['name']:<40} {document['id']:<45} {document['key']}")
+    print(
+        f"\n{len(results)} match(es); query {query_seconds * 1000:.2f} ms, "
+        f"index load/update {update_seconds * 1000:.1f} ms",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Record-level diff between two data snapshots.
+
+Each snapshot (a folder under "data backup/", or hero_smith/data itself) is
+turned into a hash tree: folders hash their children, files hash their bytes,
+and the records of a JSON file hash their canonical JSON. Two trees are
+compared top-down and only subtrees whose hashes differ are descended into, so
+unchanged folders and files are never parsed. Inside a changed file, records
+are matched by id (the same keys the app's seeder uses) and changed records are
+reported down to the individual fields.
+
+Usage:
+    python snapshot_diff.py                                  # the two newest backups
+    python snapshot_diff.py "data backup/data_backup_16.9.2025" ../../hero_smith/data
+    python snapshot_diff.py OLD NEW --json > changes.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+BACKUP_DIR = REPO_ROOT / "data backup"
+
+# Same order as AssetSeeder in the app
+ID_KEYS = ("id", "componentId", "classId", "abilityId", "featureId")
+MAX_VALUE_WIDTH = 80
+# Backup folders are named like data_backup_16.9.2025 (day.month.year)
+BACKUP_DATE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})$")
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+@dataclass
+class Node:
+    """A folder or file in a snapshot hash tree."""
+
+    path: Path
+    digest: bytes = b""
+    children: Dict[str, "Node"] = field(default_factory=dict)
+
+    @property
+    def is_dir(self) -> bool:
+        return self.path.is_dir()
+
+
+def build_tree(path: Path) -> Node:
+    if path.is_dir():
+        node = Node(path)
+        hasher = hashlib.blake2b(digest_size=16)
+        for child in sorted(path.iterdir(), key=lambda p: p.name):
+            child_node = build_tree(child)
+            node.children[child.name] = child_node
+            hasher.update(child.name.encode("utf-8"))
+            hasher.update(b"/" if child.is_dir() else b"\0")
+            hasher.update(child_node.digest)
+        node.digest = hasher.digest()
+        return node
+    return Node(path, _digest(path.read_bytes()))
+
+
+def snapshot_root(path: Path) -> Path:
+    """Backups keep the data in a ``data`` subfolder; accept either form."""
+    inner = path / "data"
+    if inner.is_dir() and not any(child.is_file() for child in path.iterdir()):
+        return inner
+    return path
+
+
+# -----------------------------------------------------------------------------
+# Records
+# -----------------------------------------------------------------------------
+
+def record_key(record: Any, position: int) -> str:
+    if isinstance(record, dict):
+        for key in ID_KEYS:
+            value = record.get(key)
+            if value is not None and value != "":
+                return str(value)
+        name = record.get("name")
+        if isinstance(name, str) and name:
+            return f"name:{name}"
+    return f"#{position}"
+
+
+def file_records(path: Path) -> Dict[str, Any]:
+    """Map record keys to records; a non-list document is a single record."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    items = data if isinstance(data, list) else [data]
+    records: Dict[str, Any] = {}
+    for position, item in enumerate(items):
+        key = record_key(item, position)
+        unique, suffix = key, 2
+        while unique in records:
+            unique = f"{key}~{suffix}"
+            suffix += 1
+        records[unique] = item
+    return records
+
+
+def record_hash(record: Any) -> bytes:
+    return _digest(json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def field_changes(old: Any, new: Any, path: str = "") -> Iterator[Tuple[str, Any, Any]]:
+    """Yield ``(field path, old, new)`` for every leaf that differs."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in list(old) + [key for key in new if key not in old]:
+            child = f"{path}.{key}" if path else str(key)
+            if key not in new:
+                yield child, old[key], _MISSING
+            elif key not in old:
+                yield child, _MISSING, new[key]
+            elif old[key] != new[key]:
+                yield from field_changes(old[key], new[key], child)
+    elif isinstance(old, list) and isinstance(new, list):
+        for index in range(max(len(old), len(new))):
+            child = f"{path}[{index}]"
+            if index >= len(new):
+                yield child, old[index], _MISSING
+            elif index >= len(old):
+                yield child, _MISSING, new[index]
+            elif old[index] != new[index]:
+                yield from field_changes(old[index], new[index], child)
+    else:
+        yield path or "(value)", old, new
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+# -----------------------------------------------------------------------------
+# Tree comparison
+# -----------------------------------------------------------------------------
+
+@dataclass
+class FileDiff:
+    path: str
+    status: str  # added, removed, changed, binary, invalid
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: Dict[str, List[Tuple[str, Any, Any]]] = field(default_factory=dict)
+
+
+def diff_file(relative: str, old: Path, new: Path) -> FileDiff:
+    if old.suffix.lower() != ".json":
+        return FileDiff(relative, "binary")
+    try:
+        old_records = file_records(old)
+        new_records = file_records(new)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        diff = FileDiff(relative, "invalid")
+        diff.changed["(file)"] = [("(parse)", "", str(exc))]
+        return diff
+
+    diff = FileDiff(relative, "changed")
+    diff.removed = [key for key in old_records if key not in new_records]
+    diff.added = [key for key in new_records if key not in old_records]
+    for key, old_record in old_records.items():
+        new_record = new_records.get(key)
+        if new_record is None or record_hash(old_record) == record_hash(new_record):
+            continue
+        diff.changed[key] = list(field_changes(old_record, new_record))
+    return diff
+
+
+def diff_trees(old: Node, new: Node, prefix: str = "") -> Iterator[FileDiff]:
+    if old.digest == new.digest:
+        return
+    if not old.is_dir or not new.is_dir:
+        yield diff_file(prefix.rstrip("/"), old.path, new.path)
+        return
+    for name in sorted(set(old.children) | set(new.children)):
+        relative = f"{prefix}{name}"
+        old_child = old.children.get(name)
+        new_child = new.children.get(name)
+        if new_child is None:
+            yield from _whole(old_child, relative, "removed")
+        elif old_child is None:
+            yield from _whole(new_child, relative, "added")
+        elif old_child.is_dir != new_child.is_dir:
+            yield from _whole(old_child, relative, "removed")
+            yield from _whole(new_child, relative, "added")
+        else:
+            yield from diff_trees(old_child, new_child, relative + "/")
+
+
+def _whole(node: Node, relative: str, status: str) -> Iterator[FileDiff]:
+    if node.is_dir:
+        for name, child in sorted(node.children.items()):
+            yield from _whole(child, f"{relative}/{name}", status)
+        return
+    diff = FileDiff(relative, status)
+    if node.path.suffix.lower() == ".json":
+        try:
+            keys = list(file_records(node.path))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            keys = []
+        if status == "added":
+            diff.added = keys
+        else:
+            diff.removed = keys
+    yield diff
+
+
+# -----------------------------------------------------------------------------
+# Output
+# -----------------------------------------------------------------------------
+
+def _short(value: Any) -> str:
+    if value is _MISSING:
+        return "<missing>"
+    text = json.dumps(value, ensure_ascii=False)
+    if len(text) > MAX_VALUE_WIDTH:
+        text = text[: MAX_VALUE_WIDTH - 3] + "..."
+    return text
+
+
+def print_report(diffs: List[FileDiff], max_fields: int) -> None:
+    for diff in diffs:
+        counts = f"+{len(diff.added)} -{len(diff.removed)} ~{len(diff.changed)}"
+        print(f"{diff.status.upper():<8} {diff.path}  ({counts})")
+        for key in diff.added:
+            print(f"    + {key}")
+        for key in diff.removed:
+            print(f"    - {key}")
+        for key, changes in diff.changed.items():
+            print(f"    ~ {key}")
+            for field_path, old, new in changes[:max_fields]:
+                print(f"        {field_path}: {_short(old)} -> {_short(new)}")
+            if len(changes) > max_fields:
+                print(f"        ... {len(changes) - max_fields} more field change(s)")
+
+
+def to_json(diffs: List[FileDiff]) -> List[Dict[str, Any]]:
+    def value(item: Any) -> Any:
+        return None if item is _MISSING else item
+
+    return [
+        {
+            "path": diff.path,
+            "status": diff.status,
+            "added": diff.added,
+            "removed": diff.removed,
+            "changed": {
+                key: [{"field": path, "old": value(old), "new": value(new)} for path, old, new in changes]
+                for key, changes in diff.changed.items()
+            },
+        }
+        for diff in diffs
+    ]
+
+
+def backup_sort_key(path: Path) -> Tuple[int, int, int, str]:
+    """Date from the folder name; undated folders sort first, by name."""
+    match = BACKUP_DATE.search(path.name)
+    if match is None:
+        return 0, 0, 0, path.name
+    day, month, year = (int(part) for part in match.groups())
+    return year, month, day, path.name
+
+
+def default_snapshots() -> Tuple[Path, Path]:
+    backups = sorted(
+        (path for path in BACKUP_DIR.iterdir() if path.is_dir()),
+        key=backup_sort_key,
+    ) if BACKUP_DIR.exists() else []
+    if len(backups) < 2:
+        print(f"Need two snapshots under {BACKUP_DIR} or explicit paths.", file=sys.stderr)
+        sys.exit(2)
+    return backups[-2], backups[-1]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare two data snapshots record by record.")
+    parser.add_argument("old", type=Path, nargs="?", help="Older snapshot folder.")
+    parser.add_argument("new", type=Path, nargs="?", help="Newer snapshot folder.")
+    parser.add_argument("--json", action="store_true", help="Print the changes as JSON.")
+    parser.add_argument("--max-fields", type=int, default=10, help="Field changes to show per record.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.old is None or args.new is None:
+        old_path, new_path = default_snapshots()
+    else:
+        old_path, new_path = args.old, args.new
+    old_path, new_path = snapshot_root(old_path), snapshot_root(new_path)
+
+    started = time.perf_counter()
+    old_tree = build_tree(old_path)
+    new_tree = build_tree(new_path)
+    hashed = time.perf_counter()
+    diffs = list(diff_trees(old_tree, new_tree))
+    finished = time.perf_counter()
+
+    if args.json:
+        print(json.dumps(to_json(diffs), indent=2, ensure_ascii=False))
+        return
+
+    print(f"Comparing {old_path}\n     with {new_path}\n")
+    if not diffs:
+        print("Snapshots are identical.")
+    else:
+        print_report(diffs, args.max_fields)
+
+    records_added = sum(len(diff.added) for diff in diffs)
+    records_removed = sum(len(diff.removed) for diff in diffs)
+    records_changed = sum(len(diff.changed) for diff in diffs)
+    print(
+        f"\n{len(diffs)} file(s) differ: {records_added} record(s) added, {records_removed} removed, "
+        f"{records_changed} changed"
+    )
+    print(f"Hashed in {(hashed - started) * 1000:.1f} ms, compared in {(finished - hashed) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Shared fixtures for the data script tests.
+
+The scripts import each other as top-level modules, so their folder goes on
+``sys.path`` the same way it is when they are run directly. Run with
+``python -m pytest`` from the repository root or this folder.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+COMPENDIUM_DIR = SCRIPTS_DIR.parent / "data_unused" / "compendium" / "Abilities"
+# A class with subfolders per level plus the shared level-1 abilities
+SAMPLE_CLASSES = ("Fury", "Common")
+
+
+@pytest.fixture
+def sample_compendium(tmp_path: Path) -> Path:
+    """A copy of a few compendium class folders."""
+    if not COMPENDIUM_DIR.exists():
+        pytest.skip(f"compendium not found at {COMPENDIUM_DIR}")
+    root = tmp_path / "Abilities"
+    for class_name in SAMPLE_CLASSES:
+        shutil.copytree(COMPENDIUM_DIR / class_name, root / class_name)
+    return root
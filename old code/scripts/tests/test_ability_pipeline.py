@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from ability_pipeline import ClassArraySink, JsonArraySink, TreeSink, drain, iter_source_records, simplified, transformed
+from extract_class_abilities import convert_files
+from generate_simplified_abilities import write_simplified
+
+
+def tree_bytes(root):
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in sorted(root.rglob("*")) if path.is_file()}
+
+
+def test_transformed_matches_extract_class_abilities(sample_compendium, tmp_path):
+    expected, actual = tmp_path / "converted", tmp_path / "pipeline"
+    count = convert_files(source_dir=sample_compendium, target_dir=expected, readers=1, writers=1)
+    with TreeSink(actual) as sink:
+        written = drain(transformed(iter_source_records(sample_compendium)), sink)
+    assert written == count > 0
+    assert tree_bytes(actual) == tree_bytes(expected)
+
+
+def test_simplified_matches_generate_simplified_abilities(sample_compendium, tmp_path):
+    expected, actual = tmp_path / "simplified", tmp_path / "pipeline"
+    write_simplified(sample_compendium, expected)
+    with ClassArraySink(actual) as sink:
+        drain(simplified(iter_source_records(sample_compendium)), sink)
+    assert sorted(tree_bytes(expected)) == ["common_abilities.json", "fury_abilities.json"]
+    assert tree_bytes(actual) == tree_bytes(expected)
+
+
+def test_filtered_stream_to_one_array(sample_compendium, tmp_path):
+    target = tmp_path / "fury.json"
+    records = (record for record in iter_source_records(sample_compendium) if record.class_name == "Fury")
+    with JsonArraySink(target) as sink:
+        drain(simplified(record for record in records if record.level == 1), sink)
+    abilities = json.loads(target.read_text(encoding="utf-8"))
+    assert len(abilities) == sink.count > 0
+    assert {ability["level"] for ability in abilities} == {1}
+
+
+def test_failed_run_leaves_no_output(sample_compendium, tmp_path):
+    target = tmp_path / "fury.json"
+
+    def broken(records):
+        for position, record in enumerate(records):
+            if position == 3:
+                raise RuntimeError("converter failed")
+            yield record
+
+    with pytest.raises(RuntimeError):
+        with JsonArraySink(target) as sink:
+            drain(simplified(broken(iter_source_records(sample_compendium))), sink)
+    assert not target.exists()
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from extract_class_abilities import transform_ability
+from generate_simplified_abilities import convert_ability
+
+TIERS = [
+    (3, "push 1"),
+    (6, "push 2"),
+    (9, "push 4"),
+]
+
+
+@pytest.fixture
+def brutal_slam_path(sample_compendium):
+    return sample_compendium / "Fury" / "1st-Level Features" / "Brutal Slam.json"
+
+
+@pytest.fixture
+def brutal_slam(brutal_slam_path):
+    return json.loads(brutal_slam_path.read_text(encoding="utf-8"))
+
+
+def test_transform_ability_record(brutal_slam_path, brutal_slam):
+    record = transform_ability(brutal_slam_path, brutal_slam)
+    # Slotted records carry no per-instance __dict__
+    for value in (record, record.range, record.power_roll, record.power_roll.tiers, record.power_roll.tiers.low):
+        assert not hasattr(value, "__dict__"), type(value).__name__
+
+    assert record.to_dict() == {
+        "type": "ability",
+        "id": "brutal_slam",
+        "name": "Brutal Slam",
+        "level": 1,
+        "costs": None,
+        "story_text": "The heavy impact of your weapon attacks drives your foes ever back.",
+        "keywords": ["Melee", "Strike", "Weapon"],
+        "action_type": "Main action",
+        "trigger_text": None,
+        "range": {"distance": "Melee", "area": None, "range_value": 1},
+        "targets": "One creature or object",
+        "power_roll": {
+            "label": "Power roll",
+            "characteristics": "Might",
+            "tiers": {
+                name: {
+                    "base_damage_value": base,
+                    "characteristic_damage_options": "M damage",
+                    "damage_types": None,
+                    "potencies": None,
+                    "conditions": conditions,
+                }
+                for name, (base, conditions) in zip(("low", "mid", "high"), TIERS)
+            },
+        },
+        "effect": None,
+        "special_effect": None,
+    }
+    # Field order is the order the JSON files are written in
+    assert list(record.to_dict()) == [
+        "type", "id", "name", "level", "costs", "story_text", "keywords", "action_type",
+        "trigger_text", "range", "targets", "power_roll", "effect", "special_effect",
+    ]
+
+
+def test_convert_ability_record(brutal_slam):
+    ability = convert_ability(brutal_slam, 1)
+    assert not hasattr(ability, "__dict__")
+    assert ability.to_dict() == {
+        "type": "ability",
+        "id": "brutal-slam",
+        "name": "Brutal Slam",
+        "level": 1,
+        "resource": "Signature",
+        "resource_value": 0,
+        "story_text": "The heavy impact of your weapon attacks drives your foes ever back.",
+        "keywords": "Melee/Strike/Weapon",
+        "action_type": "main action",
+        "trigger_text": "",
+        "distance": "Melee 1",
+        "targets": "One creature or object",
+        "power_roll": "Power Roll + Might",
+        "tier_effects": [
+            {"tier1": "3 + M damage; push 1", "tier2": "6 + M damage; push 2", "tier3": "9 + M damage; push 4"}
+        ],
+        "effect": "",
+        "special_effect": "",
+    }
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from backup_store import BackupStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    source = tmp_path / "data"
+    (source / "abilities").mkdir(parents=True)
+    (source / "abilities" / "fury.json").write_text('[{"id": "a"}]', encoding="utf-8")
+    (source / "notes.json").write_text("{}", encoding="utf-8")
+    store = BackupStore(tmp_path / "store")
+    store.take(source, "first")
+    return store
+
+
+def test_restore_round_trip(store, tmp_path):
+    target = tmp_path / "restored"
+    counts = store.restore("first", target)
+    assert counts["written"] == 2
+    assert (target / "abilities" / "fury.json").read_text(encoding="utf-8") == '[{"id": "a"}]'
+    assert not list(store.snapshots.glob(".snapshot.*"))
+
+
+@pytest.mark.parametrize("relative", ["../escaped.json", "abilities/../../escaped.json", "/tmp/escaped.json", "."])
+def test_restore_rejects_paths_outside_the_target(store, tmp_path, relative):
+    path = store.snapshot_path("first")
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    manifest["files"][relative] = next(iter(manifest["files"].values()))
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    target = tmp_path / "restored"
+    with pytest.raises(ValueError, match="outside the target"):
+        store.restore("first", target)
+    assert not (tmp_path / "escaped.json").exists()
+    assert not target.exists()
+
+
+def test_restore_rejects_invalid_hashes(store, tmp_path):
+    path = store.snapshot_path("first")
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    manifest["files"]["notes.json"]["hash"] = "../../../../etc/passwd"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="invalid hash"):
+        store.restore("first", tmp_path / "restored")
@@ -0,0 +1,57 @@
+import pytest
+
+import build
+from build import REPO_ROOT, SCRIPTS_DIR, Step
+
+
+@pytest.fixture
+def isolated_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(build, "STATE_FILE", tmp_path / "state.json")
+
+
+def help_step(name, inputs, deps=()):
+    """A step that only prints the tools.py help, so running it is harmless."""
+    return Step(
+        name=name,
+        script=SCRIPTS_DIR / "tools.py",
+        cwd=SCRIPTS_DIR,
+        inputs=list(inputs),
+        outputs=[],
+        deps=list(deps),
+        args=["--help"],
+    )
+
+
+def test_declared_inputs_exist():
+    for step in build.STEPS:
+        assert step.script.is_file(), step.name
+        assert not [
+            pattern for pattern in step.inputs if not any(path.is_file() for path in REPO_ROOT.glob(pattern))
+        ], step.name
+
+
+def test_step_with_unmatched_input_fails(isolated_state, monkeypatch, capsys):
+    monkeypatch.setattr(
+        build,
+        "STEPS",
+        [
+            help_step("present", ["old code/scripts/json_stream.py"]),
+            help_step("missing", ["old code/no_such_folder/**/*.json"]),
+            help_step("downstream", [], deps=["missing"]),
+        ],
+    )
+
+    assert build.build([]) == 1
+    out = capsys.readouterr().out
+    assert "input matched no files: old code/no_such_folder/**/*.json" in out
+    assert "missing     failed" in out
+    assert "downstream  blocked" in out
+    assert "present     built" in out
+
+
+def test_unchanged_step_is_up_to_date(isolated_state, monkeypatch, capsys):
+    monkeypatch.setattr(build, "STEPS", [help_step("present", ["old code/scripts/json_stream.py"])])
+
+    assert build.build([]) == 0
+    assert build.build([]) == 0
+    assert "up to date" in capsys.readouterr().out
@@ -0,0 +1,36 @@
+import sqlite3
+
+import pytest
+
+from build_asset_database import APP_DIR, build_database
+from extract_class_abilities import convert_files
+
+
+def test_missing_class_abilities_dir_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        build_database(tmp_path / "assets.db", APP_DIR, tmp_path / "missing")
+    assert not (tmp_path / "assets.db").exists()
+
+
+def test_empty_class_abilities_dir_fails(tmp_path):
+    (tmp_path / "empty").mkdir()
+    with pytest.raises(FileNotFoundError):
+        build_database(tmp_path / "assets.db", APP_DIR, tmp_path / "empty")
+
+
+def test_ability_details_rows_match_converted_files(sample_compendium, tmp_path):
+    converted = tmp_path / "class_abilities_new"
+    count = convert_files(source_dir=sample_compendium, target_dir=converted)
+    assert count > 0
+
+    stats = build_database(tmp_path / "assets.db", APP_DIR, converted)
+    assert stats["ability_details"] == count
+
+    connection = sqlite3.connect(tmp_path / "assets.db")
+    try:
+        (rows,) = connection.execute("SELECT COUNT(*) FROM ability_details").fetchone()
+        (fury,) = connection.execute("SELECT COUNT(*) FROM ability_details WHERE source_path LIKE 'Fury/%'").fetchone()
+    finally:
+        connection.close()
+    assert rows == count
+    assert fury > 0
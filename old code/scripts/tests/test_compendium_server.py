@@ -0,0 +1,84 @@
+import http.client
+import json
+import os
+import shutil
+
+import pytest
+
+from build_asset_database import APP_DIR
+from compendium_server import SIMPLIFIED_ABILITIES, WarmData, start
+
+FURY_ABILITIES = APP_DIR / "data" / SIMPLIFIED_ABILITIES / "fury_abilities.json"
+
+
+@pytest.fixture
+def data(sample_compendium, tmp_path):
+    """Warm data over a one-file app bundle and the sample compendium."""
+    if not FURY_ABILITIES.exists():
+        pytest.skip(f"simplified abilities not found at {FURY_ABILITIES}")
+    app_dir = tmp_path / "app"
+    abilities_dir = app_dir / "data" / SIMPLIFIED_ABILITIES
+    abilities_dir.mkdir(parents=True)
+    shutil.copy(FURY_ABILITIES, abilities_dir)
+    (app_dir / "pubspec.yaml").write_text(
+        f"flutter:\n  assets:\n    - data/{SIMPLIFIED_ABILITIES}/\n", encoding="utf-8"
+    )
+    return WarmData(app_dir, sample_compendium, tmp_path / "index.pickle")
+
+
+def get(server, path):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def server(data):
+    server, stop = start(data, "127.0.0.1", 0, poll=0)
+    yield server
+    stop.set()
+    server.shutdown()
+
+
+def test_features_follow_the_compendium_dir(data, sample_compendium):
+    assert data.features_dir == sample_compendium.parent / "Features"
+
+
+def test_level_below_one_is_rejected(server):
+    status, _ = get(server, "/abilities?class=fury&level=0")
+    assert status == 400
+    status, abilities = get(server, "/abilities?class=fury&level=1")
+    assert status == 200 and abilities
+
+
+def test_component_id_is_unquoted(server, data):
+    ability_id = next(iter(data.components))
+    encoded = "".join(f"%{byte:02X}" for byte in ability_id.encode("utf-8"))
+    status, component = get(server, f"/component/{encoded}")
+    assert status == 200
+    assert component["id"] == ability_id
+
+
+def test_half_written_file_keeps_previous_tables(data, capsys):
+    path = data.abilities_dir / "fury_abilities.json"
+    good = path.read_text(encoding="utf-8")
+    components, availability = data.components, data.availability
+
+    path.write_text(good[: len(good) // 2], encoding="utf-8")
+    os.utime(path, ns=(0, 1))
+    data.refresh()
+    assert data.components == components
+    assert data.availability is availability
+    assert path.as_posix() in data.failures
+    assert "Keeping the previous data" in capsys.readouterr().out
+
+    path.write_text(good, encoding="utf-8")
+    data.refresh()
+    assert data.failures == {}
+    assert data.components == components
+    assert data.availability == availability
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import extract_class_abilities
+from extract_class_abilities import PipelineStats, convert_files, transform_ability
+
+
+def sequential(source_dir):
+    """What the one-file-at-a-time converter wrote for every file under ``source_dir``."""
+    expected = {}
+    for path in sorted(source_dir.rglob("*.json")):
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        record = transform_ability(path.relative_to(source_dir), data)
+        expected[path.relative_to(source_dir).as_posix()] = json.dumps(record.to_dict(), indent=2, ensure_ascii=True) + "\n"
+    return expected
+
+
+def written(target_dir):
+    return {
+        path.relative_to(target_dir).as_posix(): path.read_text(encoding="utf-8")
+        for path in sorted(target_dir.rglob("*.json"))
+    }
+
+
+@pytest.mark.parametrize("readers, writers, queue_size", [(1, 1, 1), (4, 4, 2), (8, 2, 64)])
+def test_pipeline_matches_sequential_conversion(sample_compendium, tmp_path, readers, writers, queue_size):
+    target = tmp_path / "out"
+    stats = PipelineStats()
+    count = convert_files(
+        source_dir=sample_compendium,
+        target_dir=target,
+        readers=readers,
+        writers=writers,
+        queue_size=queue_size,
+        stats=stats,
+    )
+    expected = sequential(sample_compendium)
+    assert count == len(expected)
+    assert written(target) == expected
+    assert stats.quarantined == []
+
+
+def test_no_overwrite_keeps_existing_files(sample_compendium, tmp_path):
+    target = tmp_path / "out"
+    convert_files(source_dir=sample_compendium, target_dir=target)
+    kept = next(target.rglob("*.json"))
+    kept.write_text("{}\n", encoding="utf-8")
+
+    convert_files(overwrite=False, source_dir=sample_compendium, target_dir=target)
+    assert kept.read_text(encoding="utf-8") == "{}\n"
+
+
+def test_transform_error_stops_the_pipeline(sample_compendium, tmp_path, monkeypatch):
+    def failing(path, data):
+        raise KeyError(path.name)
+
+    monkeypatch.setattr(extract_class_abilities, "transform_ability", failing)
+    with pytest.raises(KeyError):
+        convert_files(source_dir=sample_compendium, target_dir=tmp_path / "out", queue_size=1)
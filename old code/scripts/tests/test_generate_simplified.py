@@ -0,0 +1,17 @@
+import json
+
+from generate_simplified_abilities import write_simplified
+
+
+def read_tree(root):
+    return {path.name: path.read_bytes() for path in sorted(root.glob("*.json"))}
+
+
+def test_compact_output_decodes_to_the_same_records(sample_compendium, tmp_path):
+    pretty, compact = tmp_path / "pretty", tmp_path / "compact"
+    write_simplified(sample_compendium, pretty)
+    write_simplified(sample_compendium, compact, compact=True)
+    for name, data in read_tree(pretty).items():
+        minified = (compact / name).read_bytes()
+        assert len(minified) < len(data)
+        assert json.loads(minified) == json.loads(data)
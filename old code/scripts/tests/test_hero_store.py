@@ -0,0 +1,82 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from hero_store import INT_MISSING, TEXT_MISSING, HeroStore, HeroStoreWriter, _column_name, level_by_class
+
+
+def hero(name, values, entries=()):
+    return {
+        "hero": {"name": name},
+        "values": [{"key": key, "value": value} for key, value in values],
+        "entries": [{"entry_type": entry_type, "entry_id": entry_id} for entry_type, entry_id in entries],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    writer = HeroStoreWriter()
+    # Repeated key: the last value wins and later heroes stay aligned
+    writer.add(hero("Ash", [("basics.level", 1), ("basics.level", 2)], [("class", "fury")]), "a.json")
+    writer.add(hero("Birch", [("basics.level", 5), ("stats.might", 2)], [("class", "fury")]), "b.json")
+    # Missing keys are padded
+    writer.add(hero("Cedar", [("stats.might", 3)], [("class", "censor")]), "c.json")
+    # Several entries of one type: the first is the hero's
+    writer.add(hero("Dale", [("basics.level", 3), ("basics.level", None)], [("class", "censor"), ("class", "fury")]), "d.json")
+    writer.write(tmp_path / "store")
+    return HeroStore(tmp_path / "store")
+
+
+def test_value_columns_have_one_row_per_hero(store):
+    kind, levels = store.value("basics.level")
+    assert kind == "int32"
+    assert levels.tolist() == [2, 5, INT_MISSING, INT_MISSING]
+    _, might = store.value("stats.might")
+    assert might.tolist() == [INT_MISSING, 2, 3, INT_MISSING]
+    assert store.manifest["heroes"] == 4
+
+
+def test_entries_point_at_their_hero(store):
+    classes = store.hero_entry("class")
+    assert [store.entry_name(int(code)) for code in classes] == ["fury", "fury", "censor", "censor"]
+    assert store.hero_entry("kit").tolist() == [TEXT_MISSING] * 4
+
+
+def test_level_by_class_uses_aligned_rows(store):
+    classes, levels, counts = level_by_class(store)
+    assert classes == ["fury"]
+    assert levels == [2, 5]
+    assert counts.tolist() == [[1, 1]]
+
+
+def test_column_names_do_not_collide():
+    keys = ["a/b", "a_b", "a~2Fb", "a b", "a.b", "é"]
+    names = [_column_name(key) for key in keys]
+    assert len(set(names)) == len(keys)
+    assert all(set(name) <= set("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz._-~") for name in names)
+    assert _column_name("a_b") == "a_b"
+
+
+def test_keys_differing_only_in_case_are_rejected(tmp_path):
+    writer = HeroStoreWriter()
+    writer.add(hero("Ash", [("Might", 1), ("might", 2)]), "a.json")
+    with pytest.raises(ValueError, match="same column file"):
+        writer.write(tmp_path / "store")
+    assert not (tmp_path / "store").exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_write_keeps_the_previous_store(store, tmp_path):
+    writer = HeroStoreWriter()
+    writer.add(hero("Elm", [("Might", 1), ("might", 2)]), "e.json")
+    with pytest.raises(ValueError):
+        writer.write(tmp_path / "store")
+    assert HeroStore(tmp_path / "store").manifest["heroes"] == 4
+
+    writer = HeroStoreWriter()
+    writer.add(hero("Elm", [("basics.level", 7)]), "e.json")
+    writer.write(tmp_path / "store")
+    rewritten = HeroStore(tmp_path / "store")
+    assert rewritten.manifest["heroes"] == 1
+    assert rewritten.value("basics.level")[1].tolist() == [7]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["store"]
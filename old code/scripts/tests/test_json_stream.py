@@ -0,0 +1,68 @@
+import io
+import json
+
+import pytest
+
+from json_stream import JsonArrayError, JsonArrayWriter, iter_json_array
+
+
+ITEMS = [
+    {"name": "Back Blast", "keywords": ["Melee", "Strike"], "level": 1},
+    {"name": "Ünïcode \"quoted\" [brackets] {braces}", "nested": {"list": [1, 2.5, None, True]}},
+    [],
+    "plain string",
+    0,
+]
+
+
+@pytest.mark.parametrize("indent", [2, None])
+def test_writer_matches_json_dump(tmp_path, indent):
+    path = tmp_path / "items.json"
+    with JsonArrayWriter(path, indent=indent) as writer:
+        for item in ITEMS:
+            writer.write(item)
+    expected = json.dumps(ITEMS, indent=indent, ensure_ascii=False)
+    assert path.read_text(encoding="utf-8") == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_round_trip(tmp_path, chunk_size):
+    path = tmp_path / "items.json"
+    with JsonArrayWriter(path) as writer:
+        for item in ITEMS:
+            writer.write(item)
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == ITEMS
+
+
+def test_empty_array_round_trip(tmp_path):
+    path = tmp_path / "empty.json"
+    with JsonArrayWriter(path):
+        pass
+    assert path.read_text(encoding="utf-8") == "[]"
+    assert list(iter_json_array(path)) == []
+
+
+def test_rewrite_in_place_while_streaming(tmp_path):
+    path = tmp_path / "items.json"
+    path.write_text(json.dumps(ITEMS, indent=2), encoding="utf-8")
+    with JsonArrayWriter(path) as writer:
+        for item in iter_json_array(path):
+            writer.write({"wrapped": item})
+    assert json.loads(path.read_text(encoding="utf-8")) == [{"wrapped": item} for item in ITEMS]
+
+
+def test_abort_keeps_the_target(tmp_path):
+    path = tmp_path / "items.json"
+    path.write_text("[1]", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with JsonArrayWriter(path) as writer:
+            writer.write(2)
+            raise RuntimeError("stop")
+    assert path.read_text(encoding="utf-8") == "[1]"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize("text", ['{"a": 1}', "[1, 2", "[1 2]", "[1] 3"])
+def test_malformed_arrays_raise(text):
+    with pytest.raises(JsonArrayError):
+        list(iter_json_array(io.StringIO(text)))
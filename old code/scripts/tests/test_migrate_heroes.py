@@ -0,0 +1,135 @@
+import json
+
+import pytest
+
+import migrate_heroes
+from migrate_heroes import FORMAT_VERSION, migrate_file, migrate_hero, migration, rename_entries, rename_value_key
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Two chained migrations, FORMAT_VERSION -> +1 -> +2, registered on an empty registry."""
+    monkeypatch.setattr(migrate_heroes, "MIGRATIONS", {})
+
+    @migration(FORMAT_VERSION)
+    def rename_wealth(hero):
+        rename_value_key(hero, "score.wealth", "score.treasure")
+        return hero
+
+    @migration(FORMAT_VERSION + 1)
+    def rename_perk(hero):
+        rename_entries(hero, "perk", {"old_perk": "new_perk"})
+        return hero
+
+    return migrate_heroes.MIGRATIONS
+
+
+def sample_hero(version=FORMAT_VERSION):
+    return {
+        "format_version": version,
+        "hero": {"name": "Ash"},
+        "values": [{"key": "score.wealth", "value": 2}, {"key": "basics.level", "value": 3}],
+        "entries": [{"entry_type": "perk", "entry_id": "old_perk"}, {"entry_type": "kit", "entry_id": "old_perk"}],
+    }
+
+
+def test_current_version_counts_registered_steps(registry):
+    assert migrate_heroes.current_version() == FORMAT_VERSION + 2
+
+
+def test_migrations_chain_in_order(registry):
+    hero, original = migrate_hero(sample_hero(), FORMAT_VERSION + 2)
+    assert original == FORMAT_VERSION
+    assert hero["format_version"] == FORMAT_VERSION + 2
+    assert [item["key"] for item in hero["values"]] == ["score.treasure", "basics.level"]
+    assert [entry["entry_id"] for entry in hero["entries"]] == ["new_perk", "old_perk"]
+
+
+def test_chain_starts_at_the_hero_version(registry):
+    hero, original = migrate_hero(sample_hero(FORMAT_VERSION + 1), FORMAT_VERSION + 2)
+    assert original == FORMAT_VERSION + 1
+    # The first step did not run
+    assert hero["values"][0]["key"] == "score.wealth"
+    assert hero["entries"][0]["entry_id"] == "new_perk"
+
+
+def test_partial_target(registry):
+    hero, _ = migrate_hero(sample_hero(), FORMAT_VERSION + 1)
+    assert hero["format_version"] == FORMAT_VERSION + 1
+    assert hero["entries"][0]["entry_id"] == "old_perk"
+
+
+def test_errors(registry):
+    with pytest.raises(ValueError, match="no migration registered"):
+        migrate_hero(sample_hero(FORMAT_VERSION - 1), FORMAT_VERSION + 2)
+    with pytest.raises(ValueError, match="newer than the target"):
+        migrate_hero(sample_hero(FORMAT_VERSION + 2), FORMAT_VERSION)
+    with pytest.raises(ValueError, match="already registered"):
+        migration(FORMAT_VERSION)(lambda hero: hero)
+
+
+def test_migrate_file_writes_json(registry, tmp_path):
+    source = tmp_path / "hero.json"
+    source.write_text(json.dumps(sample_hero()), encoding="utf-8")
+    destination = tmp_path / "out" / "hero.json"
+    [(_, name, original, status, _)] = migrate_file((str(source), str(destination), FORMAT_VERSION + 2, False))
+    assert (name, original, status) == ("Ash", FORMAT_VERSION, "migrated")
+    assert json.loads(destination.read_text(encoding="utf-8"))["format_version"] == FORMAT_VERSION + 2
+
+    # Already current: copied byte for byte
+    [(_, _, _, status, _)] = migrate_file((str(destination), str(tmp_path / "again.json"), FORMAT_VERSION + 2, False))
+    assert status == "current"
+    assert (tmp_path / "again.json").read_bytes() == destination.read_bytes()
+
+
+def test_migrate_code_file_keeps_other_lines(registry, tmp_path):
+    from generate_import_codes import generate_hero_code
+    from validate_heroes import decode_hero_code
+
+    source = tmp_path / "codes.txt"
+    source.write_text(f"# Ash\n{generate_hero_code(sample_hero())}\n\nnot a code\n", encoding="utf-8")
+    outcomes = migrate_file((str(source), str(source), FORMAT_VERSION + 2, False))
+    assert [status for _, _, _, status, _ in outcomes] == ["migrated"]
+
+    lines = source.read_text(encoding="utf-8").split("\n")
+    assert lines[0] == "# Ash" and lines[2:] == ["", "not a code", ""]
+    assert decode_hero_code(lines[1])["format_version"] == FORMAT_VERSION + 2
+
+
+def test_a_failing_migration_fails_only_that_hero(monkeypatch, tmp_path):
+    from generate_import_codes import generate_hero_code
+
+    monkeypatch.setattr(migrate_heroes, "MIGRATIONS", {})
+
+    @migration(FORMAT_VERSION)
+    def needs_class(hero):
+        hero["class"] = hero["hero"]["class"]
+        return hero
+
+    bad = sample_hero()
+    good = sample_hero()
+    good["hero"]["class"] = "fury"
+    source = tmp_path / "codes.txt"
+    source.write_text(f"{generate_hero_code(bad)}\n{generate_hero_code(good)}\n", encoding="utf-8")
+
+    outcomes = migrate_file((str(source), str(source), FORMAT_VERSION + 1, False))
+    assert [status for _, _, _, status, _ in outcomes] == ["failed", "migrated"]
+    assert outcomes[0][4].startswith("KeyError")
+    assert not list(tmp_path.glob("*.tmp"))
+
+    (tmp_path / "hero.json").write_text(json.dumps(bad), encoding="utf-8")
+    [(_, _, _, status, error)] = migrate_file((str(tmp_path / "hero.json"), str(tmp_path / "hero.json"), FORMAT_VERSION + 1, False))
+    assert status == "failed" and error.startswith("KeyError")
+
+
+def test_undecodable_code_file_leaves_no_temp_file(registry, tmp_path):
+    source = tmp_path / "codes.txt"
+    original = b"HERO:abc\n\xff\xfe not utf-8\n"
+    source.write_bytes(original)
+    destination = tmp_path / "out" / "codes.txt"
+
+    outcomes = migrate_file((str(source), str(destination), FORMAT_VERSION + 2, False))
+    assert outcomes[-1][3] == "failed"
+    assert not destination.exists()
+    assert not list((tmp_path / "out").glob("*.tmp"))
+    assert source.read_bytes() == original
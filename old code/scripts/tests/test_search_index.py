@@ -0,0 +1,107 @@
+import json
+import pickle
+
+import pytest
+
+from search_index import INDEX_VERSION, SearchIndex, contains_phrase, data_documents, parse_query
+
+
+RECORDS = [
+    {"id": "burst-10", "name": "Fire Burst", "distance": "3 cube within 10", "effect": "Each target is restrained."},
+    {"id": "burst-1", "name": "Ice Burst", "distance": "2 cube within 1", "effect": "Each target is slowed."},
+    {"id": "melee", "name": "Cold Strike", "distance": "Melee 1", "effect": "The target is prone and restrained."},
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    data_dir = tmp_path / "data"
+    (data_dir / "abilities").mkdir(parents=True)
+    path = data_dir / "abilities" / "sample_abilities.json"
+    path.write_text(json.dumps(RECORDS), encoding="utf-8")
+    built = SearchIndex()
+    built.update([("data/abilities/sample_abilities.json", path, data_dir, data_documents)])
+    return built
+
+
+def ids(index, query):
+    return sorted(index.docs[doc_id]["id"] for doc_id in index.search(query))
+
+
+def test_phrase_matches_raw_distance_text(index):
+    assert ids(index, '"within 10"') == ["burst-10"]
+    assert ids(index, 'distance:"within 10"') == ["burst-10"]
+
+
+def test_phrase_respects_token_boundaries(index):
+    assert ids(index, '"within 1"') == ["burst-1"]
+
+
+def test_field_queries(index):
+    assert ids(index, "restrained") == ["burst-10", "melee"]
+    assert ids(index, "name:burst") == ["burst-1", "burst-10"]
+    assert ids(index, "distance:melee") == ["melee"]
+    assert ids(index, "name:restrained") == []
+
+
+def test_negation_and_or(index):
+    assert ids(index, "restrained -prone") == ["burst-10"]
+    assert ids(index, "restrained NOT name:fire") == ["melee"]
+    assert ids(index, "name:ice OR name:cold") == ["burst-1", "melee"]
+
+
+def test_contains_phrase_does_not_span_lines():
+    assert contains_phrase("Ranged\n3 cube within 10", ["within", "10"])
+    assert not contains_phrase("Ranged\n3 cube", ["ranged", "3"])
+    assert not contains_phrase("within 10", ["within", "1"])
+
+
+def test_parse_query():
+    assert parse_query('conditions:restrained "within 10" -prone OR fire') == [
+        [(False, "conditions", "restrained"), (False, None, "within 10"), (True, None, "prone")],
+        [(False, None, "fire")],
+    ]
+
+
+def test_saved_index_is_plain_data(index, tmp_path):
+    path = tmp_path / "index.pickle"
+    index.save(path)
+    with path.open("rb") as handle:
+        state = pickle.load(handle)
+    assert isinstance(state, dict) and state["version"] == INDEX_VERSION
+
+    loaded = SearchIndex.load(path)
+    assert loaded.files == index.files
+    assert ids(loaded, '"within 10"') == ["burst-10"]
+
+
+def test_incompatible_index_file_starts_empty(tmp_path):
+    path = tmp_path / "index.pickle"
+    path.write_bytes(pickle.dumps({"version": INDEX_VERSION - 1}))
+    assert SearchIndex.load(path).docs == {}
+
+
+def test_clauses_without_terms_match_nothing(index):
+    for query in ("(", '"', "class:", '""', "-("):
+        assert ids(index, query) == [], query
+    assert ids(index, "restrained (") == ["burst-10", "melee"]
+    assert ids(index, "class: OR slowed") == ["burst-1"]
+
+
+def test_loader_error_skips_the_file(tmp_path, capsys):
+    good = tmp_path / "good.json"
+    good.write_text(json.dumps(RECORDS), encoding="utf-8")
+    bad = tmp_path / "bad.json"
+    bad.write_text("{}", encoding="utf-8")
+
+    def failing_loader(path, root):
+        raise KeyError("effects")
+
+    built = SearchIndex()
+    counts = built.update([
+        ("bad.json", bad, tmp_path, failing_loader),
+        ("good.json", good, tmp_path, data_documents),
+    ])
+    assert counts["failed"] == 1
+    assert counts["documents"] == len(RECORDS)
+    assert "Skipping bad.json: KeyError" in capsys.readouterr().err
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+import extract_class_abilities
+from extract_class_abilities import (
+    _parse_tier_text_uncached,
+    clear_parse_caches,
+    parse_cache_stats,
+    parse_tier_text,
+)
+
+
+@pytest.fixture
+def tier_texts(sample_compendium):
+    texts = []
+    for path in sorted(sample_compendium.rglob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for effect in data.get("effects", []):
+            texts.extend(effect[key] for key in ("tier1", "tier2", "tier3") if effect.get(key))
+    assert texts
+    return texts
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    clear_parse_caches()
+    yield
+    clear_parse_caches()
+
+
+def test_cached_parse_matches_the_regex_parse(tier_texts):
+    # Twice, so the second pass is served from the text and shape caches
+    for _ in range(2):
+        for text in tier_texts:
+            assert parse_tier_text(text) == _parse_tier_text_uncached(text), text
+    stats = parse_cache_stats()
+    assert stats["exact_hits"] >= len(tier_texts)
+
+
+def test_shape_template_reuses_numbers():
+    first = parse_tier_text("4 + M damage; push 2")
+    second = parse_tier_text("7 + M damage; push 3")
+    third = parse_tier_text("9 + M damage; push 5")
+    assert third == _parse_tier_text_uncached("9 + M damage; push 5")
+    assert (first.base_damage_value, second.base_damage_value, third.base_damage_value) == (4, 7, 9)
+    assert parse_cache_stats()["shape_hits"] == 1
+
+
+def test_caches_are_bounded(tier_texts, monkeypatch):
+    monkeypatch.setattr(extract_class_abilities, "PARSE_CACHE_LIMIT", 8)
+    for text in tier_texts:
+        assert parse_tier_text(text) == _parse_tier_text_uncached(text), text
+    stats = parse_cache_stats()
+    assert len(set(tier_texts)) > 8
+    assert stats["texts"] <= 8
+    assert stats["shapes"] <= 8
+    assert stats["distinct_tiers"] <= 8
@@ -0,0 +1,65 @@
+import json
+
+from extract_class_abilities import convert_files
+from validate_abilities import detect_schema, validate_file, validate_paths
+
+SIMPLIFIED = {
+    "type": "ability",
+    "id": "brutal_slam",
+    "name": "Brutal Slam",
+    "level": 1,
+    "resource": "",
+    "resource_value": 0,
+    "story_text": "",
+    "keywords": "Melee, Strike, Weapon",
+    "action_type": "main action",
+    "trigger_text": None,
+    "distance": "Melee 1",
+    "targets": "One creature or object",
+    "power_roll": "Power Roll + Might",
+    "tier_effects": [{"tier1": "3 + M damage"}],
+    "effect": None,
+    "special_effect": None,
+}
+
+
+def write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def test_converted_sample_is_valid(sample_compendium, tmp_path):
+    converted = tmp_path / "converted"
+    count = convert_files(source_dir=sample_compendium, target_dir=converted)
+
+    total, results = validate_paths([converted], jobs=1)
+    assert total == count
+    assert results == {}
+
+
+def test_malformed_class_record_is_rejected(sample_compendium, tmp_path):
+    converted = tmp_path / "converted"
+    convert_files(source_dir=sample_compendium, target_dir=converted)
+    path = next(converted.rglob("*.json"))
+    record = json.loads(path.read_text(encoding="utf-8"))
+    record["level"] = 0
+    record["keywords"] = "Melee"
+    del record["id"]
+    write(path, record)
+
+    _, violations = validate_file(path)
+    assert violations == [
+        ("<record>", "missing required field 'id'"),
+        ("level", "0 is below the minimum 1"),
+        ("keywords", "expected array, got str"),
+    ]
+
+
+def test_simplified_record_without_tier_effects_is_checked_as_simplified(tmp_path):
+    record = dict(SIMPLIFIED)
+    del record["tier_effects"]
+    assert detect_schema(record) == "simplified"
+
+    count, violations = validate_file(write(tmp_path / "fury_abilities.json", [SIMPLIFIED, record]))
+    assert count == 2
+    assert violations == [("[1]", "missing required field 'tier_effects'")]
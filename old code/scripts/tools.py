@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Single command line entry point for the data scripts.
+
+Each subcommand maps to one script and is only imported when it is invoked,
+so ``tools.py --help`` and every subcommand start without loading the others.
+Arguments after the subcommand name go to the script unchanged, and every
+script accepts its source and target folders as options:
+
+    python tools.py extract --source-dir ../data_unused/compendium/Abilities --target-dir /tmp/out
+    python tools.py simplify --compendium-dir ... --output-dir ...
+    python tools.py search query 'conditions:restrained'
+    python tools.py validate-heroes exports/ -j 8
+    python tools.py bench-startup            # import and --help time of every subcommand
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, NamedTuple, Optional
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+TEST_HEROES_DIR = SCRIPTS_DIR.parent / "test_heroes"
+
+
+class Command(NamedTuple):
+    module: str
+    help: str
+    path: Optional[Path] = None  # for scripts outside this folder
+
+
+COMMANDS: Dict[str, Command] = {
+    "build": Command("build", "Run the pipeline steps that are out of date"),
+    "extract": Command("extract_class_abilities", "Convert compendium abilities to the class ability schema"),
+    "simplify": Command("generate_simplified_abilities", "Generate the simplified <class>_abilities.json files"),
+    "add-subclass": Command("add_subclass_to_abilities", "Add subclass fields to class ability files"),
+    "pipeline": Command("ability_pipeline", "Stream compendium abilities through the converters"),
+    "validate": Command("validate_abilities", "Validate generated abilities against their schema"),
+    "availability": Command("build_ability_availability", "Build the class/level/subclass ability lookup table"),
+    "asset-db": Command("build_asset_database", "Build the prebuilt SQLite asset database"),
+    "budget": Command("asset_budget", "Check asset sizes and decode times against the budget"),
+    "archive": Command("archive_io", "Pack archives and benchmark archive vs folder conversion"),
+    "search": Command("search_index", "Search abilities and data records"),
+    "serve": Command("compendium_server", "Warm-cache localhost server for compendium and app data lookups"),
+    "perf": Command("perf_harness", "Run the pipeline on 1x/10x/100x content against the perf baseline"),
+    "diff": Command("snapshot_diff", "Record-level diff between data snapshots"),
+    "backup": Command("backup_store", "Deduplicated data snapshots"),
+    "damage": Command("damage_analytics", "Damage balance summaries (needs NumPy)"),
+    "simulate": Command("power_roll_sim", "Monte Carlo power rolls for abilities and heroes (needs NumPy)"),
+    "validate-heroes": Command("validate_heroes", "Validate hero exports against the data"),
+    "migrate-heroes": Command("migrate_heroes", "Migrate hero exports and HERO: codes to the current format_version"),
+    "hero-store": Command("hero_store", "Columnar hero store and aggregate queries (needs NumPy)"),
+    "check-conduit": Command("check_conduit_option_duplicates", "Report duplicate conduit feature options"),
+    "check-features": Command("check_feature_option_duplicates", "Report duplicate class feature options"),
+    "regex-fuzz": Command("regex_fuzz", "Fuzz the ability text regexes for catastrophic backtracking"),
+    "near-dups": Command("near_duplicates", "Find near-duplicate records with MinHash/LSH"),
+    "ancestry-descriptions": Command("update_ancestry_descriptions", "Copy ancestry descriptions from the TS compendium"),
+    "import-codes": Command(
+        "generate_import_codes", "Generate HERO: import codes for the test heroes", TEST_HEROES_DIR / "generate_import_codes.py"
+    ),
+}
+BUILTINS = {"bench-startup": "Measure import and --help time of every subcommand"}
+
+
+def load_command(name: str) -> ModuleType:
+    command = COMMANDS[name]
+    if command.path is None:
+        if str(SCRIPTS_DIR) not in sys.path:
+            sys.path.insert(0, str(SCRIPTS_DIR))
+        return importlib.import_module(command.module)
+    spec = importlib.util.spec_from_file_location(command.module, command.path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[command.module] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_command(name: str, argv: List[str]) -> None:
+    module = load_command(name)
+    # The scripts parse sys.argv themselves
+    sys.argv = [f"tools.py {name}", *argv]
+    module.main()
+
+
+def print_usage() -> None:
+    print("usage: tools.py <command> [args...]\n\ncommands:")
+    width = max(len(name) for name in [*COMMANDS, *BUILTINS])
+    for name, command in COMMANDS.items():
+        print(f"  {name:<{width}}  {command.help}")
+    for name, text in BUILTINS.items():
+        print(f"  {name:<{width}}  {text}")
+    print("\nRun 'tools.py <command> --help' for the options of a command.")
+
+
+# -----------------------------------------------------------------------------
+# Startup benchmark
+# -----------------------------------------------------------------------------
+
+def _best_wall_ms(command: List[str], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+_IMPORT_PROBE = (
+    "import sys, time; sys.path.insert(0, sys.argv[1]); import tools; "
+    "started = time.perf_counter(); tools.load_command(sys.argv[2]); "
+    "print((time.perf_counter() - started) * 1000)"
+)
+
+
+def _best_import_ms(name: str, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE, str(SCRIPTS_DIR), name],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        try:
+            best = min(best, float(result.stdout.strip().splitlines()[-1]))
+        except (ValueError, IndexError):
+            return float("nan")
+    return best
+
+
+def bench_startup(argv: List[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="tools.py bench-startup", description=BUILTINS["bench-startup"])
+    parser.add_argument("commands", nargs="*", help="Subcommands to measure (default: all).")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per measurement; the best is kept.")
+    args = parser.parse_args(argv)
+    names = args.commands or list(COMMANDS)
+    unknown = [name for name in names if name not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown command(s): {', '.join(unknown)}")
+
+    tools = str(SCRIPTS_DIR / "tools.py")
+    interpreter = _best_wall_ms([sys.executable, "-c", "pass"], args.repeats)
+    bare = _best_wall_ms([sys.executable, tools, "--help"], args.repeats)
+    print(f"{'python -c pass':<24} {interpreter:>8.1f} ms")
+    print(f"{'tools.py --help':<24} {bare:>8.1f} ms  (+{bare - interpreter:.1f} ms over the interpreter)\n")
+    print(f"{'Command':<24} {'import ms':>10} {'--help ms':>10}")
+    print("-" * 46)
+    for name in names:
+        imported = _best_import_ms(name, args.repeats)
+        helped = _best_wall_ms([sys.executable, tools, name, "--help"], args.repeats)
+        print(f"{name:<24} {imported:>10.1f} {helped:>10.1f}")
+
+
+def main() -> None:
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print_usage()
+        return
+    name, argv = sys.argv[1], sys.argv[2:]
+    if name == "bench-startup":
+        bench_startup(argv)
+    elif name in COMMANDS:
+        run_command(name, argv)
+    else:
+        print(f"tools.py: unknown command '{name}'\n", file=sys.stderr)
+        print_usage()
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,24 @@
 Script to update ancestry_traits.json with descriptions from TypeScript source files.
 
 This script:
-1. Reads TypeScript ancestry files from data_unused/compendium/Ancestries/
+1. Reads TypeScript ancestry files from old code/data_unused/compendium/Ancestries/
 2. Extracts signature feature descriptions and trait descriptions
-3. Updates the corresponding entries in data/story/ancestries/ancestry_traits.json
+3. Updates the corresponding entries in hero_smith/data/story/ancestries/ancestry_traits.json
 
 Matching is done by name (case-insensitive).
 """
 
+import argparse
 import os
 import re
 import json
+import sys
 from pathlib import Path
 
 # Base paths
-SCRIPT_DIR = Path(__file__).parent
-TS_DIR = SCRIPT_DIR / "hero_smith" / "data_unused" / "compendium" / "Ancestries"
-JSON_FILE = SCRIPT_DIR / "hero_smith" / "data" / "story" / "ancestries" / "ancestry_traits.json"
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+TS_DIR = REPO_ROOT / "old code" / "data_unused" / "compendium" / "Ancestries"
+JSON_FILE = REPO_ROOT / "hero_smith" / "data" / "story" / "ancestries" / "ancestry_traits.json"
 
 # Mapping of JSON ancestry IDs to TS file names
 ANCESTRY_FILE_MAP = {
@@ -152,11 +154,11 @@ def find_matching_description(name: str, features: list) -> str | None:
     return None
 
 
-def update_json_with_descriptions():
+def update_json_with_descriptions(ts_dir: Path = TS_DIR, json_file: Path = JSON_FILE):
     """Main function to update the JSON file with TS descriptions."""
     
     # Load the JSON file
-    with open(JSON_FILE, 'r', encoding='utf-8') as f:
+    with open(json_file, 'r', encoding='utf-8') as f:
         json_data = json.load(f)
     
     updates_made = 0
@@ -168,7 +170,7 @@ def update_json_with_descriptions():
             print(f"Warning: No TS file mapping for {ancestry_id}")
             continue
         
-        ts_file = TS_DIR / ANCESTRY_FILE_MAP[ancestry_id]
+        ts_file = ts_dir / ANCESTRY_FILE_MAP[ancestry_id]
         if not ts_file.exists():
             print(f"Warning: TS file not found: {ts_file}")
             continue
@@ -181,9 +183,13 @@ def update_json_with_descriptions():
         
         print(f"  Found {len(all_features)} features with descriptions")
         
-        # Update signature description
-        signature = ancestry_entry.get("signature", {})
-        if signature and signature.get("name"):
+        # Update signature description (some ancestries have several)
+        signatures = ancestry_entry.get("signature") or []
+        if isinstance(signatures, dict):
+            signatures = [signatures]
+        for signature in signatures:
+            if not signature.get("name"):
+                continue
             sig_name = signature["name"]
             # Handle combined names like "Shadowmeld & Small!"
             sig_parts = re.split(r'\s*[&,]\s*', sig_name)
@@ -218,26 +224,38 @@ def update_json_with_descriptions():
                     print(f"  Updated trait '{trait_name}'")
     
     # Write the updated JSON
-    with open(JSON_FILE, 'w', encoding='utf-8') as f:
+    with open(json_file, 'w', encoding='utf-8') as f:
         json.dump(json_data, f, indent=2, ensure_ascii=False)
     
-    print(f"\n\nDone! Made {updates_made} updates to {JSON_FILE}")
+    print(f"\n\nDone! Made {updates_made} updates to {json_file}")
 
 
-if __name__ == "__main__":
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Copy ancestry descriptions from the TypeScript compendium.")
+    parser.add_argument("--ts-dir", type=Path, default=TS_DIR, help="Folder with the ancestry .ts files.")
+    parser.add_argument("--json-file", type=Path, default=JSON_FILE, help="ancestry_traits.json to update.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
     print("=" * 60)
     print("Ancestry Traits Description Updater")
     print("=" * 60)
-    print(f"\nTS Source: {TS_DIR}")
-    print(f"JSON Target: {JSON_FILE}")
+    print(f"\nTS Source: {args.ts_dir}")
+    print(f"JSON Target: {args.json_file}")
     print()
     
-    if not TS_DIR.exists():
-        print(f"Error: TS directory not found: {TS_DIR}")
-        exit(1)
+    if not args.ts_dir.exists():
+        print(f"Error: TS directory not found: {args.ts_dir}")
+        sys.exit(1)
     
-    if not JSON_FILE.exists():
-        print(f"Error: JSON file not found: {JSON_FILE}")
-        exit(1)
+    if not args.json_file.exists():
+        print(f"Error: JSON file not found: {args.json_file}")
+        sys.exit(1)
     
-    update_json_with_descriptions()
+    update_json_with_descriptions(args.ts_dir, args.json_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Validate generated ability files against the shapes the app expects.
+
+Two schemas are checked: the class ability schema written by
+extract_class_abilities.py (one ability per file) and the simplified schema
+written by generate_simplified_abilities.py (a list of abilities per class).
+
+The schemas below are plain data. Each one is compiled once per process into a
+tree of specialised checker closures, so validating a record is a handful of
+direct type and membership tests rather than a walk over the schema. Files are
+validated in parallel and every violation is reported with its file and the
+path of the offending value inside the record.
+
+Usage:
+    python validate_abilities.py                      # default generated folders
+    python validate_abilities.py path/to/file_or_dir  # anything else
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from json_stream import iter_json_array
+
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PATHS = [
+    ROOT.parent / "hero_smith" / "build" / "class_abilities_new",
+    ROOT.parent / "hero_smith" / "data" / "abilities" / "class_abilities_simplified",
+]
+
+
+# -----------------------------------------------------------------------------
+# Schemas
+# -----------------------------------------------------------------------------
+
+def _nullable(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {**schema, "nullable": True}
+
+
+STRING = {"type": "string"}
+INTEGER = {"type": "integer"}
+
+TIER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "base_damage_value": _nullable({"type": "integer", "minimum": 0}),
+        "characteristic_damage_options": _nullable(STRING),
+        "damage_types": _nullable(STRING),
+        "potencies": _nullable(STRING),
+        "conditions": _nullable(STRING),
+    },
+}
+
+CLASS_ABILITY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "type": {"enum": ["ability"]},
+        "id": {"type": "string", "min_length": 1},
+        "name": _nullable(STRING),
+        "level": _nullable({"type": "integer", "minimum": 1, "maximum": 10}),
+        "costs": _nullable({
+            "type": "object",
+            "properties": {
+                "resource": _nullable(STRING),
+                "amount": _nullable({"type": "integer", "minimum": 0}),
+            },
+        }),
+        "story_text": _nullable(STRING),
+        "keywords": {"type": "array", "items": STRING},
+        "action_type": _nullable({"enum": [
+            "Main action",
+            "Maneuver",
+            "Move action",
+            "Triggered action",
+            "Free triggered action",
+            "Free maneuver",
+            "No action",
+        ]}),
+        "trigger_text": _nullable(STRING),
+        "range": {
+            "type": "object",
+            "properties": {
+                "distance": _nullable({"enum": ["Melee", "Ranged", "Melee or Ranged", "Self", "Special"]}),
+                "area": _nullable({"enum": ["Aura", "Burst", "Cube", "Line", "Wall"]}),
+                "range_value": _nullable({"type": ["string", "integer"]}),
+            },
+        },
+        "targets": _nullable(STRING),
+        "power_roll": _nullable({
+            "type": "object",
+            "properties": {
+                "label": {"enum": ["Power roll"]},
+                "characteristics": _nullable(STRING),
+                "tiers": _nullable({
+                    "type": "object",
+                    "properties": {
+                        "low": _nullable(TIER_SCHEMA),
+                        "mid": _nullable(TIER_SCHEMA),
+                        "high": _nullable(TIER_SCHEMA),
+                    },
+                }),
+            },
+        }),
+        "effect": _nullable(STRING),
+        "special_effect": _nullable(STRING),
+    },
+}
+
+SIMPLIFIED_ABILITY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "type": {"enum": ["ability"]},
+        "id": {"type": "string", "min_length": 1},
+        "name": {"type": "string", "min_length": 1},
+        "level": {"type": "integer", "minimum": 1, "maximum": 10},
+        "subclass": _nullable(STRING),
+        "resource": STRING,
+        "resource_value": {"type": "integer", "minimum": 0},
+        "story_text": STRING,
+        "keywords": STRING,
+        "action_type": {"enum": [
+            "main action",
+            "maneuver",
+            "move",
+            "move action",
+            "triggered",
+            "triggered action",
+            "free triggered",
+            "free triggered action",
+            "free maneuver",
+            "no action",
+            "",
+        ]},
+        "trigger_text": _nullable(STRING),
+        "distance": STRING,
+        "targets": STRING,
+        "power_roll": _nullable(STRING),
+        "tier_effects": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "tier1": STRING,
+                    "tier2": STRING,
+                    "tier3": STRING,
+                },
+                "optional": ["tier1", "tier2", "tier3"],
+            },
+        },
+        "effect": _nullable(STRING),
+        "special_effect": _nullable(STRING),
+    },
+    "optional": ["subclass"],
+}
+
+SCHEMAS = {
+    "class": CLASS_ABILITY_SCHEMA,
+    "simplified": SIMPLIFIED_ABILITY_SCHEMA,
+}
+
+
+# -----------------------------------------------------------------------------
+# Schema compiler
+#
+# A checker is called as ``check(value, path, errors)``. ``path`` is a linked
+# tuple ``(parent_path, key)`` that is only turned into text when a violation
+# is reported, so valid records never pay for path formatting.
+# -----------------------------------------------------------------------------
+
+Path_ = Optional[Tuple[Any, Any]]
+Violation = Tuple[str, str]
+Checker = Callable[[Any, Path_, List[Violation]], None]
+
+_PYTHON_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list,),
+}
+
+
+def format_path(path: Path_) -> str:
+    parts: List[str] = []
+    while path is not None:
+        path, key = path
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "".join(reversed(parts)).lstrip(".") or "<record>"
+
+
+def compile_schema(schema: Dict[str, Any]) -> Checker:
+    """Compile a schema node into a checker closure."""
+    nullable = schema.get("nullable", False)
+    checks: List[Checker] = []
+
+    if "enum" in schema:
+        allowed = frozenset(schema["enum"])
+        allowed_text = ", ".join(repr(value) for value in schema["enum"])
+
+        def check_enum(value, path, errors):
+            if not isinstance(value, str) or value not in allowed:
+                errors.append((format_path(path), f"{value!r} is not one of {allowed_text}"))
+
+        checks.append(check_enum)
+
+    type_names = schema.get("type")
+    if type_names is not None:
+        if isinstance(type_names, str):
+            type_names = [type_names]
+        python_types = tuple(t for name in type_names for t in _PYTHON_TYPES[name])
+        rejects_bool = "boolean" not in type_names
+        expected = " or ".join(type_names)
+
+        def check_type(value, path, errors):
+            if not isinstance(value, python_types) or (rejects_bool and isinstance(value, bool)):
+                errors.append((format_path(path), f"expected {expected}, got {type(value).__name__}"))
+                return False
+            return True
+    else:
+        check_type = None
+
+    if "min_length" in schema:
+        min_length = schema["min_length"]
+
+        def check_length(value, path, errors):
+            if len(value) < min_length:
+                errors.append((format_path(path), f"must not be shorter than {min_length}"))
+
+        checks.append(check_length)
+
+    if "minimum" in schema or "maximum" in schema:
+        minimum = schema.get("minimum")
+        maximum = schema.get("maximum")
+
+        def check_bounds(value, path, errors):
+            if minimum is not None and value < minimum:
+                errors.append((format_path(path), f"{value} is below the minimum {minimum}"))
+            elif maximum is not None and value > maximum:
+                errors.append((format_path(path), f"{value} is above the maximum {maximum}"))
+
+        checks.append(check_bounds)
+
+    if "properties" in schema:
+        properties = tuple((key, compile_schema(sub)) for key, sub in schema["properties"].items())
+        known = frozenset(schema["properties"])
+        required = tuple(key for key in schema["properties"] if key not in set(schema.get("optional", ())))
+
+        def check_object(value, path, errors):
+            for key in required:
+                if key not in value:
+                    errors.append((format_path(path), f"missing required field '{key}'"))
+            for key, checker in properties:
+                if key in value:
+                    checker(value[key], (path, key), errors)
+            if len(value) > len(properties) or not known.issuperset(value):
+                for key in value:
+                    if key not in known:
+                        errors.append((format_path((path, key)), "unexpected field"))
+
+        checks.append(check_object)
+
+    if "items" in schema:
+        item_checker = compile_schema(schema["items"])
+
+        def check_items(value, path, errors):
+            for index, item in enumerate(value):
+                item_checker(item, (path, index), errors)
+
+        checks.append(check_items)
+
+    checks_tuple = tuple(checks)
+
+    if check_type is None:
+        def check(value, path, errors):
+            if value is None and nullable:
+                return
+            for sub_check in checks_tuple:
+                sub_check(value, path, errors)
+    elif len(checks_tuple) == 0:
+        def check(value, path, errors):
+            if value is None and nullable:
+                return
+            check_type(value, path, errors)
+    else:
+        def check(value, path, errors):
+            if value is None and nullable:
+                return
+            if check_type(value, path, errors):
+                for sub_check in checks_tuple:
+                    sub_check(value, path, errors)
+
+    return check
+
+
+@lru_cache(maxsize=None)
+def get_checker(schema_name: str) -> Checker:
+    return compile_schema(SCHEMAS[schema_name])
+
+
+# -----------------------------------------------------------------------------
+# Validation
+# -----------------------------------------------------------------------------
+
+# Top-level keys that only one schema declares. Every generated record carries
+# all of its schema's keys, so a record goes to the schema it shares the most
+# of these with; a record missing one of them is still checked against its own
+# schema and reported, instead of being checked against the other one.
+_DISTINGUISHING_KEYS = {
+    name: frozenset(schema["properties"]).difference(
+        *(other["properties"] for other_name, other in SCHEMAS.items() if other_name != name)
+    )
+    for name, schema in SCHEMAS.items()
+}
+
+
+def detect_schema(record: Any) -> str:
+    if not isinstance(record, dict):
+        return "class"
+    keys = record.keys()
+    scores = {name: len(distinct & keys) for name, distinct in _DISTINGUISHING_KEYS.items()}
+    return "simplified" if scores["simplified"] > scores["class"] else "class"
+
+
+def iter_records(path: Path) -> Iterator[Tuple[Path_, Any]]:
+    """Yield ``(path, record)`` for a single-record file or each element of a list file."""
+    with path.open("r", encoding="utf-8") as handle:
+        head = handle.read(1)
+        while head and head.isspace():
+            head = handle.read(1)
+    if head == "[":
+        for index, record in enumerate(iter_json_array(path)):
+            yield (None, index), record
+    else:
+        with path.open("r", encoding="utf-8") as handle:
+            yield None, json.load(handle)
+
+
+def validate_file(path: Path, schema_name: str = "auto") -> Tuple[int, List[Violation]]:
+    """Validate one file; returns the record count and its violations."""
+    violations: List[Violation] = []
+    count = 0
+    try:
+        for record_path, record in iter_records(path):
+            count += 1
+            errors: List[Violation] = []
+            name = detect_schema(record) if schema_name == "auto" else schema_name
+            get_checker(name)(record, record_path, errors)
+            violations.extend(errors)
+    except (json.JSONDecodeError, ValueError, OSError) as exc:
+        violations.append(("<file>", f"could not be read: {exc}"))
+    return count, violations
+
+
+def collect_files(paths: Iterable[Path]) -> List[Path]:
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*.json") if not p.name.startswith("sample_")))
+        elif path.is_file():
+            files.append(path)
+    return files
+
+
+def validate_paths(paths: Iterable[Path], schema_name: str = "auto", jobs: Optional[int] = None) -> Tuple[int, Dict[Path, List[Violation]]]:
+    """Validate every JSON file under ``paths`` in parallel."""
+    files = collect_files(paths)
+    results: Dict[Path, List[Violation]] = {}
+    total = 0
+    if not files:
+        return 0, results
+
+    workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(files) // (workers * 4))
+    if workers == 1:
+        outcomes = map(validate_file, files, [schema_name] * len(files))
+        for path, (count, violations) in zip(files, outcomes):
+            total += count
+            if violations:
+                results[path] = violations
+        return total, results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        outcomes = pool.map(validate_file, files, [schema_name] * len(files), chunksize=chunksize)
+        for path, (count, violations) in zip(files, outcomes):
+            total += count
+            if violations:
+                results[path] = violations
+    return total, results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate generated ability files.")
+    parser.add_argument("paths", nargs="*", type=Path, help="Files or folders to validate.")
+    parser.add_argument(
+        "--schema",
+        choices=["auto", *SCHEMAS],
+        default="auto",
+        help="Schema to check against (default: detect per record).",
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    paths = args.paths or DEFAULT_PATHS
+    missing = [path for path in paths if not path.exists()]
+    if missing:
+        for path in missing:
+            print(f"✗ Not found: {path}")
+        if not args.paths:
+            print("Run extract_class_abilities.py first or pass the folders to validate.")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    total, results = validate_paths(paths, args.schema, args.jobs)
+    elapsed = time.perf_counter() - started
+
+    violation_count = 0
+    for path, violations in results.items():
+        for where, message in violations:
+            print(f"{path}: {where}: {message}")
+        violation_count += len(violations)
+
+    print(f"\nValidated {total} records in {elapsed:.3f}s: {violation_count} violation(s) in {len(results)} file(s)")
+    if violation_count:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Validate exported heroes against the current hero_smith/data.
+
+An id index is built once from the bundled assets, using the same rules the
+app's seeder uses to turn them into components. Subclass and domain ids are
+added from the class feature and deity data, because the app stores them by
+name rather than as components. Hero files and ``HERO:`` import codes are then
+checked in parallel worker processes. Each worker receives the index once and
+inputs are streamed to the pool through a bounded window.
+
+Each hero entry is checked for:
+
+    dangling   entry_id is not in the index
+    level      the record needs a higher level than the hero has
+               (ability/feature "level", title "echelon")
+    class      a class ability or subclass belongs to a different class
+    malformed  entry without entry_type or entry_id
+
+Inputs can be hero JSON files, text files with ``HERO:`` lines (like
+test_heroes/import_codes/*.txt), folders containing either, or ``-`` to
+read codes from stdin.
+
+Usage:
+    python validate_heroes.py                               # test heroes
+    python validate_heroes.py exports/ -j 8
+    python validate_heroes.py ../test_heroes/import_codes/ALL_HEROES_CODES.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from build_asset_database import APP_DIR, bundled_asset_paths, iter_asset_components
+
+
+ROOT = Path(__file__).resolve().parent.parent
+HEROES_DIR = ROOT / "test_heroes"
+CODE_PREFIX = "HERO:"
+# Lowest hero level of each echelon
+ECHELON_LEVELS = {1: 1, 2: 4, 3: 7, 4: 10}
+
+# id -> (type, minimum level, owning class id or "", asset path)
+IdIndex = Dict[str, Tuple[str, int, str, str]]
+Problem = Tuple[str, str]
+
+_INDEX: IdIndex = {}
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "_", value.lower()).strip("_")
+
+
+def _min_level(record: Dict[str, Any]) -> int:
+    level = record.get("level")
+    if isinstance(level, int):
+        return level
+    echelon = record.get("echelon")
+    if isinstance(echelon, int):
+        return ECHELON_LEVELS.get(echelon, 1)
+    return 0
+
+
+def build_index(app_dir: Path = APP_DIR) -> IdIndex:
+    index: IdIndex = {}
+    for asset in bundled_asset_paths(app_dir):
+        try:
+            decoded = json.loads((app_dir / asset).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        file_name = Path(asset).name
+        owner = ""
+        if file_name.endswith("_abilities.json") and "class_abilities" in asset:
+            owner = "class_" + file_name[: -len("_abilities.json")]
+        for component_id, component_type, _, data in iter_asset_components(asset, decoded):
+            # First one wins, like the seeder
+            index.setdefault(component_id, (component_type, _min_level(data), owner, asset))
+
+    # Subclasses and domains live inside the feature and deity data
+    features_dir = app_dir / "data" / "features" / "class_features"
+    for path in sorted(features_dir.glob("*_features.json")):
+        owner = "class_" + path.name[: -len("_features.json")]
+        text = path.read_text(encoding="utf-8")
+        for name in set(re.findall(r'"subclass_name"\s*:\s*"([^"]+)"', text)):
+            index.setdefault(f"subclass_{_slug(name)}", ("subclass", 0, owner, path.relative_to(app_dir).as_posix()))
+    deities = app_dir / "data" / "story" / "deities.json"
+    if deities.exists():
+        for deity in json.loads(deities.read_text(encoding="utf-8")):
+            for domain in deity.get("domains") or []:
+                # Conduits pick domains as their subclass
+                index.setdefault(f"domain_{_slug(domain)}", ("domain", 0, "class_conduit", "data/story/deities.json"))
+    return index
+
+
+# -----------------------------------------------------------------------------
+# Worker side
+# -----------------------------------------------------------------------------
+
+def _init_worker(index: IdIndex) -> None:
+    global _INDEX
+    _INDEX = index
+
+
+def decode_hero_code(code: str) -> Dict[str, Any]:
+    code = code.strip()
+    if not code.startswith(CODE_PREFIX):
+        raise ValueError("code does not start with HERO:")
+    return json.loads(gzip.decompress(base64.b64decode(code[len(CODE_PREFIX):])).decode("utf-8"))
+
+
+def check_hero(hero: Dict[str, Any], index: IdIndex) -> List[Problem]:
+    problems: List[Problem] = []
+    values = {entry.get("key"): entry.get("value") for entry in hero.get("values", []) if isinstance(entry, dict)}
+    level = values.get("basics.level")
+    level = level if isinstance(level, int) else None
+    entries = hero.get("entries") or []
+    hero_class = next(
+        (entry.get("entry_id") for entry in entries if isinstance(entry, dict) and entry.get("entry_type") == "class"),
+        None,
+    )
+
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get("entry_type") or not entry.get("entry_id"):
+            problems.append(("malformed", f"entries[{position}] {json.dumps(entry, ensure_ascii=False)}"))
+            continue
+        entry_type, entry_id = entry["entry_type"], entry["entry_id"]
+        indexed = index.get(entry_id)
+        if indexed is None:
+            problems.append(("dangling", f"{entry_type} {entry_id}"))
+            continue
+        _, min_level, owner, asset = indexed
+        if level is not None and min_level > level:
+            problems.append(("level", f"{entry_type} {entry_id} needs level {min_level}, hero is level {level} ({asset})"))
+        if owner and hero_class and owner != hero_class and entry_type in ("ability", "subclass"):
+            problems.append(("class", f"{entry_type} {entry_id} belongs to {owner}, hero is {hero_class}"))
+    return problems
+
+
+def validate_task(task: Tuple[str, str, str]) -> Tuple[str, str, List[Problem]]:
+    """Validate one ``(label, kind, payload)`` task in a worker."""
+    label, kind, payload = task
+    try:
+        if kind == "file":
+            with open(payload, "r", encoding="utf-8") as handle:
+                hero = json.load(handle)
+        else:
+            hero = decode_hero_code(payload)
+    except (OSError, ValueError, EOFError) as exc:
+        return label, "", [("decode", str(exc))]
+    if not isinstance(hero, dict):
+        return label, "", [("decode", "hero export is not a JSON object")]
+    name = (hero.get("hero") or {}).get("name") or ""
+    return label, name, check_hero(hero, _INDEX)
+
+
+# -----------------------------------------------------------------------------
+# Inputs
+# -----------------------------------------------------------------------------
+
+def _codes_in(lines, source: str) -> Iterator[Tuple[str, str, str]]:
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line.startswith(CODE_PREFIX):
+            yield f"{source}:{number}", "code", line
+
+
+def iter_tasks(inputs: List[str]) -> Iterator[Tuple[str, str, str]]:
+    for item in inputs:
+        if item == "-":
+            yield from _codes_in(sys.stdin, "<stdin>")
+            continue
+        path = Path(item)
+        if path.is_dir():
+            files = sorted(p for p in path.rglob("*") if p.suffix in (".json", ".txt") and p.is_file())
+        else:
+            files = [path]
+        for file in files:
+            if file.suffix == ".txt":
+                with file.open("r", encoding="utf-8") as handle:
+                    yield from _codes_in(handle, str(file))
+            else:
+                yield str(file), "file", str(file)
+
+
+def validate_batch(tasks: List[Tuple[str, str, str]]) -> List[Tuple[str, str, List[Problem]]]:
+    return [validate_task(task) for task in tasks]
+
+
+def _batches(tasks: Iterator[Tuple[str, str, str]], size: int) -> Iterator[List[Tuple[str, str, str]]]:
+    batch: List[Tuple[str, str, str]] = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run(
+    tasks: Iterator[Tuple[str, str, str]],
+    index: IdIndex,
+    jobs: int,
+    batch_size: int = 32,
+) -> Iterator[Tuple[str, str, List[Problem]]]:
+    if jobs <= 1:
+        _init_worker(index)
+        yield from map(validate_task, tasks)
+        return
+
+    # At most a few batches per worker are in flight, so inputs are read as
+    # results come back rather than all up front.
+    window = jobs * 4
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(index,)) as executor:
+        pending: Set[Future] = set()
+        for batch in _batches(tasks, batch_size):
+            pending.add(executor.submit(validate_batch, batch))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in pending:
+            yield from future.result()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate hero exports against hero_smith/data.")
+    parser.add_argument("inputs", nargs="*", help="Hero JSON files, HERO: code files, folders or '-' for stdin.")
+    parser.add_argument("--app-dir", type=Path, default=APP_DIR, help="Flutter app folder (with pubspec.yaml).")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Heroes sent to a worker at a time.")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print the summary.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    inputs = args.inputs or [str(path) for path in sorted(HEROES_DIR.glob("hero_*.json"))]
+
+    started = time.perf_counter()
+    index = build_index(args.app_dir)
+    indexed = time.perf_counter()
+
+    heroes = 0
+    failed = 0
+    totals: Dict[str, int] = {}
+    for label, name, problems in run(iter_tasks(inputs), index, args.jobs, args.batch_size):
+        heroes += 1
+        if not problems:
+            continue
+        failed += 1
+        for kind, _ in problems:
+            totals[kind] = totals.get(kind, 0) + 1
+        if not args.quiet:
+            print(f"✗ {label}" + (f" ({name})" if name else ""))
+            for kind, message in problems:
+                print(f"    {kind:<9} {message}")
+    finished = time.perf_counter()
+
+    elapsed = finished - indexed
+    rate = heroes / elapsed if elapsed else 0.0
+    summary = ", ".join(f"{count} {kind}" for kind, count in sorted(totals.items())) or "no problems"
+    print(
+        f"\n{heroes} hero(es) checked, {heroes - failed} clean, {failed} with problems ({summary})\n"
+        f"Index: {len(index)} ids in {(indexed - started) * 1000:.0f} ms; "
+        f"validation: {elapsed * 1000:.0f} ms ({rate:,.0f} heroes/s, {args.jobs} job(s))"
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
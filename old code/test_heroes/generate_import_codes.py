@@ -12,10 +12,12 @@ Output:
     Creates .txt files with import codes for each hero JSON file.
 """
 
+import argparse
 import json
 import gzip
 import base64
 import os
+import sys
 from pathlib import Path
 
 
@@ -34,22 +36,33 @@ def generate_hero_code(hero_data: dict) -> str:
     return f"HERO:{encoded}"
 
 
+def parse_args() -> argparse.Namespace:
+    script_dir = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Generate HERO: import codes from hero JSON files.")
+    parser.add_argument("--heroes-dir", type=Path, default=script_dir, help="Folder with hero_*.json files.")
+    parser.add_argument("--output-dir", type=Path, default=script_dir / "import_codes", help="Folder for the code files.")
+    return parser.parse_args()
+
+
 def main():
-    # Get the directory containing this script
-    script_dir = Path(__file__).parent
+    args = parse_args()
     
+    if not args.heroes_dir.is_dir():
+        print(f"✗ Heroes folder not found: {args.heroes_dir}")
+        sys.exit(1)
+
     # Find all hero JSON files
-    json_files = sorted(script_dir.glob("hero_*.json"))
+    json_files = sorted(args.heroes_dir.glob("hero_*.json"))
     
     if not json_files:
-        print("No hero JSON files found!")
-        return
+        print(f"✗ No hero_*.json files found in {args.heroes_dir}")
+        sys.exit(1)
     
     print(f"Found {len(json_files)} hero files\n")
     
     # Create codes directory
-    codes_dir = script_dir / "import_codes"
-    codes_dir.mkdir(exist_ok=True)
+    codes_dir = args.output_dir
+    codes_dir.mkdir(parents=True, exist_ok=True)
     
     # Also create a combined file
     all_codes = []